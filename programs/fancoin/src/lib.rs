@@ -2077,3 +2077,52 @@ fn update_validator_mint_time(
     // val_pda.serialize back
     Ok(())
 }
+
+// --------------------------------------------------------------------
+// Group vectors shared with the Python client (scripts/fancoin/groups.py)
+// --------------------------------------------------------------------
+#[cfg(test)]
+mod group_vector_tests {
+    use super::*;
+    use std::str::FromStr;
+
+    const VECTORS_PATH: &str = concat!(env!("CARGO_MANIFEST_DIR"), "/tests/group_vectors.json");
+
+    /// The u64 calculate_group_id_mod reduces: first 8 keccak bytes, big-endian
+    fn raw_group_hash(address: &Pubkey, seed: u64) -> u64 {
+        let mut hasher = Keccak256::new();
+        hasher.update(address.to_bytes());
+        hasher.update(seed.to_le_bytes());
+        u64::from_be_bytes(hasher.finalize()[0..8].try_into().unwrap())
+    }
+
+    /// Fills in raw / group / tolerance for every input in tests/group_vectors.json.
+    /// FANCOIN_WRITE_GROUP_VECTORS=1 cargo test group_vectors  => rewrites the file,
+    /// otherwise the file must match what the program computes.
+    #[test]
+    fn group_vectors() {
+        let text = std::fs::read_to_string(VECTORS_PATH).expect("read group_vectors.json");
+        let stored: serde_json::Value = serde_json::from_str(&text).expect("parse group_vectors.json");
+        let mut computed = stored.clone();
+
+        for case in computed["group_id"].as_array_mut().unwrap() {
+            let address = Pubkey::from_str(case["address"].as_str().unwrap()).unwrap();
+            let seed = case["seed"].as_u64().unwrap();
+            let total_vals = case["validator_count"].as_u64().unwrap() as usize;
+            let total_groups = (total_vals + 3) / 4; // as in submit_minting_list
+            case["raw"] = raw_group_hash(&address, seed).into();
+            case["group"] = calculate_group_id_mod(&address, seed, total_groups as u64).unwrap().into();
+        }
+        for case in computed["failover_tolerance"].as_array_mut().unwrap() {
+            let total_vals = case["validator_count"].as_u64().unwrap() as usize;
+            case["tolerance"] = (calculate_failover_tolerance(total_vals) as u64).into();
+        }
+
+        if std::env::var_os("FANCOIN_WRITE_GROUP_VECTORS").is_some() {
+            std::fs::write(VECTORS_PATH, serde_json::to_string_pretty(&computed).unwrap() + "\n")
+                .expect("write group_vectors.json");
+        } else {
+            assert_eq!(stored, computed, "group_vectors.json is stale; rerun with FANCOIN_WRITE_GROUP_VECTORS=1");
+        }
+    }
+}
@@ -13,6 +13,8 @@ from solders.system_program import ID as SYS_PROGRAM_ID
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
 
+from fancoin import query
+
 # --------------------------
 # CONFIG & CONSTANTS
 # --------------------------
@@ -88,19 +90,10 @@ async def fetch_paid_players(program: Program, game_pda: Pubkey):
     """
     Return a list of tuples: (public_key_of_player_pda, player_account_data)
     where pending_paid == True.
+    Only PlayerPda accounts are pulled (discriminator + dataSize on the node);
+    pending_paid is checked after the fast decode (see query.fetch_paid_players).
     """
-    # Not strictly necessary to read the game, but if you need it:
-    game_data = await program.account[GAME_STR].fetch(game_pda)
-    total_count = game_data.player_count
-
-    all_player_records = await program.account[PLAYER_PDA_STR].all()
-    paid_list = []
-    for rec in all_player_records:
-        acct = rec.account
-        if acct.pending_paid is True:
-            paid_list.append((rec.public_key, acct))
-
-    return paid_list
+    return await query.fetch_paid_players(program)
 
 # -----------------------------------------------------------------------
 # validate_player_pubg_time_slim
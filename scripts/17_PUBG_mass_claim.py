@@ -1,197 +1,86 @@
+import argparse
 import asyncio
-import json
 import traceback
-import re
 from pathlib import Path
 
-from anchorpy import Program, Provider, Wallet, Idl, Context
-from anchorpy.program.namespace.instruction import AccountMeta
-from solders.keypair import Keypair
-from solders.pubkey import Pubkey
-from solders.system_program import ID as SYS_PROGRAM_ID
-from solders.rpc.responses import RPCError
-from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Confirmed
+from anchorpy import Program, Provider, Wallet
 
-##############################################################################
-# Config
-##############################################################################
-PROGRAM_ID_STR = "HP9ucKGU9Sad7EaWjrGULC2ZSyYD1ScxVPh15QmdRmut"
-RPC_URL = "http://localhost:8899"
-IDL_PATH = Path("../target/idl/fancoin.json")
-PLAYERS_FOLDER = Path("pubg_keys")
-
-SPL_TOKEN_PROGRAM_ID = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
-ASSOCIATED_TOKEN_PROGRAM_ID = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
-RENT_SYSVAR_ID = Pubkey.from_string("SysvarRent111111111111111111111111111111111")
+from fancoin import players, rpc
+from fancoin.deployment import DEPLOYMENT_PATH, Deployment
+from fancoin.identity import load_player_keys
+from fancoin.runtime import load_idl
+from fancoin.signing import SigningFarm
 
 ##############################################################################
-# Regex to find "Program <PID> consumed X of Y compute units"
+# request_claim for every pubg_keys/*.json player. Each player's
+# instruction is signed by that player's key; several players share one
+# TX (as many as fit), the local wallet pays the fees, and the TXs go out
+# concurrently (fancoin.players.batch_request_claims). With --sign-workers
+# the player keys are loaded and used only in a process pool
+# (fancoin.signing), which keeps the event loop free for the sends.
+#
+#   python 17_PUBG_mass_claim.py
+#   python 17_PUBG_mass_claim.py --sign-workers 4
+#   python 17_PUBG_mass_claim.py --players-per-tx 1 --concurrency 1   # one by one, as before
 ##############################################################################
-CU_REGEX = re.compile(r"Program \S+ consumed (\d+) of (\d+) compute units")
-
-##############################################################################
-# Main
-##############################################################################
-async def main():
-    # 1) Create a client
-    client = AsyncClient(RPC_URL, commitment=Confirmed)
-
-    # 2) We'll let each player sign individually, so no "validator" wallet here
-    #    We'll just load the IDL with a placeholder "local" wallet for convenience:
-    local_wallet = Wallet.local()
-    placeholder_provider = Provider(client, local_wallet)
-
-    # 3) Load IDL + Program
-    if not IDL_PATH.exists():
-        print(f"[ERROR] IDL not found => {IDL_PATH}")
-        return
-    with IDL_PATH.open("r", encoding="utf-8") as f:
-        idl_json = f.read()
-    idl = Idl.from_json(idl_json)
-    program_id = Pubkey.from_string(PROGRAM_ID_STR)
-
-    # We'll have a placeholder Program object (just to parse IDL, etc.).
-    # We'll create a new Program object for each player to sign request_claim.
-    placeholder_program = Program(idl, program_id, placeholder_provider)
+PLAYERS_FOLDER = Path("pubg_keys")
 
-    # 4) Read the game + minted_mint from local .txt
-    game_pda_str = Path("game_pda.txt").read_text().strip()
-    minted_mint_str = Path("minted_mint_pda.txt").read_text().strip()
-    game_pda = Pubkey.from_string(game_pda_str)
-    minted_mint = Pubkey.from_string(minted_mint_str)
-    print(f"[INFO] Using game_pda={game_pda}, minted_mint={minted_mint}")
 
-    # 5) Check for players folder
-    if not PLAYERS_FOLDER.is_dir():
-        print(f"[ERROR] {PLAYERS_FOLDER} does not exist.")
+async def main(args):
+    # only the Game address is needed: a game_pda.txt from another program id is used as given
+    try:
+        deployment = Deployment.load(args.deployment, strict=False)
+        game = deployment.game(args.game)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"[ERROR] Cannot load the deployment => {e}")
         return
-    json_files = list(PLAYERS_FOLDER.glob("*.json"))
-    if not json_files:
-        print(f"[ERROR] No .json files found in {PLAYERS_FOLDER}/.")
-        return
-
-    # 6) Iterate over each JSON => parse => request_claim
-    for file_path in json_files:
-        try:
-            data = json.loads(file_path.read_text())
-
-            player_name = data.get("player_name")
-            if not player_name:
-                print(f"[WARN] => {file_path.name}: missing 'player_name'. Skipping.")
-                continue
-
-            privkey_hex = data.get("player_authority_private_key")
-            authority_addr_str = data.get("player_authority_address")
-            if not privkey_hex or not authority_addr_str:
-                print(f"[WARN] => {file_path.name}: missing required key(s). Skipping.")
-                continue
-
-            # Convert hex => Keypair
-            try:
-                privkey_bytes = bytes.fromhex(privkey_hex)
-                if len(privkey_bytes) != 32:
-                    print(f"[ERROR] => {file_path.name}: private key must be 32 bytes. Found {len(privkey_bytes)}.")
-                    continue
-                player_kp = Keypair.from_seed(privkey_bytes)
-            except Exception as e:
-                print(f"[ERROR] => {file_path.name}: cannot parse private key => {e}")
-                continue
-
-            # Check derived pubkey vs JSON
-            derived_pubkey = player_kp.pubkey()
-            derived_pubkey_str = str(derived_pubkey)
-            if derived_pubkey_str != authority_addr_str:
-                print(f"[WARN] => {file_path.name}: mismatch in public key => JSON={authority_addr_str}, derived={derived_pubkey_str}")
-
-            print(f"\n[INFO] => request_claim for player_name='{player_name}' => authority={derived_pubkey}")
-
-            # 6a) We need a new Program for each player's sign
-            player_wallet = Wallet(player_kp)
-            player_provider = Provider(client, player_wallet)
-            player_program = Program(idl, program_id, player_provider)
-
-            # The request_claim instruction requires:
-            #   request_claim(ctx, mint_pubkey, name)
-            #   ctx accounts => 
-            #     game => seeds=[b"game", minted_mint]
-            #     player_name_pda => seeds=[b"player_name", game.key, name.as_bytes()]
-            #     player_pda => address= player_name_pda.player_pda
-            #     user => Signer
-            #     system_program
-            #
-            # We'll just pass them in "accounts" => 
-            # leftover isn't needed.
-            # 
-            # We'll do the minimal logic to form the accounts:
-
-            # We can derive the player_name_pda as well
-            (player_name_pda, _) = Pubkey.find_program_address(
-                [b"player_name", bytes(game_pda), player_name.encode("utf-8")],
-                program_id
-            )
-
-            # We'll load the PlayerNamePda to get its `.player_pda`
-            # But that would require a separate fetch or we can do:
-            #   "address = player_name_pda.player_pda"
-            # The script doesn't know that address unless we fetch on-chain or trust an existing pattern.
-
-            # (A) Fetch on-chain to see if it's there
-            try:
-                # We can do a small anchorpy approach:
-                #    playerNamePda = await player_program.account["PlayerNamePda"].fetch(player_name_pda)
-                # Then read -> playerNamePda["player_pda"]
-                name_pda_data = await player_program.account["PlayerNamePda"].fetch(player_name_pda)
-                actual_player_pda = name_pda_data.player_pda
-            except Exception as e:
-                print(f"[ERROR] => cannot fetch PlayerNamePda => {player_name_pda}: {e}")
-                continue
-
-            # Now we have the real player_pda address
-            # We'll do request_claim(minted_mint, player_name).
-            try:
-                tx_sig = await player_program.rpc["request_claim"](
-                    minted_mint,         # arg #1
-                    player_name,         # arg #2
-                    ctx=Context(
-                        accounts={
-                            "game": game_pda,
-                            "player_name_pda": player_name_pda,
-                            "player_pda": actual_player_pda,
-                            "user": derived_pubkey,
-                            "system_program": SYS_PROGRAM_ID,
-                        },
-                        signers=[player_kp],
-                    )
-                )
-                print(f"[SUCCESS] => request_claim for {player_name}, Tx={tx_sig}")
-
-                # Fetch logs
-                tx_details = await client.get_transaction(tx_sig, commitment=Confirmed, encoding='json')
-                if tx_details.value and tx_details.value.transaction.meta:
-                    logs = tx_details.value.transaction.meta.log_messages or []
-                    print("[DEBUG] request_claim LOGS:")
-                    for line in logs:
-                        print("   ", line)
-                        m = CU_REGEX.search(line)
-                        if m:
-                            consumed = m.group(1)
-                            limit = m.group(2)
-                            print(f"   => [CU] consumed {consumed} of {limit} compute units")
-                else:
-                    print("[DEBUG] No transaction meta/logs found for request_claim.")
-
-            except Exception as e:
-                print(f"[ERROR] => request_claim => {player_name}: {e}")
-                traceback.print_exc()
-
-        except Exception as e:
-            print(f"[ERROR] => {file_path.name}: {e}")
-            traceback.print_exc()
-
+    client = rpc.get_client(deployment.endpoint)
+    farm = None
+    try:
+        if not deployment.idl_path.exists():
+            print(f"[ERROR] IDL not found => {deployment.idl_path}")
+            return
+        # the funder: fee payer of every claim TX
+        program = Program(load_idl(deployment.idl_path), deployment.program_id, Provider(client, Wallet.local()))
+        print(f"[INFO] Using game_pda={game.game_pda}, minted_mint={game.mint}")
+
+        if not PLAYERS_FOLDER.is_dir():
+            print(f"[ERROR] {PLAYERS_FOLDER} does not exist.")
+            return
+        if args.sign_workers:
+            farm = await SigningFarm(player_dirs=[PLAYERS_FOLDER], workers=args.sign_workers).start()
+            keys = farm.signers()
+        else:
+            keys = load_player_keys(PLAYERS_FOLDER)
+        if not keys:
+            print(f"[ERROR] No usable .json files found in {PLAYERS_FOLDER}/.")
+            return
+
+        player_pdas = await players.resolve_player_pdas(client, game.game_pda, keys, deployment.program_id)
+        for name in keys:
+            if name not in player_pdas:
+                print(f"[WARN] => '{name}' has no PlayerNamePda in this game. Skipping.")
+        claims = {name: (kp, player_pdas[name]) for name, kp in keys.items() if name in player_pdas}
+
+        result = await players.batch_request_claims(program, game.game_pda, game.mint, claims,
+                                                    max_per_tx=args.players_per_tx, concurrency=args.concurrency)
+        print(f"[SUCCESS] request_claim landed for {len(result['claimed'])}/{len(claims)} players.")
+    except Exception as e:
+        print(f"[ERROR] Unexpected error => {e}")
+        traceback.print_exc()
+    finally:
+        if farm is not None:
+            farm.close()
+        await rpc.close_clients()
     print("\n[INFO] Done. Closing client.")
-    await client.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="request_claim for every pubg_keys/ player, batched.")
+    parser.add_argument("--deployment", default=DEPLOYMENT_PATH, help="deployment.json (else the *_pda.txt files)")
+    parser.add_argument("--game", help="game label in the deployment (default: its default game)")
+    parser.add_argument("--players-per-tx", type=int, help="cap on players per TX (default: as many as fit)")
+    parser.add_argument("--concurrency", type=int, default=players.CLAIM_CONCURRENCY, help="claim TXs in flight")
+    parser.add_argument("--sign-workers", type=int, default=0,
+                        help="sign in this many worker processes holding the keys (0 = in-process)")
+    asyncio.run(main(parser.parse_args()))
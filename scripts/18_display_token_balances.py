@@ -6,27 +6,21 @@ import tkinter as tk
 from tkinter import ttk
 from pathlib import Path
 
-from anchorpy import Program, Provider, Context, Idl
+from anchorpy import Program, Provider, Context
 from anchorpy.provider import Wallet
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Confirmed
+
+from fancoin import query, rpc
+from fancoin.deployment import Deployment
+from fancoin.runtime import load_idl
 
 # --------------------------
 # CONFIG & CONSTANTS
 # --------------------------
-RPC_URL = "http://localhost:8899"
-PROGRAM_ID_STR = "HP9ucKGU9Sad7EaWjrGULC2ZSyYD1ScxVPh15QmdRmut"
-
-# The IDL path => update if your path differs:
-IDL_PATH = Path("../target/idl/fancoin.json")
-
-# The local .txt containing game + mint_authority PDAs
-GAME_PDA_TXT = Path("game_pda.txt")
-MINT_AUTH_PDA_TXT = Path("mint_auth_pda.txt")
-MINTED_MINT_PDA_TXT = Path("minted_mint_pda.txt")
-VALIDATOR_PDA_TXT = Path("validator_pda.txt")
+# Program id, RPC URL, IDL path, game + mint come from deployment.json
+# (or the *_pda.txt files) via fancoin.deployment.
 
 # Name of the accounts in your IDL
 GAME_STR = "Game"
@@ -78,19 +72,13 @@ async def get_balance_or_zero(client: AsyncClient, ata_pubkey: Pubkey) -> float:
 # fetch_paid_players
 # -----------------------------------------------------------------------
 async def fetch_paid_players(program: Program, game_pda: Pubkey):
-    """Return a list of (player_pda_pubkey, player_account_data) for all who have pending_paid == True."""
-    # If needed, you can fetch the game account here:
-    # game_data = await program.account[GAME_STR].fetch(game_pda)
-
-    all_player_records = await program.account[PLAYER_PDA_STR].all()
-
-    paid_list = []
-    for rec in all_player_records:
-        acct = rec.account
-        if acct.pending_paid is True:
-            paid_list.append((rec.public_key, acct))
-
-    return paid_list
+    """
+    Return a list of tuples: (public_key_of_player_pda, player_account_data)
+    where pending_paid == True.
+    Only PlayerPda accounts are pulled (discriminator + dataSize on the node);
+    pending_paid is checked after the fast decode (see query.fetch_paid_players).
+    """
+    return await query.fetch_paid_players(program)
 
 # -----------------------------------------------------------------------
 # _async_fetch_balances_with_commission
@@ -106,33 +94,30 @@ async def _async_fetch_balances_with_commission():
       6) For each, fetch get_token_account_balance
       7) Return list of rows + top row for commission
     """
-    client = AsyncClient(RPC_URL, commitment=Confirmed)
+    try:
+        deployment = Deployment.load()
+    except FileNotFoundError as e:
+        print(f"[ERROR] No deployment.json and {e}")
+        return []
+    except ValueError as e:
+        print(f"[ERROR] Deployment addresses don't match => {e}")
+        return []
+    game = deployment.game()
+
+    client = rpc.get_client(deployment.endpoint)
     validator_kp = load_keypair("val1-keypair.json")
     validator_wallet = Wallet(validator_kp)
 
     provider = Provider(client, validator_wallet)
+    program = Program(load_idl(deployment.idl_path), deployment.program_id, provider)
 
-    # Read IDL
-    with IDL_PATH.open("r", encoding="utf-8") as f:
-        idl_json = f.read()
-    idl = Idl.from_json(idl_json)
-
-    program_id = Pubkey.from_string(PROGRAM_ID_STR)
-    program = Program(idl, program_id, provider)
-
-    # Read game_pda + minted_mint
-    if not GAME_PDA_TXT.exists() or not MINTED_MINT_PDA_TXT.exists():
-        print("[ERROR] Missing game_pda.txt or minted_mint_pda.txt")
-        await provider.connection.close()
-        return []
-
-    game_pda = Pubkey.from_string(GAME_PDA_TXT.read_text().strip())
-    minted_mint = Pubkey.from_string(MINTED_MINT_PDA_TXT.read_text().strip())
+    game_pda = game.game_pda
+    minted_mint = game.mint
     print(f"[INFO] game_pda={game_pda}")
     print(f"[INFO] minted_mint={minted_mint}")
 
-    # Derive commission ATA based on the validator key
-    commission_ata = find_associated_token_address(validator_kp.pubkey(), minted_mint)
+    # Commission ATA of the validator key (from deployment.json when cached; a viewer never writes it)
+    commission_ata = game.validator_ata(validator_kp.pubkey())
     print(f"[INFO] Commission ATA => {commission_ata}")
 
     # 1) Fetch the commission ATA balance
@@ -152,28 +137,29 @@ async def _async_fetch_balances_with_commission():
         f"{comm_balance}"
     ))
 
-    # Then the rest => players
-    for (player_pda_pubkey, acct) in paid_players:
+    # Then the rest => players. All balance reads go out together on the
+    # shared pooled client; players sharing a reward ATA share one request.
+    async def player_row(acct):
         player_name_str = acct.name
         user_ata_pubkey = acct.reward_address
 
         if user_ata_pubkey is None or user_ata_pubkey == Pubkey.default():
-            results.append((player_name_str, str(user_ata_pubkey), "No ATA"))
-            continue
+            return (player_name_str, str(user_ata_pubkey), "No ATA")
 
         # Try get the user ATA balance
         try:
-            balance_resp = await provider.connection.get_token_account_balance(user_ata_pubkey)
+            balance_resp = await client.get_token_account_balance(user_ata_pubkey)
             if balance_resp.value:
                 ui_amount = balance_resp.value.ui_amount or 0.0
-                results.append((player_name_str, str(user_ata_pubkey), f"{ui_amount}"))
-            else:
-                results.append((player_name_str, str(user_ata_pubkey), "N/A"))
+                return (player_name_str, str(user_ata_pubkey), f"{ui_amount}")
+            return (player_name_str, str(user_ata_pubkey), "N/A")
         except Exception as e:
-            results.append((player_name_str, str(user_ata_pubkey), f"Error: {e}"))
+            return (player_name_str, str(user_ata_pubkey), f"Error: {e}")
+
+    results.extend(await asyncio.gather(*(player_row(acct) for (_pda, acct) in paid_players)))
 
     # close connection
-    await provider.connection.close()
+    await rpc.close_clients()
     return results
 
 def fetch_data_with_commission():
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import traceback
+
+from anchorpy import Program, Provider, Wallet
+
+from fancoin.claims import ClaimDaemon
+from fancoin import rpc
+from fancoin.deployment import DEPLOYMENT_PATH, Deployment
+from fancoin.identity import fleet_keypair_files
+from fancoin.runtime import load_idl
+
+###############################################################################
+# Long-running claim_validator_reward daemon for the whole validator fleet.
+#
+#   python 19_validator_claim_daemon.py                  # every val*-keypair.json
+#   python 19_validator_claim_daemon.py val1-keypair.json val3-keypair.json
+#   python 19_validator_claim_daemon.py --game pubg      # another game in deployment.json
+#
+# One RPC client, one batched ValidatorPda read per round, claims sent
+# concurrently when each validator's 60 reward minutes are up (see
+# fancoin/claims.py for the timing rules).
+###############################################################################
+
+
+async def main(args):
+    try:
+        deployment = Deployment.load(args.deployment)
+        game = deployment.game(args.game)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"[ERROR] Cannot load the deployment => {e}")
+        return
+    print("Setting up provider and loading program IDL...")
+    client = rpc.get_client(deployment.endpoint)
+    provider = Provider(client, Wallet.local())
+
+    try:
+        if not deployment.idl_path.exists():
+            print(f"[ERROR] IDL file not found at {deployment.idl_path.resolve()}")
+            return
+        program = Program(load_idl(deployment.idl_path), deployment.program_id, provider)
+        print("Program loaded successfully.")
+
+        keypair_files = args.keypairs or fleet_keypair_files()
+        if not keypair_files:
+            print("[ERROR] No validator keypair files found.")
+            return
+
+        record = await deployment.verify(client, game.label)
+        identities = game.fleet(keypair_files, record.gatekeeper_network)
+        deployment.save()
+        for ident in identities:
+            print(f"[INFO] {ident.label}: validator={ident.pubkey} validator_pda={ident.validator_pda}")
+
+        await ClaimDaemon(program, game.game_pda, game.mint, identities,
+                          mint_authority=deployment.mint_authority.address).run_forever()
+
+    except Exception as e:
+        print(f"[ERROR] Unexpected error => {e}")
+        traceback.print_exc()
+    finally:
+        await rpc.close_clients()
+        print("Closed Solana RPC client.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="claim_validator_reward daemon for the validator fleet.")
+    parser.add_argument("keypairs", nargs="*", help="validator keypair files (default: val*-keypair.json)")
+    parser.add_argument("--deployment", default=DEPLOYMENT_PATH, help="deployment.json (else the *_pda.txt files)")
+    parser.add_argument("--game", help="game label in the deployment (default: its default game)")
+    asyncio.run(main(parser.parse_args()))
@@ -1,76 +1,51 @@
+import argparse
 import asyncio
-import json
-from pathlib import Path
+import traceback
 
-from anchorpy import Provider, Wallet
-from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Confirmed
-from solana.rpc.core import RPCException
-from solders.keypair import Keypair
-from solders.system_program import transfer, TransferParams
-from solana.transaction import Transaction
+from anchorpy import Wallet
 
-def load_keypair(path: str) -> Keypair:
-    with Path(path).open() as f:
-        secret = json.load(f)
-    return Keypair.from_bytes(bytes(secret[0:64]))
+from fancoin import rpc
+from fancoin.identity import fleet_keypair_files, load_keypair
+from fancoin.payers import POOL_SIZE, fund_sharded
 
-async def main():
-    # Connect to local cluster and set up provider
-    client = AsyncClient("http://localhost:8899", commitment=Confirmed)
-    wallet = Wallet.local()
-    provider = Provider(client, wallet)
-
-    # We want to send 1 SOL = 1_000_000_000 lamports
-    lamports_to_send = 1_000_000_000
-
-    # Loop over val1 through val6
-    for i in range(1, 7):
-        keypair_path = f"./val{i}-keypair.json"
-        try:
-            # Load the current validator keypair
-            val_keypair = load_keypair(keypair_path)
-
-            # Create the transfer instruction
-            ix = transfer(
-                TransferParams(
-                    from_pubkey=wallet.public_key,
-                    to_pubkey=val_keypair.pubkey(),
-                    lamports=lamports_to_send
-                )
-            )
+###############################################################################
+# Send 1 SOL from the local wallet to every val*-keypair.json.
+# The transfers are paid by --payers sub-payers (fancoin/payers.py) so they
+# don't all queue behind the local wallet's write lock; what the sub-payers
+# have left goes back to the local wallet at the end.
+#
+#   python 1_val_pay_vals_from_localwallet.py
+#   python 1_val_pay_vals_from_localwallet.py --payers 1    # old behaviour
+###############################################################################
 
-            # Create a new transaction and add the instruction
-            tx = Transaction()
-            tx.add(ix)
+LAMPORTS_TO_SEND = 1_000_000_000  # 1 SOL
 
-            # Fetch a recent blockhash
-            latest_blockhash_resp = await provider.connection.get_latest_blockhash()
-            if latest_blockhash_resp.value is None:
-                raise Exception("Failed to get a recent blockhash")
 
-            blockhash = latest_blockhash_resp.value.blockhash
-
-            # Set the recent blockhash and fee payer
-            tx.recent_blockhash = blockhash
-            tx.fee_payer = wallet.public_key
-
-            # Sign the transaction with the provider's wallet
-            signed_tx = provider.wallet.sign_transaction(tx)
-
-            # Send the transaction
-            resp = await provider.connection.send_raw_transaction(signed_tx.serialize())
-            print(f"Sent 1 SOL to {keypair_path}. Transaction Signature: {resp}")
-        
-        except FileNotFoundError:
-            print(f"Keypair file {keypair_path} not found. Skipping...")
-        except RPCException as e:
-            print(f"Error transferring lamports to {keypair_path}: {e}")
-        except Exception as e:
-            print(f"Unexpected error for {keypair_path}: {e}")
+async def main(args):
+    client = rpc.get_client(args.endpoint)
+    wallet = Wallet.local()
+    try:
+        keypair_files = fleet_keypair_files()
+        if not keypair_files:
+            print("[WARN] No val*-keypair.json files found. Nothing to fund.")
+            return
+        pubkeys = [load_keypair(path).pubkey() for path in keypair_files]
+
+        sigs = await fund_sharded(client, wallet.payer, pubkeys, LAMPORTS_TO_SEND, payers=args.payers)
+        failed = [s for s in sigs if isinstance(s, Exception)]
+        for e in failed:
+            print(f"[ERROR] Transfer failed => {e}")
+        if not failed:
+            print(f"[SUCCESS] Sent {LAMPORTS_TO_SEND / 1e9:g} SOL to {', '.join(keypair_files)}.")
+    except Exception as e:
+        print(f"[ERROR] Unexpected error => {e}")
+        traceback.print_exc()
+    finally:
+        await rpc.close_clients()
 
-    # Close the client connection
-    await client.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Fund every validator keypair from the local wallet.")
+    parser.add_argument("--endpoint", default=rpc.DEFAULT_ENDPOINT, help="Solana RPC endpoint.")
+    parser.add_argument("--payers", type=int, default=POOL_SIZE, help="Sub-payers to spread the transfers over.")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import traceback
+
+from anchorpy import Program, Provider, Wallet
+
+from fancoin import rpc
+from fancoin.deployment import DEPLOYMENT_PATH, Deployment
+from fancoin.encoders import InstructionSet
+from fancoin.feed import PlayerFeed, ws_url_for
+from fancoin.identity import fleet_keypair_files
+from fancoin.locks import MAX_INFLIGHT, LockAwareProgram, LockScheduler
+from fancoin.multigame import MultiGameRuntime, list_servers
+from fancoin.player_table import SCAN_CONCURRENCY
+from fancoin.runtime import load_idl
+
+###############################################################################
+# All validators in one process: one scrape + one index refresh per round,
+# fanned out to per-validator punch_in / submit_minting_list / claims.
+# Replaces running 6_punch_in.py, 7_punch_in2.py, 8_val1_... and 9_val2_...
+# side by side. Several games share that scrape, one PlayerPda scan and the
+# RPC client; each keeps its own player table, punch-ins and minting (see
+# fancoin/multigame.py).
+#
+#   python 20_multi_validator.py                     # every val*-keypair.json
+#   python 20_multi_validator.py val1-keypair.json val2-keypair.json --no-claims
+#   python 20_multi_validator.py --game tfc pubg     # several games in deployment.json
+#   python 20_multi_validator.py --all-games
+#   python 20_multi_validator.py --live              # PlayerPda index from programSubscribe, not rescans
+#   python 20_multi_validator.py --lookup-tables     # v0 submit_minting_list via Address Lookup Tables
+#   python 20_multi_validator.py --anchorpy-ixs      # build submits with program.rpc, not fancoin.encoders
+#   python 20_multi_validator.py --index-scan 16     # rebuild tables by PlayerPda index, 16 batches in flight
+###############################################################################
+
+
+async def main(args):
+    try:
+        deployment = Deployment.load(args.deployment)
+        labels = list(deployment.games) if args.all_games else (args.game or [deployment.default_game])
+        games = [deployment.game(label) for label in labels]
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"[ERROR] Cannot load the deployment => {e}")
+        return
+    print("Setting up provider and loading program IDL...")
+    # batching: the fleet's concurrent punch_ins / submits / reads share round trips
+    client = rpc.get_client(deployment.endpoint, batching=True)
+    provider = Provider(client, Wallet.local())
+
+    try:
+        if not deployment.idl_path.exists():
+            print(f"[ERROR] IDL file not found at {deployment.idl_path.resolve()}")
+            return
+        program = Program(load_idl(deployment.idl_path), deployment.program_id, provider)
+        if args.max_inflight:
+            # the fleet's punch_ins / submits all write the Game + mint: pace them per account
+            program = LockAwareProgram(program, LockScheduler(args.max_inflight), deployment.idl_path)
+        print("Program loaded successfully.")
+
+        keypair_files = args.keypairs or fleet_keypair_files()
+        if not keypair_files:
+            print("[ERROR] No validator keypair files found.")
+            return
+
+        fleets = []
+        for game in games:
+            record = await deployment.verify(client, game.label)
+            fleets.append((game, game.fleet(keypair_files, record.gatekeeper_network)))
+        deployment.save()
+
+        print(f"[INFO] Querying the master server for {sorted({g.gamedir for g in games})} servers.")
+        servers = list_servers(g.gamedir for g in games)
+        for gamedir, srvs in servers.items():
+            print(f"[DEBUG] Found {len(srvs)} unique {gamedir} servers.")
+
+        feed = None
+        if args.live:
+            ws_url = None if args.no_ws else (args.ws or ws_url_for(deployment.endpoint))
+            feed = PlayerFeed(client, deployment.program_id, ws_url=ws_url)
+        encoders = None if args.anchorpy_ixs else InstructionSet(deployment.idl_path, deployment.program_id)
+        # the local wallet creates / extends the games' lookup tables; new ones are saved to deployment.json
+        await MultiGameRuntime(program, fleets, servers, claims=args.claims, feed=feed,
+                               lookup_tables=args.lookup_tables, encoders=encoders, index_scan=args.index_scan,
+                               on_new_table=lambda _game: deployment.save()).run_forever()
+
+    except Exception as e:
+        print(f"[ERROR] Unexpected error => {e}")
+        traceback.print_exc()
+    finally:
+        await rpc.close_clients()
+        print("Closed Solana RPC client.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run several fancoin validators in one process.")
+    parser.add_argument("keypairs", nargs="*", help="validator keypair files (default: val*-keypair.json)")
+    parser.add_argument("--no-claims", dest="claims", action="store_false", help="don't run the claim daemon")
+    parser.add_argument("--deployment", default=DEPLOYMENT_PATH, help="deployment.json (else the *_pda.txt files)")
+    parser.add_argument("--game", nargs="+", help="game labels in the deployment (default: its default game)")
+    parser.add_argument("--all-games", action="store_true", help="serve every game in the deployment")
+    parser.add_argument("--live", action="store_true", help="keep the player tables live from a PlayerFeed")
+    parser.add_argument("--ws", help="pubsub URL for --live (default: the endpoint's port + 1)")
+    parser.add_argument("--no-ws", action="store_true", help="with --live, poll getSlot instead of subscribing")
+    parser.add_argument("--lookup-tables", action="store_true",
+                        help="submit_minting_list as v0 TXs through per-game Address Lookup Tables")
+    parser.add_argument("--anchorpy-ixs", action="store_true",
+                        help="build submit_minting_list through anchorpy instead of the precompiled encoders")
+    parser.add_argument("--index-scan", type=int, nargs="?", const=SCAN_CONCURRENCY, default=0, metavar="N",
+                        help="refresh player tables by PlayerPda index with N getMultipleAccounts batches "
+                             f"in flight (default N: {SCAN_CONCURRENCY}) instead of one getProgramAccounts")
+    parser.add_argument("--max-inflight", type=int, default=MAX_INFLIGHT,
+                        help="TXs in flight per written account, e.g. the Game (0 = no limit)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from fancoin import rpc
+from fancoin.bootstrap import VALIDATORS, build_pipeline
+from fancoin.deployment import DEPLOYMENT_PATH
+from fancoin.pipeline import RunContext
+from fancoin.runtime import IDL_PATH
+
+###############################################################################
+# Whole local bootstrap (what run_sequence.sh did) in one process:
+# pay validators, scrape players, create game + mint, register / punch in
+# the validators and sign up every scraped player. Independent stages run
+# concurrently; per-stage timings go to logs/bootstrap_<timestamp>.jsonl.
+# The game's addresses go to deployment.json (and the old *_pda.txt files).
+#
+#   python 21_bootstrap.py                          # everything
+#   python 21_bootstrap.py --list                   # stages + dependencies
+#   python 21_bootstrap.py --only punch_in_val2     # that stage + its deps
+#   python 21_bootstrap.py --payers 8               # fund players from 8 fee payers
+###############################################################################
+
+
+async def main(args):
+    pipe = build_pipeline(args.validators)
+    if args.list:
+        for name in pipe.order():
+            deps = pipe.stages[name].deps
+            print(f"{name:<20} <- {', '.join(deps) if deps else '-'}")
+        return True
+
+    if not args.idl.exists():
+        print(f"[ERROR] IDL file not found at {args.idl.resolve()}")
+        return False
+
+    log_path = args.log or Path("logs") / f"bootstrap_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    ctx = RunContext(args.endpoint, idl_path=args.idl, players_per_tx=args.players_per_tx, deployment=args.deployment,
+                     payers=args.payers)
+    try:
+        report = await pipe.run(ctx, only=args.only, log_path=log_path)
+    finally:
+        await rpc.close_clients()
+
+    print(f"[INFO] Stage log: {log_path}")
+    print(f"[INFO] Wall {report['wall_s']:.2f}s vs {report['stage_sum_s']:.2f}s summed stage time.")
+    print(f"[INFO] Critical path: {' -> '.join(report['critical_path'])}")
+    if args.verbose:
+        print(json.dumps(report, indent=2))
+    if report["ok"]:
+        print("[SUCCESS] Bootstrap completed.")
+    else:
+        bad = {n: t["status"] for n, t in report["stages"].items() if t["status"] != "ok"}
+        print(f"[ERROR] Bootstrap incomplete: {bad}")
+    return report["ok"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fancoin local bootstrap as a stage DAG.")
+    parser.add_argument("--endpoint", default=rpc.DEFAULT_ENDPOINT, help="Solana RPC endpoint.")
+    parser.add_argument("--idl", type=Path, default=IDL_PATH, help="Path to the fancoin IDL json.")
+    parser.add_argument("--only", nargs="+", metavar="STAGE", help="Run these stages (and what they depend on).")
+    parser.add_argument("--validators", nargs="+", default=list(VALIDATORS),
+                        help="Validator labels to register + punch in (<label>-keypair.json).")
+    parser.add_argument("--players-per-tx", type=int,
+                        help="Cap on players onboarded per TX (default: as many as fit in one).")
+    parser.add_argument("--payers", type=int, default=1,
+                        help="Sub-payers the SOL transfers are spread over (1 = all from the local wallet).")
+    parser.add_argument("--deployment", type=Path, default=DEPLOYMENT_PATH,
+                        help="Deployment config the init_game stage writes / updates.")
+    parser.add_argument("--log", type=Path, help="Structured log path (default logs/bootstrap_<ts>.jsonl).")
+    parser.add_argument("--list", action="store_true", help="Print the stages and exit.")
+    parser.add_argument("--verbose", action="store_true", help="Dump the full JSON report.")
+    raise SystemExit(0 if asyncio.run(main(parser.parse_args())) else 1)
@@ -3,14 +3,9 @@ import json
 import traceback
 from pathlib import Path
 from enum import IntEnum  # Ensure IntEnum is imported
-from anchorpy.program.namespace.instruction import AccountMeta
-from anchorpy import Program, Provider, Wallet, Idl, Context
-
-import re
-from solders.system_program import ID as SYS_PROGRAM_ID
+from anchorpy import Program, Provider, Wallet, Idl
 
 from solders.rpc.responses import SendTransactionResp
-from anchorpy import Program, Provider, Wallet, Idl, Context
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from spl.token.async_client import AsyncToken
@@ -24,14 +19,20 @@ from solana.transaction import Transaction, Signature
 from solana.rpc.types import TxOpts
 from solders.system_program import transfer, TransferParams
 
+from fancoin import players, rpc
+from fancoin.payers import POOL_SIZE, fund_sharded
+
 # The known program IDs
 #TOKEN_PROGRAM_ID = SPL_TOKEN_PROGRAM_ID
 ASSOCIATED_TOKEN_PROGRAM_ID = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
+SPL_TOKEN_PROGRAM_ID = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
 RENT_SYSVAR_ID = Pubkey.from_string("SysvarRent111111111111111111111111111111111")
 program_id = Pubkey.from_string("HP9ucKGU9Sad7EaWjrGULC2ZSyYD1ScxVPh15QmdRmut")
 
 # Define the amount of lamports to send to each player
 LAMPORTS_TO_SEND = 10_000_000  # 0.01 SOL
+# Fee payers the up-front player funding is spread over (fancoin/payers.py); 1 = local wallet only
+FEE_PAYERS = POOL_SIZE
 
 ###############################################################################
 # Helper Functions
@@ -192,182 +193,6 @@ class GameStatus(IntEnum):
     Whitelisted = 1
     Blacklisted = 2
 
-###############################################################################
-# The register_player_pda function
-###############################################################################
-
-ASSOCIATED_TOKEN_PROGRAM_ID = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
-SPL_TOKEN_PROGRAM_ID = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
-
-RENT_SYSVAR_ID = Pubkey.from_string("SysvarRent111111111111111111111111111111111")
-
-def find_associated_token_address(owner: Pubkey, mint: Pubkey) -> Pubkey:
-    """Derive the Associated Token Account (ATA) for a given owner and mint."""
-    seeds = [bytes(owner), bytes(SPL_TOKEN_PROGRAM_ID), bytes(mint)]
-    (ata, _) = Pubkey.find_program_address(seeds, ASSOCIATED_TOKEN_PROGRAM_ID)
-    return ata
-
-
-
-async def create_player_ata(
-    program: Program,
-    client: AsyncClient,
-    game_pda: Pubkey,
-    mint_pubkey: Pubkey,
-    user_kp: Keypair,
-):
-    """
-    Calls `create_user_ata_if_needed(mint_pubkey)` to create the ATA if it doesn't exist.
-.   returns user_ata
-    """
-
-    # ------------------------------------------------------------
-    # 1) CREATE USER ATA IF NEEDED
-    # ------------------------------------------------------------
-    user_pubkey = user_kp.pubkey()
-    user_ata = find_associated_token_address(user_pubkey, mint_pubkey)
-
-    # # 1) Fetch Game to get the current `player_count`
-    # game_data = await program.account["Game"].fetch(game_pda)
-    # current_count = game_data.player_count
-    # print(f"[DEBUG] current_count from on-chain Game = {current_count}")
-    print(f"\nCreating ATA (if needed) for user={user_pubkey}, mint={mint_pubkey}")
-    try:
-        tx_sig = await program.rpc["create_user_ata_if_needed"](
-            mint_pubkey,
-            ctx=Context(
-                accounts={
-                    #"dapp": dapp_pda,
-                    "user": user_pubkey,
-                    "fancy_mint": mint_pubkey,
-                    "game": game_pda,
-                    "user_ata": user_ata,  # Anchor derives the address via init_if_needed
-                    "token_program": SPL_TOKEN_PROGRAM_ID,  # or Token2022 if that's your ID
-                    "associated_token_program": ASSOCIATED_TOKEN_PROGRAM_ID,
-                    "system_program": SYS_PROGRAM_ID,
-                    "rent": RENT_SYSVAR_ID,
-                },
-                signers=[user_kp],
-            ),
-        )
-        print(f"create_user_ata_if_needed => success. Tx: {tx_sig}")
-    except RPCException as e:
-        print(f"Error creating ATA: {e}")
-        traceback.print_exc()
-        raise
-    return user_ata
-
-async def register_player_pda(
-    program: Program,
-    game_pda: Pubkey,
-    fancy_mint: Pubkey,
-    player_name: str,
-    player_keypair: Keypair,    # Player's Keypair used as `user`
-    #reward_pubkey: Pubkey
-):
-    """
-    Registers a player by initializing their PlayerPda and associated token account.
-    """
-    try:
-
-        (dapp_pda, _) = Pubkey.find_program_address([b"dapp"], program_id)
-        print(f"[DEBUG] dapp_pda => {dapp_pda}")
-        # 1) Fetch typed DApp account object
-    # 1) Fetch Game to get the current `player_count`
-        # game_data = await program.account["Game"].fetch(game_pda)
-        # current_count = game_data.player_count
-        #print(f"[DEBUG] current_count from on-chain DApp = {current_count}")
-        game_data = await program.account["Game"].fetch(game_pda)
-        player_count = game_data.player_count
-        print(f"Current game.player_count = {player_count}")
-
-        # 2) Derive PDAs
-        (player_pda, _) = Pubkey.find_program_address(
-            [
-                b"player_pda",
-                bytes(game_pda),
-                player_count.to_bytes(4, "little")
-            ],
-            program.program_id
-        )
-        print(f"[DEBUG] Derived player_pda => {player_pda}")
-
-        (player_name_pda, _) = Pubkey.find_program_address(
-            [
-                b"player_name",
-                bytes(game_pda),
-                player_name.encode("utf-8")
-            ],
-            program.program_id
-        )
-        print(f"[DEBUG] Derived player_name_pda => {player_name_pda}")
-
-        # 3) Derive the player's ATA manually
-        player_pubkey = player_keypair.pubkey()
-        user_ata_pubkey = derive_ata(player_pubkey, fancy_mint)
-        print(f"[DEBUG] user_ata => {user_ata_pubkey} for player {player_name}")
-        leftover_accounts = []
-        leftover_accounts.append(AccountMeta(pubkey=user_ata_pubkey, is_signer=False, is_writable=True))
-
-        # 4) Call register_player_pda, passing in all required accounts:
-        tx_sig = await program.rpc["register_player_pda"](
-            fancy_mint,
-            player_name,
-            ctx=Context(
-                accounts={
-                    #"dapp": dapp_pda,
-                    "fancy_mint": fancy_mint,
-                    "game": game_pda,
-                    "player_pda": player_pda,
-                    "player_name_pda": player_name_pda,  # Player's Pubkey as 'user'
-                    "user": player_pubkey,
-                    "token_program": SPL_TOKEN_PROGRAM_ID,
-                    "associated_token_program": ASSOCIATED_TOKEN_PROGRAM_ID,
-                    "system_program": SYS_PROGRAM_ID,
-                    "rent": RENT_SYSVAR_ID,
-                },
-                # The player's Keypair must sign to authorize the transaction
-                signers=[player_keypair],
-                remaining_accounts=leftover_accounts,
-            )
-        )
-        print(f"Player '{player_name}' => PlayerPda registered. Tx Sig: {tx_sig}")
-
-        # Optionally fetch transaction logs
-        confirmed_tx = await program.provider.connection.get_transaction(
-            tx_sig, encoding='json'
-        )
-        if confirmed_tx.value and confirmed_tx.value.transaction.meta:
-            logs = confirmed_tx.value.transaction.meta.log_messages
-            if logs:
-                # Example: Extract compute units consumed
-                cu_regex = re.compile(r'Program \S+ consumed (\d+) of (\d+) compute units')
-                consumed_cu = None
-                max_cu = None
-                for line in logs:
-                    match = cu_regex.search(line)
-                    if match:
-                        consumed_cu = int(match.group(1))
-                        max_cu = int(match.group(2))
-                        break
-                if consumed_cu is not None:
-                    print(f"[DEBUG] Compute units => {consumed_cu}/{max_cu}")
-                else:
-                    print("[DEBUG] No compute units info found in logs.")
-            else:
-                print("[DEBUG] No log messages returned for transaction.")
-        else:
-            print("[DEBUG] No transaction meta/logs found.")
-
-    except RPCException as e:
-        print(f"[ERROR] Registering player '{player_name}' => RPCException: {e}")
-        traceback.print_exc()
-        raise
-    except Exception as e:
-        print(f"[ERROR] Registering player '{player_name}': {e}")
-        traceback.print_exc()
-        raise
-    
 ###############################################################################
 # Verification and Correction Functions
 ###############################################################################
@@ -485,7 +310,8 @@ async def verify_ata_owner(
 # Main
 ###############################################################################
 async def main():
-    client = AsyncClient("http://localhost:8899", commitment=Confirmed)
+    # Calls made in the same event-loop tick go out as one JSON-RPC batch
+    client = rpc.get_client("http://localhost:8899", batching=True)
     # 1) Setup Solana + Anchor env
     wallet = Wallet.local()
     provider = Provider(client, wallet)
@@ -529,8 +355,6 @@ async def main():
     (dapp_pda, _) = Pubkey.find_program_address([b"dapp"], program_id)
     print(f"[DEBUG] dapp_pda => {dapp_pda}")
 
-    # 6) The Mint that the DApp uses
-    fancy_mint = minted_mint_pda
     # 7) Grab all .json keys in "player_keys"
     keys_folder = Path("player_keys")
     if not keys_folder.exists() or not keys_folder.is_dir():
@@ -542,6 +366,31 @@ async def main():
         print(f"No .json files found in {keys_folder}/. Exiting.")
         return
 
+    # 7') Every player's starting balance in one batched round trip
+    async def starting_balance(json_file):
+        try:
+            return await client.get_balance(load_keypair(json_file).pubkey())
+        except Exception:
+            return None  # bad key files are reported by the loop below
+
+    starting_balances = dict(zip(json_files, await asyncio.gather(*(starting_balance(f) for f in json_files))))
+
+    # 7'') Fund every under-funded player up front, in batched TXs spread over
+    #      FEE_PAYERS sub-payers; the loop below then finds them funded.
+    underfunded = {}
+    for json_file, resp in starting_balances.items():
+        if resp is not None and (resp.value or 0) < LAMPORTS_TO_SEND:
+            underfunded[json_file] = load_keypair(json_file).pubkey()
+    if underfunded:
+        print(f"[INFO] Funding {len(underfunded)} players with {LAMPORTS_TO_SEND} lamports over {FEE_PAYERS} fee payers.")
+        sigs = await fund_sharded(client, wallet.payer, list(underfunded.values()), LAMPORTS_TO_SEND, payers=FEE_PAYERS)
+        failed = [s for s in sigs if isinstance(s, Exception)]
+        if failed:
+            print(f"[WARN] {len(failed)}/{len(sigs)} funding TXs failed (first: {failed[0]}); the loop airdrops the rest.")
+        refreshed = await asyncio.gather(*(starting_balance(f) for f in underfunded))
+        starting_balances.update(zip(underfunded, refreshed))
+
+    ready = {}
     for json_file in json_files:
         player_name = json_file.stem
         try:
@@ -573,19 +422,9 @@ async def main():
             player_pubkey = player_keypair.pubkey()
             print(f"\n[INFO] Registering player => {player_name} with pubkey {player_pubkey}")
 
-            # 7b) Determine the reward_pubkey
-            reward_pubkey_str = data.get("player_info_acc_address")
-            if reward_pubkey_str:
-                try:
-                    reward_pubkey = Pubkey.from_string(reward_pubkey_str)
-                except ValueError:
-                    print(f"[ERROR] Invalid 'player_info_acc_address' in {json_file}. Using derived ATA as fallback.")
-                    reward_pubkey = derive_ata(player_pubkey, fancy_mint)
-            else:
-                reward_pubkey = derive_ata(player_pubkey, fancy_mint)  # Fallback to derived ATA
-
             # 7c) Check if the player already has sufficient lamports
-            balance_resp = await client.get_balance(player_pubkey)
+            balance_resp = starting_balances.get(json_file) or await client.get_balance(player_pubkey)
+            airdropped = False
             if balance_resp.value is not None and balance_resp.value >= LAMPORTS_TO_SEND:
                 print(f"[INFO] Player {player_pubkey} already has sufficient lamports ({balance_resp.value} lamports). Skipping airdrop.")
             else:
@@ -598,6 +437,7 @@ async def main():
                         recipient_pubkey=player_pubkey,
                         lamports=LAMPORTS_TO_SEND
                     )
+                    airdropped = True
                     if tx_sig:
                         print(f"[SUCCESS] Airdropped {LAMPORTS_TO_SEND} lamports to {player_pubkey}. Tx Sig: {tx_sig}")
                     else:
@@ -606,8 +446,9 @@ async def main():
                     print(f"[ERROR] Failed to airdrop lamports to {player_pubkey}: {e}")
                     continue
 
-            # 7d) Verify player's balance after airdrop
-            balance_resp = await client.get_balance(player_pubkey)
+            # 7d) Verify player's balance after airdrop (unchanged if we skipped it)
+            if airdropped:
+                balance_resp = await client.get_balance(player_pubkey)
             if balance_resp.value is not None:
                 print(f"[DEBUG] Player {player_pubkey} balance: {balance_resp.value} lamports")
                 if balance_resp.value < 4_085_520:
@@ -618,69 +459,8 @@ async def main():
                 continue
 
 
-            # Convert each string to a solders Pubkey
-
-
-            reward_pubkey = await create_player_ata(
-                program, client,
-                game_pda=game_pda,
-                mint_pubkey=minted_mint_pda,
-                user_kp=player_keypair
-            )
-            # 7e) Register the player on-chain
-
-            await register_player_pda(
-                program=program,
-                game_pda=game_pda,
-                fancy_mint=minted_mint_pda,
-                player_name=player_name,
-                player_keypair=player_keypair,   # Player's Keypair as 'user'
-                #reward_pubkey=reward_pubkey,
-            )
-
-            # 7f) Verify ATA Ownership
-            # is_correct_owner = await verify_ata_owner(
-            #     client=client,
-            #     ata_pubkey=reward_pubkey,
-            #     expected_owner=player_pubkey
-            # )
-
-            # if not is_correct_owner:
-            #     print(f"[INFO] Attempting to correct ATA ownership for player '{player_name}'.")
-
-            #     # Close the incorrect ATA
-            #     success = await close_incorrect_ata(
-            #         client=client,
-            #         owner_keypair=player_keypair,
-            #         ata_pubkey=reward_pubkey,
-            #         destination_pubkey=player_pubkey
-            #     )
-
-            #     if success:
-            #         print(f"[INFO] ATA {reward_pubkey} closed successfully for player '{player_name}'. Re-registering to initialize ATA correctly.")
-            #         # Re-register the player to initialize ATA correctly
-            #         await re_register_player(
-            #             program=program,
-            #             dapp_pda=dapp_pda,
-            #             fancy_mint=fancy_mint,
-            #             player_name=player_name,
-            #             player_keypair=player_keypair,
-            #             reward_pubkey=reward_pubkey,
-            #         )
-            #         # Optionally, verify again
-            #         await asyncio.sleep(1)  # Short delay to ensure transaction processing
-            #         is_correct_owner_after = await verify_ata_owner(
-            #             client=client,
-            #             ata_pubkey=reward_pubkey,
-            #             expected_owner=player_pubkey
-            #         )
-            #         if not is_correct_owner_after:
-            #             print(f"[ERROR] Failed to correct ATA ownership for player '{player_name}'.")
-            #     else:
-            #         print(f"[ERROR] Failed to close incorrect ATA for player '{player_name}'. Manual intervention required.")
-
-            # Optional: Add a short delay to ensure the transaction is processed
-            await asyncio.sleep(0.5)
+            # 7e) ATA + registration go out below, several players per TX
+            ready[player_name] = player_keypair
 
         except FileNotFoundError:
             print(f"[ERROR] Keypair file {json_file} not found. Skipping...")
@@ -690,6 +470,11 @@ async def main():
             print(f"[ERROR] Unexpected error for {json_file}: {e}")
             traceback.print_exc()
 
+    # 8) create_user_ata_if_needed + register_player_pda for every funded
+    #    player, as many per TX as fit (fancoin/players.py onboard)
+    result = await players.onboard(program, game_pda, minted_mint_pda, ready)
+    if result["failed"]:
+        print(f"[WARN] {len(result['failed'])} players were not registered: {result['failed']}")
     print("\nAll players from 'player_keys/' folder have been registered and funded.")
 
 if __name__ == "__main__":
@@ -14,7 +14,6 @@ from anchorpy import Program, Provider, Wallet, Idl, Context
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.system_program import ID as SYS_PROGRAM_ID
-from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
 from solana.rpc.types import Commitment
 from solana.rpc.core import RPCException
@@ -22,6 +21,11 @@ from solders.system_program import transfer, TransferParams
 from solana.rpc.types import TxOpts  # Correct import for transaction options
 from solana.transaction import Transaction, Signature  # Import solana-py's Signature class
 from anchorpy.program.namespace.instruction import AccountMeta
+
+from fancoin import rpc
+from fancoin.player_table import PlayerTable, load_player_table
+from fancoin.schedule import ChainClock, MintScheduler
+
 SPL_TOKEN_PROGRAM_ID = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
 ASSOCIATED_TOKEN_PROGRAM_ID = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
 
@@ -37,6 +41,7 @@ program_id = None
 dapp_pda = None
 
 CHUNK_SIZE = 3  # how many players to mint per TX
+PLAYER_TABLE_REFRESH_S = 60  # re-read the on-chain players at least this often
 game_pda_str = Path("game_pda.txt").read_text().strip()
 mint_auth_pda_str = Path("mint_auth_pda.txt").read_text().strip()
 minted_mint_pda_str = Path("minted_mint_pda.txt").read_text().strip()
@@ -104,52 +109,33 @@ async def find_users(deduped, aggregated_local_server_names, name_map):
 ###############################################################################
 # 3) On-chain fetch: build name -> { index, pda, reward_address }
 ###############################################################################
-async def fetch_player_pdas_map() -> dict:
+async def fetch_player_pdas_map(total_count: int = None) -> PlayerTable:
     """
-    Returns a dict:
-      {
-         "<player_name>": {
+    Returns a PlayerTable (fancoin/player_table.py). It answers the old
+    name_map interface:
+      name_map.keys(), name in name_map,
+      name_map.get("<player_name>") => {
             "index":  <u32 index in the anchor code>,
             "pda":    <Pubkey for PlayerPda>,
             "reward_address": <Pubkey for TokenAccount>
-         },
-         ...
       }
-    
-    We assume seeds=[b"player_pda", i32_as_le_bytes] for each new player.
-    We'll re-derive each player's address to figure out their 'index'.
+    and also exposes the columnar arrays for vectorised queries.
+
+    We assume seeds=[b"player_pda", game_pda, u32_as_le_bytes] for each new player.
     """
-    all_records = await program.account["PlayerPda"].all()
-    print(f"[DEBUG] Found {len(all_records)} PlayerPda records on-chain.")
+    if total_count is None:
+        total_count = await fetch_player_count()
+
+    table = await load_player_table(
+        program.provider.connection, program.program_id, game_pda, total_count
+    )
+    print(f"[DEBUG] Found {len(table)} PlayerPda records on-chain for this game.")
+    return table
 
-    # Fetch DApp data to get total player count
+async def fetch_player_count() -> int:
     game_data = await program.account["Game"].fetch(game_pda)
-    total_count = game_data.player_count
-
-    # Derive PDA to index mapping
-    pda_to_index = {}
-    for i in range(total_count):
-        seed_index_bytes = i.to_bytes(4, "little")
-        (pda, _) = Pubkey.find_program_address([b"player_pda", bytes(game_pda), seed_index_bytes], program.program_id)
-        pda_to_index[str(pda)] = i
-
-    # Build the name map with reward_address
-    name_map = {}
-    for rec in all_records:
-        pkey_str = str(rec.public_key)
-        if pkey_str in pda_to_index:
-            real_idx = pda_to_index[pkey_str]
-            player_name = rec.account.name  # The "name" field on your PlayerPda
-            name_map[player_name] = {
-                "index": real_idx,
-                "pda": rec.public_key,
-                "reward_address": rec.account.reward_address  # Added reward_address
-            }
-        else:
-            # Handle any leftover or mismatched records if necessary
-            pass
-
-    return name_map
+    return game_data.player_count
+
 def find_associated_token_address(owner: Pubkey, mint: Pubkey) -> Pubkey:
     seeds = [
         bytes(owner),
@@ -164,7 +150,8 @@ def find_associated_token_address(owner: Pubkey, mint: Pubkey) -> Pubkey:
 ###############################################################################
 async def submit_minting_list_with_leftover(
     matched_names: list[str],
-    name_map: dict,
+    name_map: PlayerTable,
+    window_open=None,
 ):
     validator_kp = load_validator_keypair()
     validator_pubkey = validator_kp.pubkey()
@@ -220,6 +207,10 @@ async def submit_minting_list_with_leftover(
 
     # Iterate over matched names in chunks
     for start_idx in range(0, len(matched_names), CHUNK_SIZE):
+        # Don't spend a TX the program would skip (outside the mint window)
+        if window_open is not None and not window_open():
+            print("[INFO] Mint window closed => holding remaining chunks.")
+            break
         chunk = matched_names[start_idx : start_idx + CHUNK_SIZE]
         leftover_accounts = []
         numeric_ids = []
@@ -297,6 +288,32 @@ async def submit_minting_list_with_leftover(
         # Sleep a tiny bit if you want to throttle
         await asyncio.sleep(0.2)
 
+###############################################################################
+# 4b) punch_in: opens this validator's minting for the current hour
+###############################################################################
+async def punch_in_validator(validator_kp: Keypair) -> bool:
+    seeds_val = [b"validator", bytes(minted_mint_pda), bytes(validator_kp.pubkey())]
+    (validator_pda, _) = Pubkey.find_program_address(seeds_val, program.program_id)
+    try:
+        tx = await program.rpc["punch_in"](
+            minted_mint_pda,
+            ctx=Context(
+                accounts={
+                    "game": game_pda,
+                    "validator_pda": validator_pda,
+                    "validator": validator_kp.pubkey(),
+                    "system_program": SYS_PROGRAM_ID,
+                },
+                signers=[validator_kp],
+            )
+        )
+        print(f"[SUCCESS] Punched in. Transaction Signature: {tx}")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Punching in: {e}")
+        traceback.print_exc()
+        return False
+
 ###############################################################################
 # 5) Local TFC logic: gather local players from master server
 ###############################################################################
@@ -369,7 +386,7 @@ def decode_and_collect_players(players):
 ###############################################################################
 async def main():
     print("Setting up provider and loading program IDL...")
-    client = AsyncClient("http://localhost:8899", commitment=Confirmed)
+    client = rpc.get_client("http://localhost:8899", batching=True)
     wallet = Wallet.local()
 
     global provider, program, program_id, dapp_pda, game_pda
@@ -422,56 +439,47 @@ async def main():
                 unique_ips[ip] = (ip, port)
         deduped = list(unique_ips.values())
         print(f"[DEBUG] Found {len(deduped)} unique TFC servers.")
-        aggregated_local_server_names = set()
-
-        while True:
-
-            # 5) Fetch all on-chain PlayerPda => build (name -> index, name -> pda, reward_address)
+        # 5) Hour-window schedule (fancoin/schedule.py):
+        #    punch_in at the hour rollover, hold until minute 7, then scrape +
+        #    submit until just before the hour ends. Nothing is sent while
+        #    submit_minting_list would return early.
+        #    The name table is re-read every PLAYER_TABLE_REFRESH_S, and early
+        #    when a scraped name is missing and Game.player_count has moved
+        #    (someone signed up since the last read).
+        tables = {}
+
+        async def load_table(now):
             print("[INFO] Fetching on-chain name->(index, pda, reward_address).")
-            name_map = await fetch_player_pdas_map()
-
-            # Loop to find users 4 times with 5-minute intervals
-            for iteration in range(1, 5):  # Iterations 1 through 4
-                print(f"\n[INFO] Starting iteration {iteration} of 4.")
-                balance_resp = await provider.connection.get_balance(validator_pubkey)
-                lamports = balance_resp.value
-                sol_balance = lamports / 1e9
-                print(f"[INFO] Validator balance: {sol_balance} SOL")
-                matched_names = await find_users(deduped, aggregated_local_server_names, name_map)
-                aggregated_local_server_names = set()
-
-                # Example: If you only want to do a mint on the first iteration:
-                if matched_names and iteration == 1:
-                    await submit_minting_list_with_leftover(matched_names, name_map)
-                    print(f"[INFO] Minting period finished. Checking validator balance before next wait...")
-
-                    # ───────────────────────────────────────────────────────────
-                    # Print validator’s balance (in SOL) before the 5-min sleep
-
-                    # ───────────────────────────────────────────────────────────
-                    balance_resp = await provider.connection.get_balance(validator_pubkey)
-                    lamports = balance_resp.value
-                    sol_balance = lamports / 1e9
-                    print(f"[INFO] Validator balance: {sol_balance} SOL")
-                    print(f"[INFO] Waiting for ~5 minutes before next scan.")
-                    await asyncio.sleep(30)  # Wait for 5 minutes
-
-                else:
-                    if matched_names:
-                        print(f"[INFO] Matched players found. Checking validator balance before waiting.")
-                    else:
-                        print("[WARN] No matched players found.")
-
-                    # ───────────────────────────────────────────────────────────
-                    # Print validator’s balance (in SOL) before the 5-min sleep
-                    balance_resp = await provider.connection.get_balance(validator_pubkey)
-                    lamports = balance_resp.value
-                    sol_balance = lamports / 1e9
-                    print(f"[INFO] Validator balance: {sol_balance} SOL")
-                    # ───────────────────────────────────────────────────────────
-
-                    print(f"[INFO] Waiting 5 minutes before next scan.")
-                    await asyncio.sleep(30)
+            tables["player_count"] = await fetch_player_count()
+            tables["table"] = await fetch_player_pdas_map(tables["player_count"])
+            tables["fetched_at"] = now
+            return tables["table"]
+
+        async def mint_round(sched: MintScheduler):
+            now = sched.clock.now()
+            name_map = tables.get("table")
+            if name_map is None or now - tables["fetched_at"] >= PLAYER_TABLE_REFRESH_S:
+                name_map = await load_table(now)
+
+            balance_resp = await provider.connection.get_balance(validator_pubkey)
+            print(f"[INFO] Validator balance: {balance_resp.value / 1e9} SOL")
+            scraped = set()
+            matched_names = await find_users(deduped, scraped, name_map)
+            if len(matched_names) < len(scraped) and await fetch_player_count() != tables["player_count"]:
+                name_map = await load_table(now)
+                matched_names = list(scraped.intersection(name_map.keys()))
+                print(f"[INFO] matched_names after refresh => {matched_names}")
+            if matched_names:
+                await submit_minting_list_with_leftover(matched_names, name_map, window_open=sched.window_open)
+            else:
+                print("[WARN] No matched players found.")
+
+        scheduler = MintScheduler(
+            ChainClock(provider.connection),
+            punch_in=lambda: punch_in_validator(validator_kp),
+            mint_round=mint_round,
+        )
+        await scheduler.run_forever()
 
     except Exception as e:
         print(f"[ERROR] Unexpected error => {e}")
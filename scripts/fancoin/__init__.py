@@ -0,0 +1,6 @@
+"""
+Shared helpers for the fancoin operator scripts.
+
+The numbered scripts in this directory are run with `scripts/` as the
+working directory, so `import fancoin` resolves to this package.
+"""
@@ -0,0 +1,224 @@
+"""
+Quick operator commands that start fast:
+
+    python -m fancoin verify-keys [player_keys/Tis.json ...]   # default: player_keys/*.json
+    python -m fancoin balance val1-keypair.json <pubkey> ...   # SOL + game token balance
+    python -m fancoin deployment [--write] [--verify]          # deployment.json / *_pda.txt config
+    python -m fancoin watch [--ws ws://host:8900] [--no-ws]    # live PlayerPda registrations / mints / claims
+
+Each command imports only what it uses (no anchorpy, no IDL), so they
+start in a fraction of the time the full scripts take. See
+fancoin/bench_startup.py for the -X importtime numbers.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+DEPLOYMENT_PATH = "deployment.json"  # deployment.DEPLOYMENT_PATH, without importing solders for --help
+
+
+def verify_keys(args) -> int:
+    """verify_keys.py for any number of 2_scraper2.py key files."""
+    from fancoin.identity import keypair_from_record
+
+    paths = [Path(p) for p in args.paths] or sorted(Path("player_keys").glob("*.json"))
+    if not paths:
+        print("[ERROR] No key files given and player_keys/ is empty.")
+        return 1
+    bad = 0
+    for path in paths:
+        try:
+            record = json.loads(path.read_text())
+            derived = str(keypair_from_record(record).pubkey())
+        except Exception as e:
+            print(f"[ERROR] {path}: verification failed: {e}")
+            bad += 1
+            continue
+        expected = record.get("player_authority_address")
+        if derived == expected:
+            if args.verbose:
+                print(f"[INFO] {path}: {derived} matches.")
+        else:
+            print(f"[ERROR] {path}: derived {derived}, file says {expected}")
+            bad += 1
+    print(f"[INFO] {len(paths) - bad}/{len(paths)} key files match their player_authority_address.")
+    return 1 if bad else 0
+
+
+def _owner(arg: str):
+    from solders.pubkey import Pubkey
+
+    if arg.endswith(".json"):
+        from fancoin.identity import load_keypair
+        return load_keypair(arg).pubkey()
+    return Pubkey.from_string(arg)
+
+
+def _json_rpc_batch(endpoint: str, calls: list, timeout: float = 10.0) -> list:
+    """One JSON-RPC batch POST over urllib => result (or None on error) per call, in order."""
+    from urllib.request import Request, urlopen
+
+    body = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+    req = Request(endpoint, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"})
+    with urlopen(req, timeout=timeout) as resp:
+        replies = {r["id"]: r for r in json.loads(resp.read())}
+    return [replies.get(i, {}).get("result") for i in range(len(calls))]
+
+
+def balance(args) -> int:
+    """
+    Read-only, so it skips the async client stack (httpx / solana / asyncio
+    is ~0.3 s of imports) and sends every read in one batch over urllib.
+    """
+    from solders.pubkey import Pubkey
+
+    from fancoin.deployment import Deployment
+    from fancoin.pdas import associated_token_address
+
+    if args.mint:
+        mint = Pubkey.from_string(args.mint)
+    else:
+        try:
+            mint = Deployment.load().game().mint
+        except (FileNotFoundError, KeyError):
+            mint = None
+        except ValueError as e:
+            print(f"[WARN] {e}; showing SOL balances only.")
+            mint = None
+    owners = [_owner(a) for a in args.owners]
+    calls = [("getBalance", [str(o), {"commitment": "confirmed"}]) for o in owners]
+    if mint is not None:
+        calls += [("getTokenAccountBalance", [str(associated_token_address(o, mint)), {"commitment": "confirmed"}])
+                  for o in owners]
+    results = _json_rpc_batch(args.endpoint, calls)
+    for i, owner in enumerate(owners):
+        sol = results[i]["value"] / 1e9 if results[i] else float("nan")
+        line = f"{owner}  {sol:.9f} SOL"
+        if mint is not None:
+            token = results[len(owners) + i]
+            line += f"  {token['value']['uiAmountString'] if token else 'no ATA'} tokens"
+        print(line)
+    return 0
+
+
+def deployment(args) -> int:
+    """Show the deployment config; --write saves it (e.g. migrating *_pda.txt), --verify checks the chain."""
+    from fancoin.deployment import Deployment
+
+    try:
+        config = Deployment.load(args.path)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+    if args.endpoint:
+        config.endpoint = args.endpoint
+    print(f"program_id     {config.program_id}")
+    print(f"endpoint       {config.endpoint}")
+    print(f"idl_path       {config.idl_path}")
+    print(f"mint_authority {config.mint_authority.address} (bump {config.mint_authority.bump})")
+    for label, game in config.games.items():
+        default = " (default)" if label == config.default_game else ""
+        print(f"game {label}{default}: mint={game.mint} game={game.game.address} (bump {game.game.bump}) "
+              f"validators cached={len(game._validators)}")
+
+    if args.verify:
+        import asyncio
+
+        from fancoin import rpc
+
+        async def verify_all():
+            try:
+                for label in config.games:
+                    record = await config.verify(rpc.get_client(config.endpoint), label)
+                    print(f"[SUCCESS] {label}: on-chain Game matches (player_count={record.player_count}, "
+                          f"validators={record.validator_count}).")
+            finally:
+                await rpc.close_clients()
+
+        try:
+            asyncio.run(verify_all())
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return 1
+    if args.write:
+        print(f"[INFO] Wrote {config.save()}")
+    return 0
+
+
+def watch(args) -> int:
+    """Print PlayerPda changes as the PlayerFeed sees them, until Ctrl-C (or --seconds)."""
+    import asyncio
+
+    from fancoin import rpc
+    from fancoin.deployment import Deployment
+    from fancoin.feed import PlayerFeed, ws_url_for
+
+    try:
+        config = Deployment.load(args.path)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+    endpoint = args.endpoint or config.endpoint
+    ws_url = None if args.no_ws else (args.ws or ws_url_for(endpoint))
+
+    def show(change):
+        rec = change.new or change.old
+        print(f"slot {change.slot:>10}  {rec.name:<24} {','.join(sorted(change.kinds)):<24} "
+              f"last_minted={rec.last_minted} pending_claim_ts={rec.pending_claim_ts} "
+              f"last_claim_ts={rec.last_claim_ts}", flush=True)
+
+    async def run():
+        feed = PlayerFeed(rpc.get_client(endpoint), config.program_id, ws_url=ws_url)
+        feed.listen(show)
+        try:
+            await feed.start()
+            await asyncio.sleep(args.seconds if args.seconds else float("inf"))
+        finally:
+            await feed.stop()
+            await rpc.close_clients()
+            print(f"[INFO] {len(feed.records)} PlayerPda records; {feed.stats}")
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m fancoin", description="Quick fancoin operator commands.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("verify-keys", help="Check player key files derive their stored address.")
+    p.add_argument("paths", nargs="*", help="Key files (default: player_keys/*.json).")
+    p.add_argument("--verbose", action="store_true")
+    p.set_defaults(fn=verify_keys)
+
+    p = sub.add_parser("balance", help="SOL and game token balance of wallets.")
+    p.add_argument("owners", nargs="+", help="Pubkeys or keypair .json files.")
+    p.add_argument("--mint", help="Token mint (default: the deployment's default game).")
+    p.add_argument("--endpoint", default="http://localhost:8899", help="Solana RPC endpoint.")
+    p.set_defaults(fn=balance)
+
+    p = sub.add_parser("deployment", help="Show / write / verify the deployment config.")
+    p.add_argument("--path", default=DEPLOYMENT_PATH, help="Config file (default deployment.json; else *_pda.txt).")
+    p.add_argument("--endpoint", help="Override the RPC endpoint.")
+    p.add_argument("--write", action="store_true", help="Save the config to --path.")
+    p.add_argument("--verify", action="store_true", help="Check every game against the chain.")
+    p.set_defaults(fn=deployment)
+
+    p = sub.add_parser("watch", help="Follow PlayerPda changes live (programSubscribe, else getSlot polling).")
+    p.add_argument("--path", default=DEPLOYMENT_PATH, help="Config file (default deployment.json; else *_pda.txt).")
+    p.add_argument("--endpoint", help="Override the RPC endpoint.")
+    p.add_argument("--ws", help="Pubsub URL (default: the endpoint's port + 1).")
+    p.add_argument("--no-ws", action="store_true", help="Poll getSlot + rescan instead of subscribing.")
+    p.add_argument("--seconds", type=float, help="Stop after this long.")
+    p.set_defaults(fn=watch)
+
+    args = parser.parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
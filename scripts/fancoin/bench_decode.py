@@ -0,0 +1,133 @@
+"""
+Bulk decode benchmark: anchorpy's construct coder vs fancoin.decoder.
+
+    python -m fancoin.bench_decode --count 100000
+
+Builds `count` synthetic PlayerPda accounts (mixed name lengths, partial
+validators and Option states), decodes them with both paths and prints the
+wall time of each plus the speed-up. A Game and a ValidatorPda round are run
+too so the smaller decoders are covered.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+from anchorpy import Idl
+from anchorpy.coder.accounts import AccountsCoder
+
+from fancoin.decoder import decode_game, decode_players, decode_validator_pda
+from fancoin.layout import encode_account
+
+IDL_PATH = Path("../target/idl/fancoin.json")
+
+
+# --------------------------------------------------------------------
+# Synthetic accounts
+# --------------------------------------------------------------------
+def make_player_blob(i: int) -> bytes:
+    pv_count = i % 5
+    return encode_account("PlayerPda", {
+        "name": f"player_{i:06d}"[: 6 + i % 20],
+        "authority": os.urandom(32),
+        "reward_address": os.urandom(32),
+        "last_name_change": None if i % 3 else 1_700_000_000 + i,
+        "last_reward_change": None,
+        "partial_validators": [os.urandom(32) for _ in range(pv_count)],
+        "last_minted": None if i % 7 == 0 else 1_700_000_000 + i * 60,
+        "pending_claim_ts": 0,
+        "pending_game_time_ms": i * 1000,
+        "pending_paid": i % 2 == 0,
+        "last_claim_ts": 0,
+    })
+
+
+def make_game_blob() -> bytes:
+    return encode_account("Game", {
+        "player_count": 100_000,
+        "validator_count": 6,
+        "active_validator_count": 4,
+        "last_reset_hour": 475_000,
+        "description": "TFC",
+        "socials": "https://example.invalid",
+        "last_seed": 0xDEADBEEF,
+        "last_punch_in_time": 1_710_000_000,
+        "mint_pubkey": os.urandom(32),
+        "commission_ata": os.urandom(32),
+        "commission_percent": 20,
+        "coin_issuance_rate": 2_833_333,
+        "validator_claim_rate": 28_570,
+        "curated_val": True,
+        "owner": os.urandom(32),
+        "claim_rate_lock": False,
+        "coin_issuance_rate_lock": False,
+        "commission_percent_lock": True,
+        "gatekeeper_network": os.urandom(32),
+    })
+
+
+def make_validator_blob(i: int) -> bytes:
+    return encode_account("ValidatorPda", {
+        "address": os.urandom(32),
+        "last_activity": 1_710_000_000 + i,
+        "last_minted": None if i % 2 else 1_710_000_000,
+        "last_claimed": 1_709_999_000,
+    })
+
+
+# --------------------------------------------------------------------
+# Timing
+# --------------------------------------------------------------------
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _check_same(anchor_acct, rec):
+    for field in ("name", "reward_address", "last_minted", "pending_paid", "last_claim_ts"):
+        if getattr(anchor_acct, field) != getattr(rec, field):
+            raise AssertionError(f"decoder mismatch on {field}: {getattr(anchor_acct, field)} != {getattr(rec, field)}")
+    if list(anchor_acct.partial_validators) != rec.partial_validators:
+        raise AssertionError("decoder mismatch on partial_validators")
+
+
+def run(count: int, idl_path: Path):
+    idl = Idl.from_json(idl_path.read_text(encoding="utf-8"))
+    coder = AccountsCoder(idl)
+
+    print(f"[INFO] Building {count} synthetic PlayerPda accounts...")
+    raw = [(i, make_player_blob(i)) for i in range(count)]
+
+    t_anchor, anchor_out = _timed(lambda: [(k, coder.decode(d)) for k, d in raw])
+    t_fast, fast_out = _timed(lambda: decode_players(raw))
+    t_fast_touch, _ = _timed(lambda: [(r.name, r.reward_address) for _k, r in fast_out])
+
+    for i in range(0, count, max(1, count // 100)):
+        _check_same(anchor_out[i][1], fast_out[i][1])
+
+    print(f"[BENCH] PlayerPda x{count}")
+    print(f"    anchorpy coder       : {t_anchor:8.3f} s  ({count / t_anchor:,.0f}/s)")
+    print(f"    fancoin.decoder      : {t_fast:8.3f} s  ({count / t_fast:,.0f}/s)")
+    print(f"    + name/reward access : {t_fast_touch:8.3f} s")
+    print(f"    speed-up             : {t_anchor / t_fast:8.1f}x")
+
+    game = make_game_blob()
+    t_anchor, g1 = _timed(lambda: [coder.decode(game) for _ in range(10_000)])
+    t_fast, g2 = _timed(lambda: [decode_game(game) for _ in range(10_000)])
+    assert g1[0].coin_issuance_rate == g2[0].coin_issuance_rate and g1[0].owner == g2[0].owner
+    print(f"[BENCH] Game x10000 => anchorpy {t_anchor:.3f} s, fancoin {t_fast:.3f} s ({t_anchor / t_fast:.1f}x)")
+
+    vals = [make_validator_blob(i) for i in range(10_000)]
+    t_anchor, v1 = _timed(lambda: [coder.decode(v) for v in vals])
+    t_fast, v2 = _timed(lambda: [decode_validator_pda(v) for v in vals])
+    assert v1[1].last_minted == v2[1].last_minted and v1[1].address == v2[1].address
+    print(f"[BENCH] ValidatorPda x10000 => anchorpy {t_anchor:.3f} s, fancoin {t_fast:.3f} s ({t_anchor / t_fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare anchorpy vs fancoin.decoder bulk decode speed")
+    parser.add_argument("--count", type=int, default=100_000, help="Number of PlayerPda accounts to decode.")
+    parser.add_argument("--idl", type=Path, default=IDL_PATH, help="Path to the fancoin IDL json.")
+    args = parser.parse_args()
+    run(args.count, args.idl)
@@ -0,0 +1,404 @@
+"""
+End-to-end benchmark of the player / validator flows against the fake node.
+
+    python -m fancoin.bench_e2e --players 10 100 1000 10000
+    python -m fancoin.bench_e2e --players 1000 --latency-ms 2 --baseline logs/bench_e2e_abc1234.json
+
+For each scale a fresh FakeChain (fancoin.fake_rpc + fancoin.fake_program)
+is served over localhost HTTP from its own thread, with fake master / A2S
+servers (fancoin.fake_a2s) holding that many players, and the real library
+code runs every stage in order:
+
+    scrape -> keygen -> funding -> create_user_ata -> register_player_pda
+           -> submit_minting_list -> request_claim -> validate_player_pubg_time_slim
+
+Per stage: items, wall time, throughput, p50/p99 per-item latency, JSON-RPC
+calls and HTTP round trips seen by the node (and per player), TXs, process
+CPU time and the benchmark loop thread's CPU time (the node runs in another
+thread, so loop_cpu_s is the client side alone).
+
+Results go to logs/bench_e2e_<commit>.json (or --out), so runs from
+different commits can be compared with --baseline.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from anchorpy import Idl, Program, Provider, Wallet
+from solders.keypair import Keypair
+
+from fancoin import fake_program, pdas, query, rpc
+from fancoin.decoder import decode_game
+from fancoin.fake_a2s import FakeA2SFarm, FakeA2SServer, FakeMasterServer, spread_players
+from fancoin.fake_rpc import FakeChain, FakeRpcThread, seed_world
+from fancoin.identity import ValidatorIdentity, load_player_records, new_player_record, save_player_record
+from fancoin.minting import CHUNK_SIZE, punch_in, submit_minting_list
+from fancoin.player_table import load_player_table
+from fancoin.players import (
+    TRANSFERS_PER_TX,
+    create_user_ata_if_needed,
+    fund_wallets,
+    register_player_pda,
+    request_claim,
+    validate_player_pubg_time_slim,
+)
+from fancoin.scrape import dedupe_by_ip, query_master_server, scrape_player_names
+
+IDL_PATH = Path("../target/idl/fancoin.json")
+DEFAULT_SCALES = (10, 100, 1_000, 10_000)
+DEFAULT_CONCURRENCY = 32
+PLAYERS_PER_SERVER = 32
+FUNDER_LAMPORTS = 10 ** 18
+VALIDATED_SECONDS = 3600
+MINT_MINUTE = 8  # chain clock minute set before punch_in (inside the mint window)
+
+STAGES = (
+    "scrape",
+    "keygen",
+    "funding",
+    "create_user_ata",
+    "register_player_pda",
+    "submit_minting_list",
+    "request_claim",
+    "validate_player_pubg_time_slim",
+)
+
+
+# --------------------------------------------------------------------
+# Measurement
+# --------------------------------------------------------------------
+def percentile(samples, pct: float):
+    """Nearest-rank percentile, None for no samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Stage:
+    """Context manager collecting one stage's timings and node counters."""
+
+    def __init__(self, name: str, chain: FakeChain, players: int):
+        self.name = name
+        self.chain = chain
+        self.players = players
+        self.items = 0
+        self.errors = 0
+        self.first_error = None
+        self.samples = []
+
+    def __enter__(self):
+        self._stats = self.chain.stats()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._loop_cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_s = time.perf_counter() - self._wall
+        self.cpu_s = time.process_time() - self._cpu
+        self.loop_cpu_s = time.thread_time() - self._loop_cpu
+        end = self.chain.stats()
+        self.rpc_calls = end["rpc_calls"] - self._stats["rpc_calls"]
+        self.http_requests = end["http_requests"] - self._stats["http_requests"]
+        self.transactions = end["transactions"] - self._stats["transactions"]
+        return False
+
+    def failed(self, exc: Exception):
+        self.errors += 1
+        if self.first_error is None:
+            self.first_error = f"{type(exc).__name__}: {exc}"[:300]
+
+    async def timed(self, coro, items: int = 1):
+        """Await coro as one sample covering `items` items; exceptions count as errors."""
+        start = time.perf_counter()
+        try:
+            result = await coro
+        except Exception as e:
+            self.failed(e)
+            result = None
+        else:
+            self.items += items
+        self.samples.append(time.perf_counter() - start)
+        return result
+
+    def result(self) -> dict:
+        p50, p99 = percentile(self.samples, 50), percentile(self.samples, 99)
+        return {
+            "items": self.items,
+            "errors": self.errors,
+            "first_error": self.first_error,
+            "wall_s": round(self.wall_s, 4),
+            "throughput_per_s": round(self.items / self.wall_s, 2) if self.wall_s else None,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 3),
+            "p99_ms": None if p99 is None else round(p99 * 1000, 3),
+            "rpc_calls": self.rpc_calls,
+            "http_requests": self.http_requests,
+            "rpc_calls_per_player": round(self.rpc_calls / self.players, 3) if self.players else None,
+            "transactions": self.transactions,
+            "cpu_s": round(self.cpu_s, 4),
+            "loop_cpu_s": round(self.loop_cpu_s, 4),
+        }
+
+
+async def bounded(coros, limit: int):
+    sem = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*(run(c) for c in coros))
+
+
+def loopback_host(i: int) -> str:
+    """Distinct 127/8 address per fake server (dedupe_by_ip keeps one port per IP)."""
+    return f"127.1.{i // 250}.{i % 250 + 1}"
+
+
+def offset_to_minute(minute: int) -> float:
+    """clock_offset_s that puts the chain clock at `minute` past the hour now."""
+    return (minute * 60 - time.time() % 3600) % 3600
+
+
+# --------------------------------------------------------------------
+# One scale
+# --------------------------------------------------------------------
+async def run_scale(players: int, idl: Idl, args) -> dict:
+    chain = FakeChain(latency_s=args.latency_ms / 1000, jitter_s=args.jitter_ms / 1000,
+                      failure_rate=args.failure_rate, seed=args.seed)
+    fake_program.install(chain)
+    world = seed_world(chain, validators=1)
+    game_pda, mint, mint_authority = world["game"], world["mint"], world["mint_authority"]
+    funder = Keypair()
+    chain.fund(funder.pubkey(), FUNDER_LAMPORTS)
+
+    names = [f"bench{i:05d}" for i in range(players)]
+    buckets = spread_players(names, math.ceil(players / PLAYERS_PER_SERVER), PLAYERS_PER_SERVER)
+    farm = FakeA2SFarm([FakeA2SServer.start(p, host=loopback_host(i)) for i, p in enumerate(buckets.values())])
+    master = FakeMasterServer.start(farm.addresses)
+    node = FakeRpcThread(chain).start()
+    key_dir = tempfile.mkdtemp(prefix="bench_keys_")
+
+    client = rpc.get_client(node.url, batching=True)
+    program = Program(idl, pdas.PROGRAM_ID, Provider(client, Wallet(funder)))
+    ident = ValidatorIdentity(world["validators"][0], mint, pdas.PROGRAM_ID, label="bench-val")
+    results = {}
+    try:
+        # (1) scrape: master server list + A2S sweep
+        with Stage("scrape", chain, players) as st:
+            loop = asyncio.get_running_loop()
+
+            async def scrape():
+                servers = await loop.run_in_executor(
+                    None, lambda: dedupe_by_ip(query_master_server(master=master.address))
+                )
+                return await scrape_player_names(servers)
+
+            scraped = await st.timed(scrape(), items=0) or set()
+            st.items = len(scraped)
+        results["scrape"] = st.result()
+
+        # (2) keygen: 2_scraper2.py key files
+        with Stage("keygen", chain, players) as st:
+            for name in sorted(scraped):
+                await st.timed(_sync(save_player_record, key_dir, name, new_player_record()))
+            keys = load_player_records(key_dir)
+        results["keygen"] = st.result()
+
+        # (3) funding: lamports for fees + rent
+        with Stage("funding", chain, players) as st:
+            pubkeys = [kp.pubkey() for kp in keys.values()]
+            chunks = [pubkeys[i:i + TRANSFERS_PER_TX] for i in range(0, len(pubkeys), TRANSFERS_PER_TX)]
+            sent = await bounded(
+                [st.timed(fund_wallets(client, funder, chunk), items=len(chunk)) for chunk in chunks],
+                args.concurrency,
+            )
+            for sigs in sent:
+                for sig in sigs or ():
+                    if isinstance(sig, Exception):
+                        st.failed(sig)
+        results["funding"] = st.result()
+
+        # (4) create_user_ata_if_needed: independent per player
+        with Stage("create_user_ata", chain, players) as st:
+            await bounded(
+                [st.timed(create_user_ata_if_needed(program, game_pda, mint, kp)) for kp in keys.values()],
+                args.concurrency,
+            )
+        results["create_user_ata"] = st.result()
+
+        # (5) register_player_pda: one at a time, index tracked locally
+        with Stage("register_player_pda", chain, players) as st:
+            index = None
+            for name, kp in keys.items():
+                if index is None:
+                    game_resp = await client.get_account_info(game_pda)
+                    index = decode_game(bytes(game_resp.value.data)).player_count
+                errors = st.errors
+                await st.timed(register_player_pda(program, game_pda, mint, name, kp, index))
+                index = index + 1 if st.errors == errors else None
+        results["register_player_pda"] = st.result()
+
+        # (6) punch_in + chunked submit_minting_list for the scraped names
+        chain.clock_offset_s = offset_to_minute(MINT_MINUTE)
+        with Stage("submit_minting_list", chain, players) as st:
+            game = decode_game(bytes((await client.get_account_info(game_pda)).value.data))
+            with contextlib.redirect_stdout(io.StringIO()):
+                punched = await punch_in(program, game_pda, mint, ident)
+            if not punched:
+                st.failed(RuntimeError("punch_in failed"))
+            table = await load_player_table(client, pdas.PROGRAM_ID, game_pda, game.player_count)
+            matched = [n for n in sorted(scraped) if n in table]
+            for start in range(0, len(matched), CHUNK_SIZE):
+                chunk = matched[start:start + CHUNK_SIZE]
+                sent = await st.timed(
+                    submit_minting_list(program, game_pda, mint, mint_authority, game.commission_ata, ident,
+                                        chunk, table, chunk_pause_s=0),
+                    items=len(chunk),
+                )
+                if sent == 0:
+                    st.items -= len(chunk)
+                    st.failed(RuntimeError("submit_minting_list chunk not sent"))
+        results["submit_minting_list"] = st.result()
+
+        # (7) request_claim: player-signed, independent per player
+        with Stage("request_claim", chain, players) as st:
+            await bounded(
+                [
+                    st.timed(request_claim(program, game_pda, mint, name, kp, table[name]["pda"]))
+                    for name, kp in keys.items() if name in table
+                ],
+                args.concurrency,
+            )
+        results["request_claim"] = st.result()
+
+        # (8) validate_player_pubg_time_slim for every pending_paid player
+        with Stage("validate_player_pubg_time_slim", chain, players) as st:
+            paid = await query.fetch_paid_players(program)
+            await bounded(
+                [
+                    st.timed(validate_player_pubg_time_slim(
+                        program, game_pda, mint, mint_authority, ident, rec.name, pubkey, rec.reward_address,
+                        VALIDATED_SECONDS, commission_ata=game.commission_ata,
+                    ))
+                    for pubkey, rec in paid
+                ],
+                args.concurrency,
+            )
+        results["validate_player_pubg_time_slim"] = st.result()
+    finally:
+        await rpc.close_clients()
+        node.stop()
+        farm.stop()
+        master.stop()
+        shutil.rmtree(key_dir, ignore_errors=True)
+
+    return {
+        "players": players,
+        "total_wall_s": round(sum(r["wall_s"] for r in results.values()), 4),
+        "node": chain.stats(),
+        "stages": results,
+    }
+
+
+async def _sync(fn, *args):
+    return fn(*args)
+
+
+# --------------------------------------------------------------------
+# Report
+# --------------------------------------------------------------------
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_run(run: dict, baseline: dict = None):
+    print(f"[BENCH] {run['players']} players => {run['total_wall_s']:.2f} s total")
+    print(f"    {'stage':32} {'items':>6} {'items/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'rpc/pl':>7} {'cpu s':>7}"
+          f"{'  vs base' if baseline else ''}")
+    for name in STAGES:
+        r = run["stages"].get(name)
+        if r is None:
+            continue
+        line = (f"    {name:32} {r['items']:>6} {r['throughput_per_s'] or 0:>10.1f} {r['p50_ms'] or 0:>9.2f}"
+                f" {r['p99_ms'] or 0:>9.2f} {r['rpc_calls_per_player'] or 0:>7.2f} {r['cpu_s']:>7.2f}")
+        old = (baseline or {}).get(name)
+        if old and old.get("throughput_per_s") and r["throughput_per_s"]:
+            line += f"  {r['throughput_per_s'] / old['throughput_per_s']:>6.2f}x"
+        if r["errors"]:
+            line += f"  [{r['errors']} errors: {r['first_error']}]"
+        print(line)
+
+
+def load_baseline(path: Path) -> dict:
+    """{players: {stage: result}} from an earlier report."""
+    report = json.loads(path.read_text())
+    return {run["players"]: run["stages"] for run in report["runs"]}
+
+
+async def main(args):
+    idl = Idl.from_json(args.idl.read_text(encoding="utf-8"))
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+    report = {
+        "benchmark": "e2e",
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "failure_rate": args.failure_rate,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "runs": [],
+    }
+    for players in args.players:
+        print(f"[INFO] Running {players} players...")
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with quiet:
+            run = await run_scale(players, idl, args)
+        report["runs"].append(run)
+        print_run(run, baseline.get(players))
+
+    out = args.out or Path("logs") / f"bench_e2e_{report['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"[SUCCESS] Wrote {out}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end fancoin flow benchmark against the fake node")
+    parser.add_argument("--players", type=int, nargs="+", default=list(DEFAULT_SCALES), help="Scales to run.")
+    parser.add_argument("--idl", type=Path, default=IDL_PATH, help="Path to the fancoin IDL json.")
+    parser.add_argument("--out", type=Path, default=None, help="JSON report path.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier report to compare throughput with.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="In-flight TXs for the independent per-player stages.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake node latency per HTTP request.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Injected JSON-RPC error rate.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Keep the library's per-TX output.")
+    args = parser.parse_args()
+    if not args.idl.exists():
+        print(f"[ERROR] IDL file not found at {args.idl.resolve()}")
+        sys.exit(1)
+    asyncio.run(main(args))
@@ -0,0 +1,110 @@
+"""
+Instruction build benchmark: anchorpy's program.instruction vs
+fancoin.encoders.
+
+    python -m fancoin.bench_encode --count 20000 --players 24
+
+Builds submit_minting_list (`players` ids + leftover accounts),
+request_claim and register_player_pda `count` times each through both
+paths, checks the instructions are byte-for-byte equal and prints the
+time per build and the speed-up. Nothing is sent; no validator needed.
+"""
+import argparse
+import gc
+import time
+from pathlib import Path
+
+from anchorpy import Context, Program, Provider, Wallet
+from solana.rpc.async_api import AsyncClient
+from solders.instruction import AccountMeta
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from fancoin import pdas
+from fancoin.encoders import KNOWN_ACCOUNTS, InstructionSet
+from fancoin.runtime import load_idl
+
+IDL_PATH = Path("../target/idl/fancoin.json")
+
+
+def _timed(fn, count: int):
+    gc.collect()  # don't bill one path for the other's garbage
+    start = time.perf_counter()
+    for i in range(count):
+        out = fn(i)
+    return (time.perf_counter() - start) / count, out
+
+
+def _cases(program, encoders, players: int):
+    game, mint, validator = Pubkey.new_unique(), Pubkey.new_unique(), Keypair()
+    validator_key = validator.pubkey()  # Keypair.pubkey() derives the key each call (~45 us)
+    authority = pdas.mint_authority_pda(program.program_id)[0]
+    validator_pda = pdas.validator_pda(mint, validator_key, program.program_id)[0]
+    leftover = [AccountMeta(Pubkey.new_unique(), False, True) for _ in range(1 + 2 * players)]
+    ids = list(range(players))
+
+    submit_accounts = dict(KNOWN_ACCOUNTS, game=game, validator_pda=validator_pda, validator=validator_key,
+                           fancy_mint=mint, mint_authority=authority, gateway_token=validator_key)
+    submit = encoders["submit_minting_list"].bind(game=game, fancy_mint=mint, mint_authority=authority)
+    yield (
+        f"submit_minting_list ({players} players)",
+        lambda i: program.instruction["submit_minting_list"](
+            mint, ids, ctx=Context(accounts=submit_accounts, signers=[validator], remaining_accounts=leftover)),
+        lambda i: submit.build(mint, ids, validator_pda=validator_pda, validator=validator_key,
+                               gateway_token=validator_key, remaining=leftover),
+    )
+
+    user, name_pda, player_pda = Pubkey.new_unique(), Pubkey.new_unique(), Pubkey.new_unique()
+    claim_accounts = dict(KNOWN_ACCOUNTS, game=game, player_name_pda=name_pda, player_pda=player_pda,
+                          gateway_token=user, user=user)
+    claim = encoders["request_claim"].bind(game=game)
+    yield (
+        "request_claim",
+        lambda i: program.instruction["request_claim"](mint, f"player{i % 1000}", ctx=Context(accounts=claim_accounts)),
+        lambda i: claim.build(mint, f"player{i % 1000}", player_name_pda=name_pda, player_pda=player_pda,
+                              gateway_token=user, user=user),
+    )
+
+    reg_accounts = dict(KNOWN_ACCOUNTS, game=game, fancy_mint=mint, player_pda=player_pda,
+                        player_name_pda=name_pda, gateway_token=user, user=user)
+    register = encoders["register_player_pda"].bind(game=game, fancy_mint=mint)
+    yield (
+        "register_player_pda",
+        lambda i: program.instruction["register_player_pda"](
+            mint, f"player{i % 1000}", ctx=Context(accounts=reg_accounts, remaining_accounts=leftover[:2])),
+        lambda i: register.build(mint, f"player{i % 1000}", player_pda=player_pda, player_name_pda=name_pda,
+                                 gateway_token=user, user=user, remaining=leftover[:2]),
+    )
+
+
+def run(count: int, players: int, idl_path: Path):
+    program = Program(load_idl(idl_path), pdas.PROGRAM_ID, Provider(AsyncClient("http://127.0.0.1:8899"),
+                                                                     Wallet(Keypair())))
+    start = time.perf_counter()
+    encoders = InstructionSet(idl_path, pdas.PROGRAM_ID)
+    for name in encoders.specs:
+        try:
+            encoders[name]
+        except ValueError as e:
+            print(f"[WARN] {name}: {e}")
+    print(f"[INFO] Compiled {len(encoders.specs)} encoders in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for label, anchor_fn, fast_fn in _cases(program, encoders, players):
+        for i in (0, 1, count - 1):
+            if bytes(anchor_fn(i)) != bytes(fast_fn(i)):
+                raise AssertionError(f"{label}: encoders differ from program.instruction")
+        t_anchor, _ = _timed(anchor_fn, count)
+        t_fast, _ = _timed(fast_fn, count)
+        print(f"[BENCH] {label} x{count}")
+        print(f"    anchorpy program.instruction : {t_anchor * 1e6:8.1f} us / build")
+        print(f"    fancoin.encoders             : {t_fast * 1e6:8.1f} us / build")
+        print(f"    speed-up                     : {t_anchor / t_fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare anchorpy vs fancoin.encoders instruction build speed")
+    parser.add_argument("--count", type=int, default=20_000, help="Builds per instruction and path.")
+    parser.add_argument("--players", type=int, default=24, help="Players per submit_minting_list.")
+    parser.add_argument("--idl", type=Path, default=IDL_PATH, help="Path to the fancoin IDL json.")
+    args = parser.parse_args()
+    run(args.count, args.players, args.idl)
@@ -0,0 +1,129 @@
+"""
+Cold-start benchmark for the quick operator commands.
+
+    python -m fancoin.bench_startup
+    python -m fancoin.bench_startup --runs 10 --out logs/bench_startup.json
+
+Every target runs in a fresh interpreter under `python -X importtime`.
+For each one the benchmark reports the median wall time over --runs,
+the total import time and the heaviest top-level imports.
+
+Targets:
+  - legacy:   the module-level imports of verify_keys.py and
+              18_display_token_balances.py, run on their own without the
+              GUI / network part,
+  - commands: `python -m fancoin verify-keys` on generated key files and
+              `python -m fancoin balance` against a local fake node,
+  - modules:  fancoin.players / fancoin.bootstrap, which now take anchorpy
+              through fancoin.runtime.lazy_import.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fancoin.bench_e2e import git_commit
+from fancoin.fake_rpc import FakeChain, FakeRpcThread, seed_world
+from fancoin.identity import new_player_record, save_player_record
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+LEGACY_SCRIPTS = ("verify_keys.py", "18_display_token_balances.py")
+KEY_FILES = 20
+TOP_IMPORTS = 5
+
+
+def script_imports(path: Path) -> str:
+    """The top-level import statements of a script, as one source string."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    nodes = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(n) for n in nodes)
+
+
+def parse_importtime(stderr: str) -> dict:
+    """
+    Sum of the top-level cumulative times (us) and the heaviest of them.
+    Lines look like `import time:  self [us] | cumulative | imported package`,
+    nested imports indented by two more spaces per level.
+    """
+    top = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, package = line[len("import time:"):].split("|")
+        if not package.startswith("  "):  # one separator space => top level
+            top.append((package.strip(), int(cumulative)))
+    top.sort(key=lambda item: item[1], reverse=True)
+    return {
+        "import_ms": round(sum(us for _, us in top) / 1000, 1),
+        "modules": sum(1 for line in stderr.splitlines() if line.startswith("import time:")) - 1,
+        "heaviest": [(name, round(us / 1000, 1)) for name, us in top[:TOP_IMPORTS]],
+    }
+
+
+def measure(argv: list, runs: int, env: dict) -> dict:
+    walls, last = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        last = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=SCRIPTS_DIR, env=env,
+                              capture_output=True, text=True)
+        walls.append(time.perf_counter() - t0)
+    result = {"wall_ms": round(statistics.median(walls) * 1000, 1), "exit": last.returncode}
+    result.update(parse_importtime(last.stderr))
+    return result
+
+
+def targets(key_dir: Path, endpoint: str, owner: str, mint: str) -> list:
+    keys = sorted(str(p) for p in key_dir.glob("*.json"))
+    out = [(f"legacy {name} (imports)", ["-c", script_imports(SCRIPTS_DIR / name)]) for name in LEGACY_SCRIPTS]
+    out += [
+        ("python -m fancoin verify-keys", ["-m", "fancoin", "verify-keys", *keys]),
+        ("python -m fancoin balance", ["-m", "fancoin", "balance", owner, "--mint", mint, "--endpoint", endpoint]),
+        ("import fancoin.players", ["-c", "import fancoin.players"]),
+        ("import fancoin.bootstrap", ["-c", "import fancoin.bootstrap"]),
+    ]
+    return out
+
+
+def main(args):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SCRIPTS_DIR), env.get("PYTHONPATH")) if p)
+    key_dir = Path(tempfile.mkdtemp(prefix="bench_startup_"))
+    for i in range(KEY_FILES):
+        save_player_record(key_dir, f"player{i:03d}", new_player_record())
+
+    chain = FakeChain()
+    world = seed_world(chain, validators=1)
+    owner = world["validators"][0].pubkey()
+    chain.add_token_account(owner, world["mint"], 1_000_000)
+    node = FakeRpcThread(chain).start()
+
+    report = {"benchmark": "startup", "commit": git_commit(), "python": sys.version.split()[0],
+              "runs": args.runs, "targets": {}}
+    try:
+        for label, argv in targets(key_dir, node.url, str(owner), str(world["mint"])):
+            r = measure(argv, args.runs, env)
+            report["targets"][label] = r
+            heaviest = ", ".join(f"{n} {ms:.0f}" for n, ms in r["heaviest"][:3])
+            flag = "" if r["exit"] == 0 else f"  [exit {r['exit']}]"
+            print(f"[BENCH] {label:48} wall {r['wall_ms']:>7.1f} ms  imports {r['import_ms']:>7.1f} ms"
+                  f"  ({r['modules']} modules; {heaviest}){flag}")
+    finally:
+        node.stop()
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"[SUCCESS] Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start (-X importtime) benchmark of the quick commands")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (median wall time).")
+    parser.add_argument("--out", type=Path, default=None, help="JSON report path.")
+    main(parser.parse_args())
@@ -0,0 +1,136 @@
+"""
+The run_sequence.sh bootstrap as one Pipeline.
+
+    1_val_pay_vals_from_localwallet.py  -> fund_validators
+    2_scraper2.py                       -> scrape_players
+    3_val1_init.py                      -> init_game, register_val1, punch_in_val1
+    4_val2_init.py                      -> register_val2, punch_in_val2
+    5_mass_signup.py                    -> mass_signup
+    6_punch_in.py / 7_punch_in2.py      -> punch_in_val1 / punch_in_val2
+
+The shell script ran these one after another; here funding, scraping and
+game creation start together, validator registration / punch-in overlap
+with the player signups, and every stage uses the RunContext's client,
+Program and keys. The local wallet owns the game and pays TX fees, as in
+the scripts.
+"""
+import asyncio
+import shutil
+from pathlib import Path
+
+from fancoin import game_setup, payers, players
+from fancoin.deployment import DEFAULT_GAME, DEPLOYMENT_PATH, Deployment
+from fancoin.identity import load_player_records, new_player_record, save_player_record
+from fancoin.minting import punch_in
+from fancoin.pipeline import Pipeline, RunContext
+from fancoin.scrape import MASTER_SERVER, dedupe_by_ip, query_master_server, scrape_player_names
+
+VALIDATOR_LAMPORTS = 1_000_000_000  # 1 SOL, same as 1_val_pay_vals_from_localwallet.py
+PLAYER_DIR = "player_keys"
+VALIDATORS = ("val1", "val2")
+
+
+def _raise_first(results, what: str):
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        raise RuntimeError(f"{len(errors)}/{len(results)} {what} failed; first: {errors[0]!r}")
+
+
+# --------------------------------------------------------------------
+# Stages
+# --------------------------------------------------------------------
+async def fund_validators(ctx: RunContext):
+    vals = ctx.keys.validators()
+    if not vals:
+        print("[WARN] No val*-keypair.json files found. Nothing to fund.")
+        return {}
+    sigs = await payers.fund_sharded(ctx.client, ctx.payer, [kp.pubkey() for kp in vals.values()],
+                                     VALIDATOR_LAMPORTS, payers=ctx.options.get("payers", 1))
+    _raise_first(sigs, "validator transfers")
+    print(f"[SUCCESS] Sent {VALIDATOR_LAMPORTS / 1e9:g} SOL to {', '.join(vals)}.")
+    return {label: str(kp.pubkey()) for label, kp in vals.items()}
+
+
+async def scrape_players(ctx: RunContext):
+    """Fresh player_keys/ with one 2_scraper2.py key file per scraped name."""
+    folder = ctx.options.get("player_dir", PLAYER_DIR)
+    shutil.rmtree(folder, ignore_errors=True)
+    master = ctx.options.get("master", MASTER_SERVER)
+    loop = asyncio.get_running_loop()
+    servers = await loop.run_in_executor(None, lambda: dedupe_by_ip(query_master_server(master=master)))
+    print(f"[INFO] Number of unique TFC servers found: {len(servers)}")
+    names = await scrape_player_names(servers)
+    for name in sorted(names):
+        save_player_record(folder, name, new_player_record())
+    print(f"[INFO] Saved {len(names)} player key files in {folder}/")
+    return sorted(names)
+
+
+async def init_game(ctx: RunContext):
+    game = await game_setup.initialize_game_and_mint(ctx.program, ctx.payer, **ctx.options.get("game_args", {}))
+    game_setup.write_pda_files(game, ctx.options.get("pda_dir", "."))
+    path = Path(ctx.options.get("deployment", DEPLOYMENT_PATH))
+    deployment = (Deployment.load(path) if path.exists()
+                  else Deployment(ctx.program_id, ctx.endpoint, ctx.idl_path, path=path))
+    deployment.add_game(game["mint"], ctx.options.get("game_label", DEFAULT_GAME), owner=ctx.payer.pubkey(),
+                        commission_ata=game["commission_ata"])
+    deployment.save()
+    print(f"[INFO] PDAs written to .txt files and {path}.")
+    return game
+
+
+def _register(label: str):
+    async def register(ctx: RunContext):
+        game = ctx.results["init_game"]
+        ident = ctx.keys.identity(label, game["mint"], ctx.program_id)
+        await game_setup.ensure_validator(ctx.program, game["game"], game["mint"], ident, owner_kp=ctx.payer)
+        return str(ident.validator_pda)
+    return register
+
+
+def _punch_in(label: str):
+    async def punch(ctx: RunContext):
+        game = ctx.results["init_game"]
+        ident = ctx.keys.identity(label, game["mint"], ctx.program_id)
+        if not await punch_in(ctx.program, game["game"], game["mint"], ident):
+            raise RuntimeError(f"{label}: punch_in failed")
+    return punch
+
+
+async def mass_signup(ctx: RunContext):
+    """
+    5_mass_signup.py: fund every player key, then create_user_ata_if_needed
+    + register_player_pda for as many players per TX as fit
+    (players.onboard). The registrations need consecutive
+    Game.player_count values, so those TXs go one after another.
+    """
+    game = ctx.results["init_game"]
+    game_pda, mint = game["game"], game["mint"]
+    keys = load_player_records(ctx.options.get("player_dir", PLAYER_DIR))
+    if not keys:
+        print("[WARN] No player key files. Nothing to sign up.")
+        return {"registered": 0, "failed": 0}
+
+    # with --payers N the transfers are paid by N sub-payers, not all queued on the local wallet
+    sigs = await payers.fund_sharded(ctx.client, ctx.payer, [kp.pubkey() for kp in keys.values()],
+                                     players.LAMPORTS_TO_SEND, payers=ctx.options.get("payers", 1))
+    _raise_first(sigs, "player transfers")
+
+    result = await players.onboard(ctx.program, game_pda, mint, keys, max_per_tx=ctx.options.get("players_per_tx"))
+    registered, failed = result["registered"], result["failed"]
+    if failed and not registered:
+        raise RuntimeError(f"every registration failed; first: {failed[0]}")
+    return {"registered": len(registered), "failed": len(failed), "txs": result["txs"] + len(sigs)}
+
+
+def build_pipeline(validators=VALIDATORS) -> Pipeline:
+    pipe = Pipeline()
+    pipe.add("fund_validators", fund_validators)
+    pipe.add("scrape_players", scrape_players)
+    pipe.add("init_game", init_game)
+    for label in validators:
+        # funded first: on an open game the validator pays for its own PDA + ATA
+        pipe.add(f"register_{label}", _register(label), ("init_game", "fund_validators"))
+        pipe.add(f"punch_in_{label}", _punch_in(label), (f"register_{label}",))
+    pipe.add("mass_signup", mass_signup, ("init_game", "scrape_players"))
+    return pipe
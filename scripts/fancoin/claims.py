@@ -0,0 +1,174 @@
+"""
+Validator reward claims on the cadence that loses no minutes.
+
+claim_validator_reward pays CLAIM_RATE_PER_MINUTE for every whole minute since
+last_claimed, capped at 60, and pays nothing once last_minted is more than an
+hour old (last_claimed is then left untouched). last_claimed is reset to the
+claim time, so
+  - claiming later than last_claimed + 60 min loses the overflow,
+  - claiming mid-minute loses the partial minute,
+  - claiming after last_minted + 1h loses everything accrued.
+The best moment is therefore last_claimed + 60 min, or the last whole-minute
+boundary before the last_minted window closes if that comes first.
+
+ClaimDaemon reads every ValidatorPda of the fleet with one batched
+getMultipleAccounts, works out each claim time with the rules above and sends
+the due claims concurrently through one shared Program / client.
+"""
+import asyncio
+import traceback
+
+from solders.instruction import AccountMeta
+from solders.system_program import ID as SYS_PROGRAM_ID
+
+from fancoin import pdas, query
+from fancoin.decoder import DecodeError, decode_validator_pda
+from fancoin.identity import ValidatorIdentity
+from fancoin.runtime import lazy_import
+from fancoin.schedule import ChainClock
+
+anchorpy = lazy_import("anchorpy")
+
+CLAIM_RATE_PER_MINUTE = 28_570
+MAX_CLAIM_MINUTES = 60
+MINTED_WINDOW_S = 3600
+
+# Seconds past a minute boundary / before the window closes, so the claim
+# lands on the right side of it once it reaches the cluster.
+CLAIM_MARGIN_S = 5
+POLL_S = 60
+MIN_SLEEP_S = 1
+
+
+def claimable_minutes(rec, now) -> int:
+    """Minutes claim_validator_reward would pay if it ran at `now`."""
+    if now - (rec.last_minted or 0) > MINTED_WINDOW_S:
+        return 0
+    return min(int(now - (rec.last_claimed or 0)) // 60, MAX_CLAIM_MINUTES)
+
+
+def next_claim_time(rec, now):
+    """
+    Unix time to send the next claim for this ValidatorPda, or None when
+    nothing can be claimed until the validator mints again.
+    """
+    if rec.last_minted is None:
+        return None
+    latest = rec.last_minted + MINTED_WINDOW_S - CLAIM_MARGIN_S
+    if latest <= now:
+        return None
+    last_claimed = rec.last_claimed or 0
+
+    full = last_claimed + MAX_CLAIM_MINUTES * 60 + CLAIM_MARGIN_S
+    if full <= latest:
+        return max(full, now)
+
+    # Window closes first => last whole minute before it
+    whole_minutes = int(latest - CLAIM_MARGIN_S - last_claimed) // 60
+    if whole_minutes <= 0:
+        return None
+    return max(last_claimed + whole_minutes * 60 + CLAIM_MARGIN_S, now)
+
+
+# --------------------------------------------------------------------
+# Daemon
+# --------------------------------------------------------------------
+async def send_claim(program, game_pda, mint, mint_authority, ident: ValidatorIdentity):
+    """claim_validator_reward for one identity => tx signature or None."""
+    try:
+        return await program.rpc["claim_validator_reward"](
+            mint,
+            ctx=anchorpy.Context(
+                accounts={
+                    "game": game_pda,
+                    "validator_pda": ident.validator_pda,
+                    "validator": ident.pubkey,
+                    "fancy_mint": mint,
+                    "gateway_token": ident.gateway_token,
+                    "mint_authority": mint_authority,
+                    "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+                    "system_program": SYS_PROGRAM_ID,
+                },
+                signers=[ident.keypair],
+                remaining_accounts=[AccountMeta(pubkey=ident.ata, is_signer=False, is_writable=True)],
+            ),
+        )
+    except Exception as e:
+        print(f"[ERROR] claim_validator_reward for {ident.label} => {e}")
+        traceback.print_exc()
+        return None
+
+
+class ClaimDaemon:
+    """Identities must carry a gateway_token (ValidatorIdentity(gatekeeper_network=...))."""
+
+    def __init__(self, program, game_pda, mint, identities, clock: ChainClock = None, poll_s: float = POLL_S,
+                 mint_authority=None):
+        self.program = program
+        self.client = program.provider.connection
+        self.game_pda = game_pda
+        self.mint = mint
+        self.mint_authority = mint_authority or pdas.mint_authority_pda(program.program_id)[0]
+        self.identities = list(identities)
+        missing = [i.label for i in self.identities if i.gateway_token is None]
+        if missing:
+            raise ValueError(f"no gateway_token for {missing}; build them with ValidatorIdentity(gatekeeper_network=...)")
+        self.clock = clock or ChainClock(self.client)
+        self.poll_s = poll_s
+        self.records = {}   # label -> ValidatorPdaRecord (None if missing)
+        self.claim_at = {}  # label -> next claim time (None if nothing to claim)
+
+    async def refresh(self):
+        """One batched read of every ValidatorPda in the fleet."""
+        raw = await query.fetch_multiple_accounts(self.client, [i.validator_pda for i in self.identities])
+        for ident, data in zip(self.identities, raw):
+            if data is None:
+                print(f"[WARN] {ident.label}: ValidatorPda {ident.validator_pda} not found.")
+                self.records[ident.label] = None
+                continue
+            try:
+                self.records[ident.label] = decode_validator_pda(data)
+            except DecodeError as e:
+                print(f"[WARN] {ident.label}: {e}")
+                self.records[ident.label] = None
+
+    async def run_once(self) -> float:
+        """Refresh, send every due claim, return how long to sleep."""
+        await self.refresh()
+        now = self.clock.now()
+        due = []
+        for ident in self.identities:
+            rec = self.records.get(ident.label)
+            claim_at = None if rec is None else next_claim_time(rec, now)
+            self.claim_at[ident.label] = claim_at
+            if claim_at is not None and claim_at <= now:
+                due.append(ident)
+
+        if due:
+            sigs = await asyncio.gather(
+                *(send_claim(self.program, self.game_pda, self.mint, self.mint_authority, i) for i in due)
+            )
+            for ident, sig in zip(due, sigs):
+                minutes = claimable_minutes(self.records[ident.label], now)
+                if sig is not None:
+                    print(f"[SUCCESS] {ident.label} claimed ~{minutes} min "
+                          f"({minutes * CLAIM_RATE_PER_MINUTE} lamports). Tx: {sig}")
+            # last_claimed moved => re-read right away (unless everything failed)
+            return MIN_SLEEP_S if any(sigs) else self.poll_s
+
+        upcoming = [t for t in self.claim_at.values() if t is not None]
+        if not upcoming:
+            return self.poll_s
+        return max(MIN_SLEEP_S, min(self.poll_s, min(upcoming) - now))
+
+    async def run_forever(self):
+        await self.clock.sync()
+        print(f"[INFO] Claim daemon running for {len(self.identities)} validator(s).")
+        while True:
+            try:
+                delay = await self.run_once()
+            except Exception as e:
+                print(f"[ERROR] Claim round failed => {e}")
+                traceback.print_exc()
+                delay = self.poll_s
+            await asyncio.sleep(delay)
@@ -0,0 +1,141 @@
+"""
+Several instructions (for one player or several) in one transaction.
+
+    composer = TxComposer(program)
+    for name, kp in batch:
+        if not composer.add([create_ix, register_ix], [kp]):   # doesn't fit any more
+            break
+    sig = await composer.send()
+
+A group passed to add() is all-or-nothing: it goes into this TX whole or
+not at all. The TX is compiled by solders' Message, which dedupes the
+account keys (game, mint, programs, sysvars and the fee payer are listed
+once however many groups use them) and orders them signer / writable
+first; add() measures the serialized TX after that and refuses a group
+that would take it over PACKET_DATA_SIZE. A TX is atomic on chain, so one
+failing instruction fails every group in it.
+
+send() builds and signs the TX when it goes; when the Program is a
+LockAwareProgram it waits its turn on the written accounts like .rpc calls.
+Signers may be Keypairs or fancoin.signing.RemoteSigners, whose signatures
+come from their SigningFarm's worker processes.
+
+With lookup_tables (AddressLookupTableAccount list, fancoin.lookup) the TX
+is a v0 one: keys found in a table cost one index byte instead of 32, and
+add() also refuses a group that would take the TX over TX_ACCOUNT_LOCKS
+distinct accounts, which is then usually the tighter limit.
+"""
+from solders.hash import Hash
+from solders.message import Message, MessageV0, to_bytes_versioned
+from solders.transaction import Transaction, VersionedTransaction
+
+from fancoin.signing import sign_payload
+
+PACKET_DATA_SIZE = 1232  # max serialized TX (IPv6 MTU - headers)
+SIGNATURE_LEN = 64
+TX_ACCOUNT_LOCKS = 64    # max distinct accounts a TX may reference (static + looked up)
+
+
+def _short_vec_len(n: int) -> int:
+    return 1 if n < 0x80 else 2 if n < 0x4000 else 3
+
+
+def tx_size(message) -> int:
+    """Serialized size of a TX carrying `message` (legacy or v0) with all its signatures."""
+    n = message.header.num_required_signatures
+    version_prefix = 1 if isinstance(message, MessageV0) else 0
+    return _short_vec_len(n) + SIGNATURE_LEN * n + version_prefix + len(bytes(message))
+
+
+def account_count(message) -> int:
+    """Distinct accounts the TX locks: static keys + every looked-up index."""
+    loaded = sum(len(l.writable_indexes) + len(l.readonly_indexes)
+                 for l in getattr(message, "address_table_lookups", ()))
+    return len(message.account_keys) + loaded
+
+
+def writable_keys(message, lookup_tables=()) -> set:
+    if not isinstance(message, MessageV0):
+        return {key for i, key in enumerate(message.account_keys) if message.is_writable(i)}
+    keys = {key for i, key in enumerate(message.account_keys) if message.is_maybe_writable(i)}
+    tables = {t.key: t.addresses for t in lookup_tables}
+    for lookup in message.address_table_lookups:
+        keys.update(tables[lookup.account_key][i] for i in lookup.writable_indexes)
+    return keys
+
+
+class TxComposer:
+    def __init__(self, program, payer=None, limit: int = PACKET_DATA_SIZE, max_groups: int = None,
+                 lookup_tables=None, max_accounts: int = TX_ACCOUNT_LOCKS):
+        self.program = program
+        self.payer = payer or program.provider.wallet.payer  # fee payer Keypair
+        self.limit = limit
+        self.max_groups = max_groups
+        self.lookup_tables = list(lookup_tables) if lookup_tables is not None else None
+        self.max_accounts = max_accounts
+        self.ixs = []
+        self.signers = {self.payer.pubkey(): self.payer}
+        self.groups = 0
+
+    def __len__(self):
+        return self.groups
+
+    def message(self, ixs=None, blockhash: Hash = None):
+        ixs = self.ixs if ixs is None else ixs
+        if self.lookup_tables is None:
+            return Message.new_with_blockhash(ixs, self.payer.pubkey(), blockhash or Hash.default())
+        return MessageV0.try_compile(self.payer.pubkey(), ixs, self.lookup_tables, blockhash or Hash.default())
+
+    def size(self) -> int:
+        return tx_size(self.message()) if self.ixs else 0
+
+    def _overflow(self, ixs):
+        """Why `ixs` can't go in one TX, or None if they can."""
+        message = self.message(ixs)
+        size = tx_size(message)
+        if size > self.limit:
+            return f"{size} bytes (> {self.limit})"
+        accounts = account_count(message)
+        if self.lookup_tables is not None and accounts > self.max_accounts:
+            return f"{accounts} accounts (> {self.max_accounts})"
+        return None
+
+    def fits(self, ixs) -> bool:
+        """Whether one more group `ixs` would still fit (nothing is added)."""
+        return self._overflow(self.ixs + list(ixs)) is None
+
+    def add(self, ixs, signers=()) -> bool:
+        """Append one group of instructions if the TX still fits; False (nothing added) otherwise."""
+        if self.max_groups is not None and self.groups >= self.max_groups:
+            return False
+        candidate = self.ixs + list(ixs)
+        overflow = self._overflow(candidate)
+        if overflow is not None:
+            if not self.ixs:
+                raise ValueError(f"instruction group alone is {overflow}")
+            return False
+        self.ixs = candidate
+        for kp in signers:
+            self.signers.setdefault(kp.pubkey(), kp)
+        self.groups += 1
+        return True
+
+    async def send(self):
+        """Sign on a fresh blockhash and send (through the Program's LockScheduler, if it has one)."""
+        provider = self.program.provider
+        message = self.message()
+        signer_keys = message.account_keys[:message.header.num_required_signatures]
+
+        async def go():
+            blockhash = (await provider.connection.get_latest_blockhash()).value.blockhash
+            signed = self.message(blockhash=blockhash)
+            if self.lookup_tables is None:
+                sigs = await sign_payload(bytes(signed), signer_keys, self.signers)
+                return await provider.send(Transaction.populate(signed, sigs))
+            sigs = await sign_payload(to_bytes_versioned(signed), signer_keys, self.signers)
+            return await provider.send(VersionedTransaction.populate(signed, sigs))
+
+        scheduler = getattr(self.program, "scheduler", None)
+        if scheduler is None:
+            return await go()
+        return await scheduler.run(writable_keys(message, self.lookup_tables or ()), go)
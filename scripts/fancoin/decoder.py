@@ -0,0 +1,283 @@
+"""
+Hand-written Borsh decoders for Game, PlayerPda and ValidatorPda.
+
+anchorpy decodes through construct, which is slow per account and builds a
+Container plus a Pubkey object for every key it meets. These decoders walk a
+memoryview with precompiled struct.Struct objects and return __slots__
+records. Scalars are read up front (it is only a handful of unpack_from
+calls); names and pubkeys stay as offsets into the buffer and are only turned
+into str / Pubkey when a caller touches them.
+
+Records expose the same attribute names as the anchorpy accounts, so they can
+be passed to code that reads `acct.name`, `acct.reward_address`, etc.
+"""
+import struct
+
+from solders.pubkey import Pubkey
+
+from fancoin.layout import ACCOUNT_DISCRIMINATORS, ACCOUNT_DISCRIMINATOR_SIZE
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_I64 = struct.Struct("<q")
+_GAME_COUNTS = struct.Struct("<III")
+_VALIDATOR_HEAD = struct.Struct("<q")
+
+_PLAYER_DISC = ACCOUNT_DISCRIMINATORS["PlayerPda"]
+_GAME_DISC = ACCOUNT_DISCRIMINATORS["Game"]
+_VALIDATOR_DISC = ACCOUNT_DISCRIMINATORS["ValidatorPda"]
+
+
+class DecodeError(ValueError):
+    """Raised when the raw bytes are not the expected account type."""
+
+
+def _opt(unpack_from, buf, pos):
+    """Borsh Option<T> => (value_or_None, next_pos)."""
+    if buf[pos]:
+        return unpack_from(buf, pos + 1)[0], pos + 1 + 8
+    return None, pos + 1
+
+
+def _opt_u32(buf, pos):
+    if buf[pos]:
+        return _U32.unpack_from(buf, pos + 1)[0], pos + 5
+    return None, pos + 1
+
+
+def _pubkey(buf, pos) -> Pubkey:
+    return Pubkey.from_bytes(bytes(buf[pos:pos + 32]))
+
+
+# --------------------------------------------------------------------
+# PlayerPda
+# --------------------------------------------------------------------
+class PlayerPdaRecord:
+    __slots__ = (
+        "_buf",
+        "_name_end",
+        "_pv_count",
+        "last_name_change",
+        "last_reward_change",
+        "last_minted",
+        "pending_claim_ts",
+        "pending_game_time_ms",
+        "pending_paid",
+        "last_claim_ts",
+    )
+
+    @property
+    def name(self) -> str:
+        return bytes(self._buf[ACCOUNT_DISCRIMINATOR_SIZE + 4:self._name_end]).decode("utf-8")
+
+    @property
+    def name_bytes(self) -> bytes:
+        return bytes(self._buf[ACCOUNT_DISCRIMINATOR_SIZE + 4:self._name_end])
+
+    @property
+    def authority(self) -> Pubkey:
+        return _pubkey(self._buf, self._name_end)
+
+    @property
+    def reward_address(self) -> Pubkey:
+        return _pubkey(self._buf, self._name_end + 32)
+
+    @property
+    def partial_validator_count(self) -> int:
+        return self._pv_count
+
+    @property
+    def partial_validators(self) -> list:
+        # Vec starts after name + authority + reward_address + the two Options
+        pos = self._name_end + 64
+        pos += 9 if self._buf[pos] else 1
+        pos += 9 if self._buf[pos] else 1
+        pos += 4
+        return [_pubkey(self._buf, pos + 32 * i) for i in range(self._pv_count)]
+
+    def __repr__(self):
+        return (
+            f"PlayerPdaRecord(name={self.name!r}, last_minted={self.last_minted}, "
+            f"partial_validators={self._pv_count}, pending_paid={self.pending_paid})"
+        )
+
+
+def decode_player_pda(data, check_discriminator: bool = True) -> PlayerPdaRecord:
+    """Decode a raw PlayerPda account (discriminator included)."""
+    buf = data if isinstance(data, memoryview) else memoryview(data)
+    if check_discriminator and buf[:ACCOUNT_DISCRIMINATOR_SIZE] != _PLAYER_DISC:
+        raise DecodeError("not a PlayerPda account")
+    i64 = _I64.unpack_from
+    rec = PlayerPdaRecord.__new__(PlayerPdaRecord)
+    rec._buf = buf
+
+    pos = ACCOUNT_DISCRIMINATOR_SIZE
+    name_end = pos + 4 + _U32.unpack_from(buf, pos)[0]
+    rec._name_end = name_end
+    pos = name_end + 64  # authority + reward_address
+
+    rec.last_name_change, pos = _opt(i64, buf, pos)
+    rec.last_reward_change, pos = _opt(i64, buf, pos)
+    pv_count = _U32.unpack_from(buf, pos)[0]
+    rec._pv_count = pv_count
+    pos += 4 + 32 * pv_count
+    rec.last_minted, pos = _opt(i64, buf, pos)
+    rec.pending_claim_ts, pos = _opt(i64, buf, pos)
+    rec.pending_game_time_ms, pos = _opt(i64, buf, pos)
+    rec.pending_paid = buf[pos] != 0
+    rec.last_claim_ts, _pos = _opt(i64, buf, pos + 1)
+    return rec
+
+
+# --------------------------------------------------------------------
+# ValidatorPda
+# --------------------------------------------------------------------
+class ValidatorPdaRecord:
+    __slots__ = ("_buf", "last_activity", "last_minted", "last_claimed")
+
+    @property
+    def address(self) -> Pubkey:
+        return _pubkey(self._buf, ACCOUNT_DISCRIMINATOR_SIZE)
+
+    def __repr__(self):
+        return (
+            f"ValidatorPdaRecord(address={self.address}, last_activity={self.last_activity}, "
+            f"last_minted={self.last_minted}, last_claimed={self.last_claimed})"
+        )
+
+
+def decode_validator_pda(data, check_discriminator: bool = True) -> ValidatorPdaRecord:
+    """Decode a raw ValidatorPda account (discriminator included)."""
+    buf = data if isinstance(data, memoryview) else memoryview(data)
+    if check_discriminator and buf[:ACCOUNT_DISCRIMINATOR_SIZE] != _VALIDATOR_DISC:
+        raise DecodeError("not a ValidatorPda account")
+    rec = ValidatorPdaRecord.__new__(ValidatorPdaRecord)
+    rec._buf = buf
+    pos = ACCOUNT_DISCRIMINATOR_SIZE + 32
+    rec.last_activity = _VALIDATOR_HEAD.unpack_from(buf, pos)[0]
+    rec.last_minted, pos = _opt(_I64.unpack_from, buf, pos + 8)
+    rec.last_claimed, _pos = _opt(_I64.unpack_from, buf, pos)
+    return rec
+
+
+# --------------------------------------------------------------------
+# Game
+# --------------------------------------------------------------------
+class GameRecord:
+    __slots__ = (
+        "_buf",
+        "_desc",
+        "_socials",
+        "_keys_at",
+        "_owner_at",
+        "player_count",
+        "validator_count",
+        "active_validator_count",
+        "last_reset_hour",
+        "last_seed",
+        "last_punch_in_time",
+        "commission_percent",
+        "coin_issuance_rate",
+        "validator_claim_rate",
+        "curated_val",
+        "claim_rate_lock",
+        "coin_issuance_rate_lock",
+        "commission_percent_lock",
+    )
+
+    @property
+    def description(self) -> str:
+        start, end = self._desc
+        return bytes(self._buf[start:end]).decode("utf-8")
+
+    @property
+    def socials(self) -> str:
+        start, end = self._socials
+        return bytes(self._buf[start:end]).decode("utf-8")
+
+    @property
+    def mint_pubkey(self) -> Pubkey:
+        return _pubkey(self._buf, self._keys_at)
+
+    @property
+    def commission_ata(self) -> Pubkey:
+        return _pubkey(self._buf, self._keys_at + 32)
+
+    @property
+    def owner(self) -> Pubkey:
+        return _pubkey(self._buf, self._owner_at)
+
+    @property
+    def gatekeeper_network(self) -> Pubkey:
+        return _pubkey(self._buf, self._owner_at + 35)
+
+    def __repr__(self):
+        return (
+            f"GameRecord(player_count={self.player_count}, validator_count={self.validator_count}, "
+            f"last_seed={self.last_seed}, last_punch_in_time={self.last_punch_in_time})"
+        )
+
+
+def decode_game(data, check_discriminator: bool = True) -> GameRecord:
+    """Decode a raw Game account (discriminator included)."""
+    buf = data if isinstance(data, memoryview) else memoryview(data)
+    if check_discriminator and buf[:ACCOUNT_DISCRIMINATOR_SIZE] != _GAME_DISC:
+        raise DecodeError("not a Game account")
+    rec = GameRecord.__new__(GameRecord)
+    rec._buf = buf
+    pos = ACCOUNT_DISCRIMINATOR_SIZE
+    (rec.player_count, rec.validator_count, rec.active_validator_count) = _GAME_COUNTS.unpack_from(buf, pos)
+    rec.last_reset_hour, pos = _opt_u32(buf, pos + 12)
+
+    desc_len = _U32.unpack_from(buf, pos)[0]
+    rec._desc = (pos + 4, pos + 4 + desc_len)
+    pos += 4 + desc_len
+    socials_len = _U32.unpack_from(buf, pos)[0]
+    rec._socials = (pos + 4, pos + 4 + socials_len)
+    pos += 4 + socials_len
+
+    rec.last_seed, pos = _opt(_U64.unpack_from, buf, pos)
+    rec.last_punch_in_time, pos = _opt(_I64.unpack_from, buf, pos)
+    rec._keys_at = pos  # mint_pubkey, commission_ata
+    pos += 64
+    rec.commission_percent = _U16.unpack_from(buf, pos)[0]
+    rec.coin_issuance_rate = _U64.unpack_from(buf, pos + 2)[0]
+    rec.validator_claim_rate = _U64.unpack_from(buf, pos + 10)[0]
+    rec.curated_val = buf[pos + 18] != 0
+    rec._owner_at = pos + 19
+    pos += 19 + 32
+    rec.claim_rate_lock = buf[pos] != 0
+    rec.coin_issuance_rate_lock = buf[pos + 1] != 0
+    rec.commission_percent_lock = buf[pos + 2] != 0
+    return rec
+
+
+# --------------------------------------------------------------------
+# Bulk helpers
+# --------------------------------------------------------------------
+DECODERS = {
+    _PLAYER_DISC: decode_player_pda,
+    _GAME_DISC: decode_game,
+    _VALIDATOR_DISC: decode_validator_pda,
+}
+
+
+def decode_account(data):
+    """Pick the decoder from the discriminator."""
+    buf = memoryview(data)
+    decoder = DECODERS.get(bytes(buf[:ACCOUNT_DISCRIMINATOR_SIZE]))
+    if decoder is None:
+        raise DecodeError("unknown account discriminator")
+    return decoder(buf, check_discriminator=False)
+
+
+def decode_players(raw_accounts) -> list:
+    """[(pubkey, raw_bytes), ...] => [(pubkey, PlayerPdaRecord), ...], skipping foreign accounts."""
+    out = []
+    for pubkey, data in raw_accounts:
+        buf = memoryview(data)
+        if buf[:ACCOUNT_DISCRIMINATOR_SIZE] != _PLAYER_DISC:
+            continue
+        out.append((pubkey, decode_player_pda(buf, check_discriminator=False)))
+    return out
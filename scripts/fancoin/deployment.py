@@ -0,0 +1,374 @@
+"""
+One deployment config instead of *_pda.txt reads in every script.
+
+    deployment = Deployment.load()        # deployment.json, else the *_pda.txt files
+    game = deployment.game()              # default game; deployment.game("pubg") for another
+    await deployment.verify(client)       # once, before the first TX
+
+A Deployment holds the program id, RPC endpoint, IDL path and any number
+of games (keyed by label, also found by mint). Every derived address is
+kept with its bump:
+
+  - game / mint_authority are resolved when the game is added,
+  - validator PDAs + ATAs on first use, then written back by save(),
+  - PlayerPda addresses by index, in memory; a growing player_count only
+    derives the new indices.
+
+Addresses read back from deployment.json are re-checked with one sha256
+each (the bump is known, so no find_program_address bump search).
+verify() then checks the chain: Game owned by the program and pointing at
+the configured mint, the mint a Token-2022 account, the MintAuthority
+bump, and the owner of every cached ValidatorPda that exists.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+from solders.pubkey import Pubkey
+
+from fancoin import pdas
+from fancoin.decoder import DecodeError, decode_game
+from fancoin.runtime import IDL_PATH, read_pda_files
+
+DEPLOYMENT_PATH = Path("deployment.json")
+DEFAULT_ENDPOINT = "http://localhost:8899"  # rpc.DEFAULT_ENDPOINT, without importing the httpx stack
+DEFAULT_GAME = "default"
+DEFAULT_GAMEDIR = "tfc"
+PLAYER_LOOKAHEAD = 16  # PlayerPda indices derived past player_count when resolving a new address
+PDA_MARKER = b"ProgramDerivedAddress"
+
+
+class Derived(NamedTuple):
+    address: Pubkey
+    bump: int  # None: taken as given (Deployment.load(strict=False)), not derived
+
+
+def derive(seeds: list, program_id: Pubkey) -> Derived:
+    return Derived(*Pubkey.find_program_address(seeds, program_id))
+
+
+def _rederive(seeds: list, cached: Derived, program_id: Pubkey, what: str) -> Derived:
+    """
+    Check a cached (address, bump) with the one hash create_program_address
+    does. Hashed here because solders panics (PanicException, not an
+    Exception) when a wrong bump lands on the curve.
+    """
+    digest = hashlib.sha256(b"".join(seeds) + bytes([cached.bump]) + bytes(program_id) + PDA_MARKER).digest()
+    if digest != bytes(cached.address):
+        raise ValueError(f"{what} {cached.address} (bump {cached.bump}) does not derive from its seeds; "
+                         f"stale {DEPLOYMENT_PATH}?")
+    return cached
+
+
+def _to_json(derived: Derived) -> list:
+    return [str(derived.address), derived.bump]
+
+
+def _from_json(value) -> Derived:
+    return Derived(Pubkey.from_string(value[0]), None if value[1] is None else int(value[1]))
+
+
+def _game_seeds(mint: Pubkey) -> list:
+    return [b"game", bytes(mint)]
+
+
+def _validator_seeds(mint: Pubkey, validator: Pubkey) -> list:
+    return [b"validator", bytes(mint), bytes(validator)]
+
+
+# --------------------------------------------------------------------
+# One game
+# --------------------------------------------------------------------
+class GameDeployment:
+    def __init__(self, label: str, mint: Pubkey, program_id: Pubkey, mint_authority: Derived,
+                 game: Derived = None, owner: Pubkey = None, commission_ata: Pubkey = None,
+                 gamedir: str = DEFAULT_GAMEDIR):
+        self.label = label
+        self.mint = mint
+        self.gamedir = gamedir  # master-server gamedir whose A2S servers feed this game
+        self.program_id = program_id
+        self.mint_authority = mint_authority
+        self.game = game or derive(_game_seeds(mint), program_id)
+        self.owner = owner
+        self.commission_ata = commission_ata
+        self.lookup_tables = []  # Address Lookup Table addresses for submit_minting_list (fancoin.lookup)
+        self.record = None     # GameRecord from verify()
+        self.verified = False
+        self._validators = {}  # validator pubkey -> (Derived validator_pda, ata)
+        self._players = []     # PlayerPda address by index
+        self._player_index = {}
+
+    @property
+    def game_pda(self) -> Pubkey:
+        return self.game.address
+
+    # ----------------------------------------------------------------
+    # Validators
+    # ----------------------------------------------------------------
+    def validator(self, validator: Pubkey) -> tuple:
+        """(Derived validator_pda, ata) for `validator`, derived on first use."""
+        if validator not in self._validators:
+            self._validators[validator] = (
+                derive(_validator_seeds(self.mint, validator), self.program_id),
+                pdas.associated_token_address(validator, self.mint),
+            )
+        return self._validators[validator]
+
+    def validator_pda(self, validator: Pubkey) -> Pubkey:
+        return self.validator(validator)[0].address
+
+    def validator_ata(self, validator: Pubkey) -> Pubkey:
+        return self.validator(validator)[1]
+
+    def identity(self, keypair, label: str = None, gatekeeper_network=None):
+        """ValidatorIdentity built from the cached addresses."""
+        from fancoin.identity import ValidatorIdentity
+
+        derived, ata = self.validator(keypair.pubkey())
+        return ValidatorIdentity(keypair, self.mint, self.program_id, gatekeeper_network, label,
+                                 validator_pda=derived.address, ata=ata)
+
+    def fleet(self, paths, gatekeeper_network=None) -> list:
+        """identity() for each val*-keypair.json path; the label is the file stem."""
+        from fancoin.identity import load_keypair
+
+        return [self.identity(load_keypair(p), Path(p).stem.replace("-keypair", ""), gatekeeper_network)
+                for p in paths]
+
+    # ----------------------------------------------------------------
+    # Players
+    # ----------------------------------------------------------------
+    def player_pda(self, index: int) -> Pubkey:
+        self._extend_players(index + 1)
+        return self._players[index]
+
+    def player_index_map(self, player_count: int) -> dict:
+        """
+        {player_pda_address: index} for indices < player_count. The map is
+        kept and only grows, so callers must look addresses up, not iterate.
+        """
+        self._extend_players(player_count)
+        return self._player_index
+
+    def player_index(self, pubkey: Pubkey, player_count: int, lookahead: int = PLAYER_LOOKAHEAD):
+        """
+        Index of one of this game's PlayerPda addresses, or None (e.g. another
+        game's player). Looks up to `lookahead` past `player_count`, so a
+        registration seen before the Game's new player_count still resolves.
+        """
+        index = self._player_index.get(pubkey)
+        if index is None:
+            self._extend_players(player_count + lookahead)
+            index = self._player_index.get(pubkey)
+        return index
+
+    def _extend_players(self, count: int):
+        for i in range(len(self._players), count):
+            address, _ = pdas.player_pda(self.game.address, i, self.program_id)
+            self._players.append(address)
+            self._player_index[address] = i
+
+    # ----------------------------------------------------------------
+    # (De)serialisation
+    # ----------------------------------------------------------------
+    def to_json(self) -> dict:
+        return {
+            "mint": str(self.mint),
+            "game": _to_json(self.game),
+            "gamedir": self.gamedir,
+            "owner": None if self.owner is None else str(self.owner),
+            "commission_ata": None if self.commission_ata is None else str(self.commission_ata),
+            "validators": {
+                str(v): {"validator_pda": _to_json(d), "ata": str(ata)} for v, (d, ata) in self._validators.items()
+            },
+            "lookup_tables": [str(t) for t in self.lookup_tables],
+        }
+
+    @classmethod
+    def from_json(cls, label: str, data: dict, program_id: Pubkey, mint_authority: Derived,
+                  strict: bool = True) -> "GameDeployment":
+        mint = Pubkey.from_string(data["mint"])
+        game = _from_json(data["game"])
+        if game.bump is not None:
+            game = _rederive(_game_seeds(mint), game, program_id, f"{label}: game")
+        elif strict:
+            raise ValueError(f"{label}: game {game.address} was saved unchecked (Deployment.load(strict=False))")
+        else:
+            print(f"[WARN] {label}: using game {game.address} unchecked; it is not derived from mint {mint}.")
+        owner, commission = data.get("owner"), data.get("commission_ata")
+        out = cls(label, mint, program_id, mint_authority, game,
+                  owner=Pubkey.from_string(owner) if owner else None,
+                  commission_ata=Pubkey.from_string(commission) if commission else None,
+                  gamedir=data.get("gamedir", DEFAULT_GAMEDIR))
+        for validator, entry in data.get("validators", {}).items():
+            validator = Pubkey.from_string(validator)
+            derived = _rederive(_validator_seeds(mint, validator), _from_json(entry["validator_pda"]), program_id,
+                                f"{label}: validator_pda")
+            out._validators[validator] = (derived, Pubkey.from_string(entry["ata"]))
+        out.lookup_tables = [Pubkey.from_string(t) for t in data.get("lookup_tables", [])]
+        return out
+
+    def __repr__(self):
+        return f"GameDeployment({self.label}, mint={self.mint}, game={self.game.address})"
+
+
+# --------------------------------------------------------------------
+# Deployment
+# --------------------------------------------------------------------
+class Deployment:
+    def __init__(self, program_id: Pubkey = pdas.PROGRAM_ID, endpoint: str = DEFAULT_ENDPOINT,
+                 idl_path=IDL_PATH, mint_authority: Derived = None, path: Path = None):
+        self.program_id = program_id
+        self.endpoint = endpoint
+        self.idl_path = Path(idl_path)
+        self.mint_authority = mint_authority or derive([b"mint_authority"], program_id)
+        self.path = path
+        self.games = {}  # label -> GameDeployment
+        self.default_game = None
+
+    # ----------------------------------------------------------------
+    # Games
+    # ----------------------------------------------------------------
+    def add_game(self, mint: Pubkey, label: str = DEFAULT_GAME, owner: Pubkey = None,
+                 commission_ata: Pubkey = None, default: bool = None, gamedir: str = None) -> GameDeployment:
+        """
+        Add a game; the first one added is the default. Re-adding a label
+        with the same mint keeps its cached addresses, a new mint replaces it.
+        """
+        game = self.games.get(label)
+        if game is None or game.mint != mint:
+            game = GameDeployment(label, mint, self.program_id, self.mint_authority)
+            self.games[label] = game
+        game.owner = owner or game.owner
+        game.commission_ata = commission_ata or game.commission_ata
+        game.gamedir = gamedir or game.gamedir
+        if default or self.default_game is None:
+            self.default_game = label
+        return game
+
+    def game(self, label: str = None) -> GameDeployment:
+        label = label or self.default_game
+        if label not in self.games:
+            raise KeyError(f"no game {label!r} in deployment (have {sorted(self.games)})")
+        return self.games[label]
+
+    def game_for_mint(self, mint: Pubkey) -> GameDeployment:
+        for game in self.games.values():
+            if game.mint == mint:
+                return game
+        raise KeyError(f"no game with mint {mint} in deployment")
+
+    # ----------------------------------------------------------------
+    # Loading / saving
+    # ----------------------------------------------------------------
+    @classmethod
+    def load(cls, path=DEPLOYMENT_PATH, pda_dir=".", strict: bool = True) -> "Deployment":
+        """
+        deployment.json if it exists, else one game from the *_pda.txt files.
+        A Game address that doesn't derive from its mint under program_id is a
+        ValueError; with strict=False it is used as given (with a [WARN]), for
+        scripts that only need the Game address, as the old game_pda.txt reads did.
+        """
+        path = Path(path)
+        if path.exists():
+            return cls.from_json(json.loads(path.read_text(encoding="utf-8")), path, strict=strict)
+        return cls.from_pda_files(pda_dir, path=path, strict=strict)
+
+    @classmethod
+    def from_pda_files(cls, directory=".", path: Path = DEPLOYMENT_PATH, strict: bool = True,
+                       **kwargs) -> "Deployment":
+        files = read_pda_files(directory)
+        out = cls(path=path, **kwargs)
+        if files["mint_authority"] != out.mint_authority.address:
+            print(f"[WARN] mint_auth_pda.txt ({files['mint_authority']}) is not the program's "
+                  f"mint_authority PDA ({out.mint_authority.address}); using the derived one.")
+        game = out.add_game(files["mint"])
+        if files["game"] != game.game.address:
+            if strict:
+                raise ValueError(f"game_pda.txt ({files['game']}) is not the Game PDA of mint {files['mint']}")
+            print(f"[WARN] game_pda.txt ({files['game']}) is not the Game PDA of mint {files['mint']} "
+                  f"under {out.program_id}; using it as given.")
+            game.game = Derived(files["game"], None)
+        return out
+
+    @classmethod
+    def from_json(cls, data: dict, path: Path = None, strict: bool = True) -> "Deployment":
+        program_id = Pubkey.from_string(data.get("program_id", str(pdas.PROGRAM_ID)))
+        mint_authority = None
+        if "mint_authority" in data:
+            mint_authority = _rederive([b"mint_authority"], _from_json(data["mint_authority"]), program_id,
+                                       "mint_authority")
+        out = cls(program_id, data.get("endpoint", DEFAULT_ENDPOINT), data.get("idl_path", str(IDL_PATH)),
+                  mint_authority, path)
+        for label, game in data.get("games", {}).items():
+            out.games[label] = GameDeployment.from_json(label, game, program_id, out.mint_authority, strict)
+        out.default_game = data.get("default_game") or next(iter(out.games), None)
+        return out
+
+    def to_json(self) -> dict:
+        return {
+            "program_id": str(self.program_id),
+            "endpoint": self.endpoint,
+            "idl_path": str(self.idl_path),
+            "mint_authority": _to_json(self.mint_authority),
+            "default_game": self.default_game,
+            "games": {label: game.to_json() for label, game in self.games.items()},
+        }
+
+    def save(self, path=None) -> Path:
+        path = Path(path or self.path or DEPLOYMENT_PATH)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_json(), indent=2))
+        tmp.replace(path)
+        self.path = path
+        return path
+
+    # ----------------------------------------------------------------
+    # Chain check
+    # ----------------------------------------------------------------
+    async def verify(self, client, label: str = None, force: bool = False):
+        """
+        Check game `label` (default game) against the chain, once per
+        process unless `force`. One getMultipleAccounts for Game, mint,
+        MintAuthority and the cached ValidatorPdas. Raises ValueError on a
+        mismatch; returns the decoded GameRecord.
+        """
+        game = self.game(label)
+        if game.verified and not force:
+            return game.record
+        validators = list(game._validators.items())
+        keys = [game.game.address, game.mint, self.mint_authority.address] + [d.address for _, (d, _) in validators]
+        resp = await client.get_multiple_accounts(keys, encoding="base64")
+        game_acct, mint_acct, authority_acct, *validator_accts = resp.value
+
+        if game_acct is None:
+            raise ValueError(f"{game.label}: Game account {game.game.address} not found")
+        if game_acct.owner != self.program_id:
+            raise ValueError(f"{game.label}: Game {game.game.address} is owned by {game_acct.owner}, "
+                             f"not {self.program_id}")
+        try:
+            record = decode_game(bytes(game_acct.data))
+        except DecodeError as e:
+            raise ValueError(f"{game.label}: {game.game.address}: {e}") from e
+        if record.mint_pubkey != game.mint:
+            raise ValueError(f"{game.label}: Game {game.game.address} is for mint {record.mint_pubkey}, "
+                             f"config says {game.mint}")
+        if mint_acct is None or mint_acct.owner != pdas.SPL_TOKEN_PROGRAM_ID:
+            raise ValueError(f"{game.label}: mint {game.mint} is not a Token-2022 mint on chain")
+        if authority_acct is not None and bytes(authority_acct.data)[8:9] != bytes([self.mint_authority.bump]):
+            raise ValueError(f"MintAuthority {self.mint_authority.address} stores a different bump than "
+                             f"{self.mint_authority.bump}")
+        for (validator, (derived, _)), acct in zip(validators, validator_accts):
+            if acct is not None and acct.owner != self.program_id:
+                raise ValueError(f"{game.label}: ValidatorPda {derived.address} of {validator} is owned by "
+                                 f"{acct.owner}")
+
+        game.commission_ata = record.commission_ata
+        game.owner = record.owner
+        game.record = record
+        game.verified = True
+        return record
+
+    def __repr__(self):
+        return f"Deployment({self.program_id}, games={sorted(self.games)}, default={self.default_game})"
@@ -0,0 +1,181 @@
+"""
+Precompiled fancoin instruction encoders, for the hot paths that build the
+same instruction over and over (submit_minting_list per chunk, per
+validator, per round).
+
+    encoders = InstructionSet(deployment.idl_path, deployment.program_id)
+    submit = encoders["submit_minting_list"].bind(game=game_pda, fancy_mint=mint, mint_authority=auth)
+    ix = submit.build(mint, numeric_ids, validator_pda=..., validator=..., gateway_token=...,
+                      remaining=leftover_accounts)
+
+program.instruction / program.rpc resolve every IDL account by name from
+the Context dict, coerce the args through construct and build the
+AccountMeta list again on each call. Here that work is done once per
+instruction (runtime.idl_summary, so not even the IDL JSON is parsed
+again):
+
+  - the 8-byte discriminator is cached,
+  - the Borsh args are one struct.Struct.pack when they are all fixed-size
+    (pubkeys as 32s), else one small encoder per arg,
+  - bind() preassembles the AccountMeta list with the programs / sysvars
+    (KNOWN_ACCOUNTS) and whatever accounts are fixed for the caller, and
+    build() only patches in the per-call ones and appends `remaining`.
+
+The output is byte-for-byte what program.instruction builds
+(python -m fancoin.bench_encode checks that and times both).
+"""
+import struct
+
+from solders.instruction import AccountMeta, Instruction
+from solders.pubkey import Pubkey
+from solders.system_program import ID as SYS_PROGRAM_ID
+
+from fancoin import pdas
+from fancoin.runtime import IDL_PATH, idl_summary
+
+RENT_SYSVAR = Pubkey.from_string("SysvarRent111111111111111111111111111111111")
+
+# Accounts with one possible value, bound by default
+KNOWN_ACCOUNTS = {
+    "system_program": SYS_PROGRAM_ID,
+    "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+    "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+    "rent": RENT_SYSVAR,
+}
+
+_SCALARS = {"bool": "?", "u8": "B", "i8": "b", "u16": "H", "i16": "h", "u32": "I", "i32": "i",
+            "u64": "Q", "i64": "q"}
+_PUBKEYS = ("publicKey", "pubkey")
+_U32 = struct.Struct("<I").pack
+
+
+# --------------------------------------------------------------------
+# Borsh args
+# --------------------------------------------------------------------
+def _fixed_format(kind):
+    """struct code of a fixed-size arg type, or None."""
+    if isinstance(kind, str):
+        if kind in _SCALARS:
+            return _SCALARS[kind]
+        if kind in _PUBKEYS:
+            return "32s"
+    return None
+
+
+def _encode_str(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return _U32(len(raw)) + raw
+
+
+def arg_encoder(kind):
+    """value -> Borsh bytes for one IDL arg type; ValueError for types not handled here."""
+    fmt = _fixed_format(kind)
+    if fmt == "32s":
+        return bytes
+    if fmt is not None:
+        return struct.Struct("<" + fmt).pack
+    if kind in ("u128", "i128"):
+        signed = kind == "i128"
+        return lambda v: int(v).to_bytes(16, "little", signed=signed)
+    if kind == "string":
+        return _encode_str
+    if kind == "bytes":
+        return lambda v: _U32(len(v)) + bytes(v)
+    if isinstance(kind, dict):
+        if "vec" in kind:
+            inner = _fixed_format(kind["vec"])
+            if inner is not None and inner != "32s":
+                return lambda v: _U32(len(v)) + struct.pack(f"<{len(v)}{inner}", *v)
+            enc = arg_encoder(kind["vec"])
+            return lambda v: _U32(len(v)) + b"".join(enc(x) for x in v)
+        if "option" in kind:
+            enc = arg_encoder(kind["option"])
+            return lambda v: b"\x00" if v is None else b"\x01" + enc(v)
+        if "array" in kind:
+            enc = arg_encoder(kind["array"][0])
+            return lambda v: b"".join(enc(x) for x in v)
+    raise ValueError(f"no precompiled encoder for arg type {kind!r}")
+
+
+# --------------------------------------------------------------------
+# Instructions
+# --------------------------------------------------------------------
+class InstructionEncoder:
+    def __init__(self, name: str, spec: dict, program_id: Pubkey):
+        """spec: one runtime.idl_summary() instruction entry."""
+        self.name = name
+        self.program_id = program_id
+        self.accounts = spec["accounts"]  # [(name, is_mut, is_signer)] in IDL order
+        self.arg_names = [n for n, _kind in spec["args"]]
+        discriminator = spec["discriminator"]
+        formats = [_fixed_format(kind) for _n, kind in spec["args"]]
+        if all(f is not None for f in formats):
+            packer = struct.Struct("<" + "".join(formats)).pack
+            pubkey_at = [i for i, f in enumerate(formats) if f == "32s"]
+
+            def data(*args):
+                if pubkey_at:
+                    args = list(args)
+                    for i in pubkey_at:
+                        args[i] = bytes(args[i])
+                return discriminator + packer(*args)
+        else:
+            encs = [arg_encoder(kind) for _n, kind in spec["args"]]
+
+            def data(*args):
+                return discriminator + b"".join(enc(a) for enc, a in zip(encs, args))
+        self.data = data
+
+    def bind(self, **accounts) -> "BoundInstruction":
+        """Fix some accounts (KNOWN_ACCOUNTS are fixed unless overridden)."""
+        unknown = set(accounts) - {n for n, _m, _s in self.accounts}
+        if unknown:
+            raise ValueError(f"{self.name} has no accounts {sorted(unknown)}")
+        return BoundInstruction(self, {**KNOWN_ACCOUNTS, **accounts})
+
+    def build(self, *args, remaining=(), **accounts) -> Instruction:
+        return self.bind().build(*args, remaining=remaining, **accounts)
+
+
+class BoundInstruction:
+    def __init__(self, encoder: InstructionEncoder, fixed: dict):
+        self.encoder = encoder
+        self.template = []
+        self.slots = []  # (position, name, is_mut, is_signer) patched per build()
+        for i, (name, is_mut, is_signer) in enumerate(encoder.accounts):
+            if name in fixed:
+                self.template.append(AccountMeta(fixed[name], is_signer, is_mut))
+            else:
+                self.template.append(None)
+                self.slots.append((i, name, is_mut, is_signer))
+
+    def build(self, *args, remaining=(), **accounts) -> Instruction:
+        metas = self.template.copy()
+        try:
+            for i, name, is_mut, is_signer in self.slots:
+                metas[i] = AccountMeta(accounts[name], is_signer, is_mut)
+        except KeyError as e:
+            raise ValueError(f"{self.encoder.name}: missing account {e.args[0]!r}") from None
+        if remaining:
+            metas.extend(remaining)
+        return Instruction(self.encoder.program_id, self.encoder.data(*args), metas)
+
+
+class InstructionSet:
+    """InstructionEncoder per IDL instruction, compiled on first use."""
+
+    def __init__(self, idl_path=IDL_PATH, program_id: Pubkey = pdas.PROGRAM_ID):
+        self.program_id = program_id
+        self.specs = idl_summary(idl_path)["instructions"]
+        self._encoders = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def __getitem__(self, name: str) -> InstructionEncoder:
+        encoder = self._encoders.get(name)
+        if encoder is None:
+            if name not in self.specs:
+                raise KeyError(f"no instruction {name!r} in the IDL")
+            encoder = self._encoders[name] = InstructionEncoder(name, self.specs[name], self.program_id)
+        return encoder
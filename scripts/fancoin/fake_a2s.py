@@ -0,0 +1,160 @@
+"""
+Fake HL1 master server and A2S_PLAYER responders on localhost.
+
+They speak just enough of the real protocols for fancoin.scrape (and the
+python-a2s client) to run unchanged:
+
+  - FakeMasterServer answers 0x31 list queries with 6-byte ip:port
+    entries, paging from the seed address in the request and ending with
+    0.0.0.0:0.
+  - FakeA2SServer answers A2S_PLAYER: challenge first, then the player list
+    (name, score, duration) once the right challenge comes back.
+
+Each responder is a blocking UDP socket served from a daemon thread, so the
+scripts' blocking socket / a2s calls work against them no matter which
+thread or event loop they run in.
+
+    farm = FakeA2SFarm.start({"srv0": ["alice", "bob"], "srv1": ["carol"]})
+    master = FakeMasterServer.start(farm.addresses)
+    ... scrape.query_master_server(master=master.address) ...
+    farm.stop(); master.stop()
+"""
+import random
+import socket
+import struct
+import threading
+import time
+
+HEADER_SIMPLE = b"\xFF\xFF\xFF\xFF"
+A2S_PLAYER_REQUEST = 0x55
+A2S_PLAYER_RESPONSE = 0x44
+A2S_CHALLENGE_RESPONSE = 0x41
+MASTER_LIST_REQUEST = 0x31
+MASTER_REPLY_HEADER = HEADER_SIMPLE + b"\x66\x0A"
+MASTER_ENTRIES_PER_PACKET = 231
+MAX_A2S_PLAYERS = 255
+
+
+class _UdpResponder:
+    """Blocking UDP socket + daemon thread calling self.handle(data) per datagram."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_s: float = 0.0,
+                 drop_rate: float = 0.0, seed: int = 0):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.2)
+        self.address = self.sock.getsockname()
+        self.latency_s = latency_s
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @classmethod
+    def start(cls, *args, **kwargs):
+        responder = cls(*args, **kwargs)
+        responder._thread.start()
+        return responder
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                data, peer = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.requests += 1
+            if self.drop_rate and self.rng.random() < self.drop_rate:
+                continue
+            reply = self.handle(data)
+            if reply is None:
+                continue
+            if self.latency_s:
+                time.sleep(self.latency_s)
+            self.sock.sendto(reply, peer)
+
+    def handle(self, data: bytes):
+        raise NotImplementedError
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+        self.sock.close()
+
+
+# --------------------------------------------------------------------
+# A2S
+# --------------------------------------------------------------------
+class FakeA2SServer(_UdpResponder):
+    def __init__(self, players=(), **kwargs):
+        super().__init__(**kwargs)
+        self.players = list(players)[:MAX_A2S_PLAYERS]
+        self.challenge = self.rng.getrandbits(32) or 1
+
+    def handle(self, data: bytes):
+        if not data.startswith(HEADER_SIMPLE) or len(data) < 9 or data[4] != A2S_PLAYER_REQUEST:
+            return None
+        challenge = struct.unpack_from("<I", data, 5)[0]
+        if challenge != self.challenge:
+            return HEADER_SIMPLE + bytes([A2S_CHALLENGE_RESPONSE]) + struct.pack("<I", self.challenge)
+        out = [HEADER_SIMPLE, bytes([A2S_PLAYER_RESPONSE, len(self.players)])]
+        for i, name in enumerate(self.players):
+            out.append(bytes([i]) + name.encode("utf-8") + b"\x00" + struct.pack("<if", i * 10, 60.0 * (i + 1)))
+        return b"".join(out)
+
+
+class FakeA2SFarm:
+    """One FakeA2SServer per entry of {server_label: [player names]}."""
+
+    def __init__(self, servers: list):
+        self.servers = servers
+
+    @classmethod
+    def start(cls, players_by_server: dict, **kwargs) -> "FakeA2SFarm":
+        return cls([FakeA2SServer.start(players, **kwargs) for players in players_by_server.values()])
+
+    @property
+    def addresses(self) -> list:
+        return [srv.address for srv in self.servers]
+
+    def stop(self):
+        for srv in self.servers:
+            srv.stop()
+
+
+def spread_players(names, servers: int, per_server: int = 32) -> dict:
+    """Deal names round-robin onto `servers` fake servers (<= per_server each)."""
+    buckets = {f"srv{i}": [] for i in range(servers)}
+    for i, name in enumerate(names[: servers * per_server]):
+        buckets[f"srv{i % servers}"].append(name)
+    return buckets
+
+
+# --------------------------------------------------------------------
+# Master server
+# --------------------------------------------------------------------
+class FakeMasterServer(_UdpResponder):
+    def __init__(self, servers=(), **kwargs):
+        super().__init__(**kwargs)
+        self.servers = list(servers)
+
+    def handle(self, data: bytes):
+        if not data or data[0] != MASTER_LIST_REQUEST:
+            return None
+        seed = data[2:].split(b"\x00", 1)[0].decode("ascii", "replace")
+        ip, _, port = seed.partition(":")
+        start = 0
+        if seed != "0.0.0.0:0":
+            for i, (s_ip, s_port) in enumerate(self.servers):
+                if s_ip == ip and str(s_port) == port:
+                    start = i + 1
+                    break
+        page = self.servers[start:start + MASTER_ENTRIES_PER_PACKET]
+        out = [MASTER_REPLY_HEADER]
+        for s_ip, s_port in page:
+            out.append(socket.inet_aton(s_ip) + struct.pack(">H", s_port))
+        if start + len(page) >= len(self.servers):
+            out.append(b"\x00" * 6)
+        return b"".join(out)
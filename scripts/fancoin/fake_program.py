@@ -0,0 +1,392 @@
+"""
+fancoin instruction handlers for fancoin.fake_rpc.FakeChain.
+
+`install(chain)` registers Python models of the instructions the operator
+scripts send, following programs/fancoin/src/lib.rs: same account order
+(the #[derive(Accounts)] struct, then remaining_accounts), same seeds /
+constraint checks, same state changes and token mints.
+
+Not modelled:
+  - Civic gateway verification (any gateway_token account passes),
+  - rent debits for `init` accounts (only TX fees are charged).
+"""
+import struct
+
+from solders.pubkey import Pubkey
+
+from fancoin import groups, layout, pdas
+from fancoin.fake_rpc import FakeTxError
+
+MAX_NAME_LEN = 30            # PlayerNamePda::MAX_NAME_LEN
+MINT_OPEN_MINUTE = 7
+MAX_VALIDATE_SECONDS = 8 * 3600
+CLAIM_RATE_PER_MINUTE = 28_570
+STALE_CLAIM_S = 5 * 3600 + 59 * 60
+MAX_RATE = 60_000_000
+GATEKEEPER_NETWORK = Pubkey.from_string("uniqobk8oGh4XBLMqM68K8M2zNu3CdYX7q5go7whQiv")
+
+
+class _Args:
+    """Borsh reader over instruction args (after the 8-byte discriminator)."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def pubkey(self) -> Pubkey:
+        key = Pubkey.from_bytes(self.data[self.pos:self.pos + 32])
+        self.pos += 32
+        return key
+
+    def u16(self) -> int:
+        (value,) = struct.unpack_from("<H", self.data, self.pos)
+        self.pos += 2
+        return value
+
+    def bool(self) -> bool:
+        value = self.data[self.pos] != 0
+        self.pos += 1
+        return value
+
+    def u64(self) -> int:
+        (value,) = struct.unpack_from("<Q", self.data, self.pos)
+        self.pos += 8
+        return value
+
+    def string(self) -> str:
+        (n,) = struct.unpack_from("<I", self.data, self.pos)
+        self.pos += 4
+        value = self.data[self.pos:self.pos + n].decode("utf-8")
+        self.pos += n
+        return value
+
+    def vec_u32(self) -> list:
+        (n,) = struct.unpack_from("<I", self.data, self.pos)
+        self.pos += 4
+        values = list(struct.unpack_from(f"<{n}I", self.data, self.pos))
+        self.pos += 4 * n
+        return values
+
+
+def _require(cond: bool, error: str):
+    if not cond:
+        raise FakeTxError(error)
+
+
+def _signed(key: Pubkey, signers):
+    _require(key in signers, f"missing required signature for {key}")
+
+
+def _wallet_pda_data(wallet: Pubkey) -> bytes:
+    return layout.account_discriminator("WalletPda") + bytes(wallet) + b"\x01"
+
+
+def _wallet_registered(chain, wallet_pda: Pubkey) -> bool:
+    acct = chain.accounts.get(wallet_pda)
+    return acct is not None and acct.data[:8] == layout.account_discriminator("WalletPda") and acct.data[40] == 1
+
+
+def _fancoin(chain, pubkey: Pubkey, account_name: str) -> dict:
+    stored = chain.values.get(pubkey)
+    _require(stored is not None and stored[0] == account_name, f"AccountNotInitialized: {account_name} {pubkey}")
+    return stored[1]
+
+
+def _new_player(name: str, authority: Pubkey, reward_address: Pubkey) -> dict:
+    return {
+        "name": name,
+        "authority": authority,
+        "reward_address": reward_address,
+        "last_name_change": None,
+        "last_reward_change": None,
+        "partial_validators": [],
+        "last_minted": None,
+        "pending_claim_ts": 0,
+        "pending_game_time_ms": 0,
+        "pending_paid": False,
+        "last_claim_ts": 0,
+    }
+
+
+def install(chain):
+    program_id = chain.program_id
+
+    def game_for(mint: Pubkey, game: Pubkey) -> dict:
+        _require(game == pdas.game_pda(mint, program_id)[0], "ConstraintSeeds: game")
+        return _fancoin(chain, game, "Game")
+
+    def init_player(game, game_values, player_pda, name_pda, name, authority, wallet_pda, user_ata, active):
+        _require(player_pda == pdas.player_pda(game, game_values["player_count"], program_id)[0],
+                 "ConstraintSeeds: player_pda")
+        _require(name_pda == pdas.player_name_pda(game, name, program_id)[0], "ConstraintSeeds: player_name_pda")
+        _require(name_pda not in chain.accounts, f"Allocate: account {name_pda} already in use")
+        _require(_wallet_registered(chain, wallet_pda), "Unauthorized: wallet_pda not registered")
+        _require(chain.is_token_account(user_ata), "InvalidAtaAccount")
+        chain.put(player_pda, "PlayerPda", _new_player(name, authority, user_ata))
+        chain.put(name_pda, "PlayerNamePda", {"name": name, "player_pda": player_pda, "active": active})
+        game_values["player_count"] += 1
+        chain.save(game)
+
+    def init_validator(mint, game, game_values, validator_pda, fancy_mint, validator, validator_ata, last_activity):
+        _require(validator_pda == pdas.validator_pda(mint, validator, program_id)[0], "ConstraintSeeds: validator_pda")
+        _require(validator_pda not in chain.accounts, f"Allocate: account {validator_pda} already in use")
+        _require(fancy_mint == game_values["mint_pubkey"], "ConstraintRaw: fancy_mint")
+        _require(validator_ata == pdas.associated_token_address(validator, fancy_mint), "ConstraintAssociated")
+        chain.add_token_account(validator, fancy_mint)
+        chain.put(validator_pda, "ValidatorPda",
+                  {"address": validator, "last_activity": last_activity, "last_minted": None, "last_claimed": None})
+        game_values["validator_count"] += 1
+        chain.save(game)
+
+    @chain.on_instruction("initialize_game_and_mint")
+    def initialize_game_and_mint(chain, accounts, data, signers):
+        args = _Args(data)
+        description, socials = args.string(), args.string()
+        commission_percent, coin_issuance_rate, validator_claim_rate = args.u16(), args.u64(), args.u64()
+        curated_val, initial_commission_tokens = args.bool(), args.u64()
+        game, mint_authority, mint, user, commission_ata = accounts[:5]
+        _signed(user, signers)
+        _require(mint == pdas.game_mint_pda(user, program_id)[0], "ConstraintSeeds: mint_for_game")
+        _require(game == pdas.game_pda(mint, program_id)[0], "ConstraintSeeds: game")
+        _require(mint_authority == pdas.mint_authority_pda(program_id)[0], "ConstraintSeeds: mint_authority")
+        _require(game not in chain.accounts, f"Allocate: account {game} already in use")
+        _require(commission_percent <= 100, "CommissionTooLarge")
+        _require(coin_issuance_rate <= MAX_RATE, "IssuanceRateTooLarge")
+        _require(validator_claim_rate <= MAX_RATE, "ClaimRateTooLarge")
+        _require(commission_ata == pdas.associated_token_address(user, mint), "ConstraintAssociated: commission_ata")
+        chain.add_game(
+            mint, owner=user, description=description, socials=socials, commission_percent=commission_percent,
+            coin_issuance_rate=coin_issuance_rate, validator_claim_rate=validator_claim_rate,
+            curated_val=curated_val, gatekeeper_network=GATEKEEPER_NETWORK,
+        )
+        if initial_commission_tokens:
+            chain.mint_to(commission_ata, initial_commission_tokens)
+
+    @chain.on_instruction("register_validator_curated")
+    def register_validator_curated(chain, accounts, data, signers):
+        args = _Args(data)
+        mint, validator = args.pubkey(), args.pubkey()
+        game, owner, validator_pda, fancy_mint, new_validator, validator_ata = accounts[:6]
+        _signed(owner, signers)
+        game_values = game_for(mint, game)
+        _require(game_values["owner"] == owner, "Unauthorized")
+        _require(game_values["curated_val"], "GameIsNotCurated")
+        _require(new_validator == validator, "ConstraintAddress: new_validator")
+        init_validator(mint, game, game_values, validator_pda, fancy_mint, validator, validator_ata, 0)
+
+    @chain.on_instruction("register_validator_pda")
+    def register_validator_pda(chain, accounts, data, signers):
+        mint = _Args(data).pubkey()
+        game, fancy_mint, validator_pda, user, validator_ata = accounts[:5]
+        remaining = accounts[10:]
+        _signed(user, signers)
+        game_values = game_for(mint, game)
+        _require(not game_values["curated_val"], "GameIsCurated")
+        _require(len(remaining) >= 1, "InsufficientLeftoverAccounts")
+        _require(_wallet_registered(chain, remaining[0]), "Unauthorized: wallet_pda not registered")
+        init_validator(mint, game, game_values, validator_pda, fancy_mint, user, validator_ata, chain.now())
+
+    @chain.on_instruction("create_user_ata_if_needed")
+    def create_user_ata_if_needed(chain, accounts, data, signers):
+        mint = _Args(data).pubkey()
+        user, fancy_mint, game, _gateway, user_ata, wallet_pda = accounts[:6]
+        _signed(user, signers)
+        game_values = game_for(mint, game)
+        _require(fancy_mint == game_values["mint_pubkey"], "ConstraintRaw: fancy_mint")
+        _require(user_ata == pdas.associated_token_address(user, fancy_mint), "ConstraintAssociated: user_ata")
+        _require(wallet_pda == pdas.wallet_pda(mint, user, program_id)[0], "ConstraintSeeds: wallet_pda")
+        chain.add_token_account(user, fancy_mint)
+        if not _wallet_registered(chain, wallet_pda):
+            chain.set_account(wallet_pda, _wallet_pda_data(user), owner=program_id)
+
+    @chain.on_instruction("register_player_pda")
+    def register_player_pda(chain, accounts, data, signers):
+        args = _Args(data)
+        mint, name = args.pubkey(), args.string()
+        game, fancy_mint, player_pda, name_pda, _gateway, user = accounts[:6]
+        remaining = accounts[10:]
+        _signed(user, signers)
+        _require(len(remaining) >= 2, "InsufficientLeftoverAccounts")
+        _require(len(name.encode()) <= MAX_NAME_LEN, "InvalidNameLength")
+        game_values = game_for(mint, game)
+        _require(fancy_mint == game_values["mint_pubkey"], "ConstraintRaw: fancy_mint")
+        # register_player_pda leaves PlayerNamePda.active at its default (false)
+        init_player(game, game_values, player_pda, name_pda, name, user, remaining[0], remaining[1], active=False)
+
+    @chain.on_instruction("register_player_pda_by_validator")
+    def register_player_pda_by_validator(chain, accounts, data, signers):
+        args = _Args(data)
+        mint, name, user_authority = args.pubkey(), args.string(), args.pubkey()
+        game, validator, player_pda, name_pda, fancy_mint = accounts[:5]
+        remaining = accounts[7:]
+        _signed(validator, signers)
+        _require(len(remaining) >= 2, "InsufficientLeftoverAccounts")
+        game_values = game_for(mint, game)
+        _require(fancy_mint == game_values["mint_pubkey"], "ConstraintRaw: fancy_mint")
+        init_player(game, game_values, player_pda, name_pda, name, user_authority, remaining[0], remaining[1],
+                    active=True)
+
+    @chain.on_instruction("punch_in")
+    def punch_in(chain, accounts, data, signers):
+        mint = _Args(data).pubkey()
+        game, validator_pda, validator = accounts[:3]
+        _signed(validator, signers)
+        game_values = game_for(mint, game)
+        _require(validator_pda == pdas.validator_pda(mint, validator, program_id)[0], "ConstraintSeeds: validator_pda")
+        val = _fancoin(chain, validator_pda, "ValidatorPda")
+        now = chain.now()
+        hour = now // 3600
+        if game_values["last_reset_hour"] is None or hour > game_values["last_reset_hour"]:
+            if game_values["last_reset_hour"] is not None:
+                game_values["active_validator_count"] = 0
+            game_values["last_reset_hour"] = hour
+        last_hour = val["last_activity"] // 3600 if val["last_activity"] > 0 else 0
+        if last_hour < hour and game_values["active_validator_count"] < game_values["validator_count"]:
+            game_values["active_validator_count"] += 1
+        val["last_activity"] = now
+        digest = groups.keccak256(bytes(validator) + struct.pack("<Q", chain.slot()))
+        game_values["last_seed"] = struct.unpack_from("<Q", digest)[0]
+        game_values["last_punch_in_time"] = now
+        chain.save(validator_pda)
+        chain.save(game)
+
+    @chain.on_instruction("submit_minting_list")
+    def submit_minting_list(chain, accounts, data, signers):
+        args = _Args(data)
+        mint, player_ids = args.pubkey(), args.vec_u32()
+        game, validator_pda, validator, fancy_mint = accounts[:4]
+        remaining = accounts[9:]
+        _signed(validator, signers)
+        game_values = game_for(mint, game)
+        _require(validator_pda == pdas.validator_pda(mint, validator, program_id)[0], "ValidatorNotRegistered")
+        _require(fancy_mint == game_values["mint_pubkey"], "ConstraintRaw: fancy_mint")
+        val = _fancoin(chain, validator_pda, "ValidatorPda")
+
+        now = chain.now()
+        hour = now // 3600
+        last_punch = game_values["last_punch_in_time"]
+        if last_punch is None or last_punch // 3600 != hour or val["last_activity"] // 3600 != hour:
+            return
+        if (now % 3600) // 60 < MINT_OPEN_MINUTE:
+            return
+        _require(len(remaining) >= 1, "MissingCommissionAta")
+        commission_ata = remaining[0]
+        _require(commission_ata == game_values["commission_ata"], "InvalidCommissionAta")
+        _require(chain.is_token_account(commission_ata), "InvalidCommissionAta")
+
+        active_vals = game_values["active_validator_count"]
+        total_groups = groups.total_groups(game_values["validator_count"])
+        tolerance = groups.failover_tolerance(game_values["validator_count"])
+        pairs = remaining[1:]
+        for i, _pid in enumerate(player_ids):
+            if game_values["last_seed"] is None or 2 * i + 1 >= len(pairs):
+                continue
+            player_pda, player_ata = pairs[2 * i], pairs[2 * i + 1]
+            stored = chain.values.get(player_pda)
+            if stored is None or stored[0] != "PlayerPda":
+                continue
+            player = stored[1]
+            if validator not in player["partial_validators"]:
+                player["partial_validators"].append(validator)
+            needed = 2 if active_vals > 1 else 1
+            if len(player["partial_validators"]) < needed:
+                chain.save(player_pda)
+                continue
+            seed = game_values["last_seed"]
+            first = groups.group_id(player["partial_validators"][0], seed, total_groups)
+            if any(groups.group_distance(groups.group_id(v, seed, total_groups), first, total_groups) > tolerance
+                   for v in player["partial_validators"][1:]):
+                chain.save(player_pda)  # "Failover => remain"
+                continue
+            diff_minutes = max(now - (player["last_minted"] or 0), 0) // 60
+            if not 1 <= diff_minutes <= 34:
+                player["last_minted"] = now
+                chain.save(player_pda)
+                continue
+            if not chain.is_token_account(player_ata):
+                chain.save(player_pda)
+                continue
+            minted = diff_minutes * game_values["coin_issuance_rate"]
+            chain.mint_to(player_ata, minted)
+            commission = minted * game_values["commission_percent"] // 100
+            if commission:
+                chain.mint_to(commission_ata, commission)
+            val["last_minted"] = now
+            player["partial_validators"] = []
+            player["last_minted"] = now
+            chain.save(player_pda)
+        chain.save(validator_pda)
+
+    @chain.on_instruction("request_claim")
+    def request_claim(chain, accounts, data, signers):
+        args = _Args(data)
+        mint, name = args.pubkey(), args.string()
+        game, name_pda, player_pda, _gateway, user = accounts[:5]
+        _signed(user, signers)
+        game_for(mint, game)
+        _require(name_pda == pdas.player_name_pda(game, name, program_id)[0], "ConstraintSeeds: player_name_pda")
+        name_values = _fancoin(chain, name_pda, "PlayerNamePda")
+        _require(player_pda == name_values["player_pda"], "ConstraintAddress: player_pda")
+        player = _fancoin(chain, player_pda, "PlayerPda")
+        _require(player["authority"] == user, "Unauthorized")
+        now = chain.now()
+        ts = player["pending_claim_ts"]
+        if ts is not None and not player["pending_paid"] and now - ts > STALE_CLAIM_S:
+            player["pending_paid"] = True
+            player["pending_claim_ts"] = now
+            chain.save(player_pda)
+
+    @chain.on_instruction("validate_player_pubg_time_slim")
+    def validate_player_pubg_time_slim(chain, accounts, data, signers):
+        args = _Args(data)
+        mint, name, new_time_seconds = args.pubkey(), args.string(), args.u64()
+        game, validator = accounts[:2]
+        remaining = accounts[4:]
+        _signed(validator, signers)
+        game_values = game_for(mint, game)
+        _require(len(remaining) >= 6, "InsufficientLeftoverAccounts")
+        name_pda, player_pda, fancy_mint, mint_authority, user_ata, validator_pda = remaining[:6]
+        _require(name_pda == pdas.player_name_pda(game, name, program_id)[0], "InvalidSeeds")
+        _require(player_pda == _fancoin(chain, name_pda, "PlayerNamePda")["player_pda"], "InvalidSeeds")
+        player = _fancoin(chain, player_pda, "PlayerPda")
+        _require(fancy_mint == game_values["mint_pubkey"], "InvalidSeeds")
+        _require(mint_authority == pdas.mint_authority_pda(program_id)[0], "InvalidSeeds")
+        _require(chain.is_token_account(user_ata) and user_ata == player["reward_address"], "InvalidAtaAccount")
+        _require(validator_pda == pdas.validator_pda(fancy_mint, validator, program_id)[0], "ValidatorNotRegistered")
+        val = _fancoin(chain, validator_pda, "ValidatorPda")
+        _require(val["address"] == validator, "ValidatorNotRegistered")
+
+        old_time = player["pending_game_time_ms"] or 0
+        final_diff = min(max(new_time_seconds - old_time, 0), MAX_VALIDATE_SECONDS)
+        player["pending_game_time_ms"] = new_time_seconds
+        minted = (final_diff // 60) * game_values["coin_issuance_rate"]
+        if minted:
+            chain.mint_to(user_ata, minted)
+            commission = minted * game_values["commission_percent"] // 100
+            if commission and len(remaining) > 6:
+                chain.mint_to(remaining[6], commission)
+            val["last_minted"] = chain.now()
+            chain.save(validator_pda)
+        chain.save(player_pda)
+
+    @chain.on_instruction("claim_validator_reward")
+    def claim_validator_reward(chain, accounts, data, signers):
+        mint = _Args(data).pubkey()
+        game, validator_pda, validator = accounts[:3]
+        remaining = accounts[8:]
+        _signed(validator, signers)
+        game_for(mint, game)
+        val = _fancoin(chain, validator_pda, "ValidatorPda")
+        _require(val["address"] == validator, "ValidatorNotRegistered")
+        _require(len(remaining) >= 1 and chain.is_token_account(remaining[0]), "InvalidAtaAccount")
+        now = chain.now()
+        if now - (val["last_minted"] or 0) > 3600:
+            return
+        minutes = min(max(now - (val["last_claimed"] or 0), 0) // 60, 60)
+        if minutes == 0:
+            return
+        val["last_claimed"] = now
+        chain.mint_to(remaining[0], CLAIM_RATE_PER_MINUTE * minutes)
+        chain.save(validator_pda)
+
+    return chain
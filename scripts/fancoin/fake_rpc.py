@@ -0,0 +1,897 @@
+"""
+In-process fake Solana JSON-RPC node for the fancoin scripts.
+
+FakeChain keeps an account map (lamports, data, owner) and answers the
+JSON-RPC methods the scripts use: getAccountInfo, getMultipleAccounts,
+getProgramAccounts (memcmp / dataSize filters, dataSlice), getBalance,
+getTokenAccountBalance, getLatestBlockhash, sendTransaction,
+getSignatureStatuses, requestAirdrop, ... including JSON-RPC batch arrays.
+
+fancoin accounts (Game, PlayerPda, PlayerNamePda, ValidatorPda) are stored
+as field dicts and serialized with fancoin.layout, so they decode exactly
+like the real ones; Token-2022 mints / token accounts use the SPL layouts.
+
+sendTransaction decodes the transaction, charges the fee payer and runs a
+handler per instruction: system transfer and ATA creation are built in;
+fancoin instructions are modelled by handlers registered with
+`chain.on_instruction("name")`. v0 TXs resolve their Address Lookup
+Table indexes (create / extend of the lookup table program are built in,
+with the one-slot warm-up of new entries) and more than TX_ACCOUNT_LOCKS
+distinct accounts fail like TooManyAccountLocks. A FakeTxError fails the transaction the
+way preflight would; a TX with more than one fancoin instruction is
+rolled back as a whole (account changes and their notifications), single
+instruction ones are not.
+
+Ways to put it on the wire:
+  - FakeRpcServer: a real HTTP/1.1 keep-alive server on localhost (for
+    AsyncClient("http://127.0.0.1:<port>") and the scripts as they are),
+    optionally with a FakeWsServer for program / account subscriptions,
+  - FakeRpcThread: the same server on its own loop in a daemon thread,
+  - FakeRpcTransport: an httpx transport, no sockets at all.
+
+Latency (fixed + jitter) and failure injection (JSON-RPC errors per call,
+HTTP 429/503 per request) are seeded, so runs are repeatable.
+
+    python -m fancoin.fake_rpc --port 8899 --players 1000 --latency-ms 2
+"""
+import argparse
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+from collections import Counter
+
+import base58
+import httpx
+from solders.address_lookup_table_account import ID as LOOKUP_TABLE_PROGRAM_ID
+from solders.address_lookup_table_account import LOOKUP_TABLE_META_SIZE, derive_lookup_table_address
+from solders.compute_budget import ID as COMPUTE_BUDGET_PROGRAM_ID
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+
+from fancoin import layout, pdas
+from fancoin.layout import instruction_discriminator
+
+SYSTEM_PROGRAM_ID = Pubkey.from_string("11111111111111111111111111111111")
+MINT_LEN = 82
+TOKEN_ACCOUNT_LEN = 165
+LAMPORTS_PER_SIGNATURE = 5000
+SLOT_S = 0.4
+DEFAULT_DECIMALS = 9
+TX_ACCOUNT_LOCKS = 64
+
+# JSON-RPC error codes the real node uses
+ERR_METHOD_NOT_FOUND = -32601
+ERR_INVALID_PARAMS = -32602
+ERR_TX_SIMULATION = -32002
+ERR_NODE_BEHIND = -32005
+
+
+class FakeTxError(Exception):
+    """Raised by an instruction handler to fail the transaction."""
+
+    instruction = None  # index of the failing instruction, set by process_transaction
+    err = None          # TransactionError to report instead of the default
+
+    def simulation_result(self) -> dict:
+        """The error's `data`: an RpcSimulateTransactionResult, as solders expects it."""
+        err = self.err or (
+            "AccountNotFound" if self.instruction is None else {"InstructionError": [self.instruction, {"Custom": 0}]}
+        )
+        return {"err": err, "logs": [f"Program log: {self}"], "accounts": None, "unitsConsumed": 0,
+                "returnData": None}
+
+
+def _coption_pubkey(key) -> bytes:
+    return b"\x00\x00\x00\x00" + bytes(32) if key is None else b"\x01\x00\x00\x00" + bytes(key)
+
+
+def encode_mint(authority, supply: int = 0, decimals: int = DEFAULT_DECIMALS) -> bytes:
+    return _coption_pubkey(authority) + struct.pack("<QB?", supply, decimals, True) + _coption_pubkey(None)
+
+
+def encode_token_account(mint, owner, amount: int = 0) -> bytes:
+    return (
+        bytes(mint) + bytes(owner) + struct.pack("<Q", amount)
+        + _coption_pubkey(None)          # delegate
+        + b"\x01"                        # state = initialized
+        + b"\x00" * 12                   # is_native: COption<u64>
+        + struct.pack("<Q", 0)           # delegated_amount
+        + _coption_pubkey(None)          # close_authority
+    )
+
+
+class FakeAccount:
+    __slots__ = ("lamports", "data", "owner", "executable")
+
+    def __init__(self, lamports: int, data: bytes, owner: Pubkey, executable: bool = False):
+        self.lamports = lamports
+        self.data = data
+        self.owner = owner
+        self.executable = executable
+
+
+class FakeChain:
+    def __init__(self, program_id: Pubkey = pdas.PROGRAM_ID, latency_s: float = 0.0, jitter_s: float = 0.0,
+                 failure_rate: float = 0.0, http_failure_rate: float = 0.0, fail_methods=None, seed: int = 0,
+                 clock_offset_s: float = 0.0):
+        self.program_id = program_id
+        self.accounts = {}       # Pubkey -> FakeAccount
+        self.values = {}         # Pubkey -> (account_name, {field: value}) for fancoin accounts
+        self.signatures = {}     # signature str -> slot
+        self.handlers = {}       # (program_id, key) -> fn(chain, accounts, data, signers)
+        self.instruction_names = {}  # discriminator -> instruction name (for stats)
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.failure_rate = failure_rate
+        self.http_failure_rate = http_failure_rate
+        self.fail_methods = set(fail_methods or ())
+        self.rng = random.Random(seed)
+        self.started = time.time()
+        self.clock_offset_s = clock_offset_s  # shifts unix_timestamp (e.g. into the mint window)
+        self.http_requests = 0
+        self.calls = Counter()
+        self.transactions = 0
+        self.instructions = Counter()
+        self.watchers = []       # fn(pubkey, FakeAccount) after every account write (FakeWsServer)
+        self._pending = None     # pubkeys written by the TX being processed (notified once it lands)
+        self._install_builtin_handlers()
+
+    # ----------------------------------------------------------------
+    # Clock
+    # ----------------------------------------------------------------
+    def slot(self) -> int:
+        return int((time.time() - self.started) / SLOT_S) + 1
+
+    def now(self) -> int:
+        return int(time.time() + self.clock_offset_s)
+
+    # ----------------------------------------------------------------
+    # State helpers
+    # ----------------------------------------------------------------
+    def set_account(self, pubkey: Pubkey, data: bytes = b"", lamports: int = None, owner: Pubkey = None):
+        if lamports is None:
+            lamports = self.rent_exempt(len(data))
+        self.accounts[pubkey] = FakeAccount(lamports, bytes(data), owner or SYSTEM_PROGRAM_ID)
+        self._changed(pubkey)
+
+    def _changed(self, pubkey: Pubkey):
+        if self._pending is not None:
+            self._pending.add(pubkey)
+            return
+        for watcher in self.watchers:
+            watcher(pubkey, self.accounts[pubkey])
+
+    def fund(self, pubkey: Pubkey, lamports: int):
+        acct = self.accounts.get(pubkey)
+        if acct is None:
+            self.set_account(pubkey, b"", lamports)
+        else:
+            acct.lamports += lamports
+
+    @staticmethod
+    def rent_exempt(size: int) -> int:
+        return (128 + size) * 6960
+
+    def put(self, pubkey: Pubkey, account_name: str, values: dict):
+        """Store / overwrite a fancoin account from its field values."""
+        self.values[pubkey] = (account_name, values)
+        acct = self.accounts.get(pubkey)
+        data = layout.encode_account(account_name, values)
+        if acct is None:
+            self.set_account(pubkey, data, owner=self.program_id)
+        else:
+            acct.data = data
+            self._changed(pubkey)
+
+    def get(self, pubkey: Pubkey) -> dict:
+        """Field values of a fancoin account (mutate, then call put() / save())."""
+        return self.values[pubkey][1]
+
+    def save(self, pubkey: Pubkey):
+        account_name, values = self.values[pubkey]
+        self.put(pubkey, account_name, values)
+
+    # ----------------------------------------------------------------
+    # Seeding
+    # ----------------------------------------------------------------
+    def add_mint(self, mint: Pubkey, decimals: int = DEFAULT_DECIMALS):
+        authority, bump = pdas.mint_authority_pda(self.program_id)
+        if authority not in self.accounts:
+            self.set_account(authority, layout.account_discriminator("MintAuthority") + bytes([bump]),
+                             owner=self.program_id)
+        self.set_account(mint, encode_mint(authority, 0, decimals), owner=pdas.SPL_TOKEN_PROGRAM_ID)
+
+    def is_token_account(self, pubkey: Pubkey) -> bool:
+        acct = self.accounts.get(pubkey)
+        return acct is not None and acct.owner == pdas.SPL_TOKEN_PROGRAM_ID and len(acct.data) >= TOKEN_ACCOUNT_LEN
+
+    def mint_to(self, ata: Pubkey, amount: int):
+        """SPL MintTo: bump the token account amount and the mint supply."""
+        acct = self.accounts[ata]
+        mint = self.accounts[Pubkey.from_bytes(acct.data[:32])]
+        data = bytearray(acct.data)
+        struct.pack_into("<Q", data, 64, struct.unpack_from("<Q", data, 64)[0] + amount)
+        acct.data = bytes(data)
+        supply = bytearray(mint.data)
+        struct.pack_into("<Q", supply, 36, struct.unpack_from("<Q", supply, 36)[0] + amount)
+        mint.data = bytes(supply)
+
+    def add_token_account(self, owner: Pubkey, mint: Pubkey, amount: int = 0) -> Pubkey:
+        ata = pdas.associated_token_address(owner, mint)
+        if ata not in self.accounts:
+            self.set_account(ata, encode_token_account(mint, owner, amount), owner=pdas.SPL_TOKEN_PROGRAM_ID)
+        return ata
+
+    def add_game(self, mint: Pubkey, owner: Pubkey = None, **fields) -> Pubkey:
+        game, _ = pdas.game_pda(mint, self.program_id)
+        owner = owner or Keypair().pubkey()
+        if mint not in self.accounts:
+            self.add_mint(mint)
+        values = {
+            "player_count": 0,
+            "validator_count": 0,
+            "active_validator_count": 0,
+            "last_reset_hour": None,
+            "description": "fake game",
+            "socials": "",
+            "last_seed": None,
+            "last_punch_in_time": None,
+            "mint_pubkey": mint,
+            "commission_ata": self.add_token_account(owner, mint),
+            "commission_percent": 0,
+            "coin_issuance_rate": 1_000_000,
+            "validator_claim_rate": 28_570,
+            "curated_val": True,
+            "owner": owner,
+            "claim_rate_lock": False,
+            "coin_issuance_rate_lock": False,
+            "commission_percent_lock": False,
+            "gatekeeper_network": Pubkey.default(),
+        }
+        values.update(fields)
+        self.put(game, "Game", values)
+        return game
+
+    def add_player(self, game: Pubkey, name: str, authority: Pubkey = None, **fields) -> Pubkey:
+        """PlayerPda at the next index + its PlayerNamePda; bumps Game.player_count."""
+        game_values = self.get(game)
+        index = game_values["player_count"]
+        authority = authority or Keypair().pubkey()
+        player, _ = pdas.player_pda(game, index, self.program_id)
+        values = {
+            "name": name,
+            "authority": authority,
+            "reward_address": self.add_token_account(authority, game_values["mint_pubkey"]),
+            "last_name_change": None,
+            "last_reward_change": None,
+            "partial_validators": [],
+            "last_minted": None,
+            "pending_claim_ts": None,
+            "pending_game_time_ms": None,
+            "pending_paid": False,
+            "last_claim_ts": None,
+        }
+        values.update(fields)
+        self.put(player, "PlayerPda", values)
+        name_pda, _ = pdas.player_name_pda(game, name, self.program_id)
+        self.put(name_pda, "PlayerNamePda", {"name": name, "player_pda": player, "active": True})
+        game_values["player_count"] = index + 1
+        self.save(game)
+        return player
+
+    def add_validator(self, mint: Pubkey, validator: Pubkey, **fields) -> Pubkey:
+        game, _ = pdas.game_pda(mint, self.program_id)
+        val_pda, _ = pdas.validator_pda(mint, validator, self.program_id)
+        values = {"address": validator, "last_activity": 0, "last_minted": None, "last_claimed": None}
+        values.update(fields)
+        self.put(val_pda, "ValidatorPda", values)
+        self.add_token_account(validator, mint)
+        self.get(game)["validator_count"] += 1
+        self.save(game)
+        return val_pda
+
+    # ----------------------------------------------------------------
+    # Instruction handlers
+    # ----------------------------------------------------------------
+    def on_instruction(self, name: str, program_id: Pubkey = None):
+        """Decorator: handler(chain, accounts, args_bytes, signers) for an Anchor instruction."""
+        def register(fn):
+            key = instruction_discriminator(name)
+            self.handlers[(program_id or self.program_id, key)] = fn
+            self.instruction_names[key] = name
+            return fn
+        return register
+
+    def _install_builtin_handlers(self):
+        def system(chain, accounts, data, signers):
+            kind = struct.unpack_from("<I", data)[0]
+            if kind != 2:  # only Transfer is modelled
+                return
+            lamports = struct.unpack_from("<Q", data, 4)[0]
+            src, dst = accounts[0], accounts[1]
+            if src not in signers:
+                raise FakeTxError("transfer source did not sign")
+            src_acct = chain.accounts.get(src)
+            if src_acct is None or src_acct.lamports < lamports:
+                raise FakeTxError("Attempt to debit an account but found no record of a prior credit.")
+            src_acct.lamports -= lamports
+            chain.fund(dst, lamports)
+
+        def create_ata(chain, accounts, data, signers):
+            # [payer, ata, owner, mint, system_program, token_program]
+            owner, mint = accounts[2], accounts[3]
+            chain.add_token_account(owner, mint)
+
+        def lookup_table(chain, accounts, data, signers):
+            # [table, authority, payer, system_program]; only Create (0) and Extend (2) are modelled
+            kind = struct.unpack_from("<I", data)[0]
+            table, authority = accounts[0], accounts[1]
+            if authority not in signers:
+                raise FakeTxError("lookup table authority did not sign")
+            if kind == 0:
+                recent_slot, bump = struct.unpack_from("<QB", data, 4)
+                if recent_slot > chain.slot() or derive_lookup_table_address(authority, recent_slot) != (table, bump):
+                    raise FakeTxError("invalid lookup table address / recent slot")
+                if table in chain.accounts:
+                    raise FakeTxError("lookup table already exists")
+                meta = struct.pack("<IQQB", 1, 2**64 - 1, 0, 0) + b"\x01" + bytes(authority) + b"\x00\x00"
+                chain.set_account(table, meta, owner=LOOKUP_TABLE_PROGRAM_ID)
+            elif kind == 2:
+                acct = chain.accounts.get(table)
+                if acct is None or acct.owner != LOOKUP_TABLE_PROGRAM_ID or acct.data[22:54] != bytes(authority):
+                    raise FakeTxError("not a lookup table of this authority")
+                count = struct.unpack_from("<Q", data, 4)[0]
+                new = data[12:12 + 32 * count]
+                held = (len(acct.data) - LOOKUP_TABLE_META_SIZE) // 32
+                if count == 0 or held + count > 256:
+                    raise FakeTxError("lookup table extension out of range")
+                meta = bytearray(acct.data[:LOOKUP_TABLE_META_SIZE])
+                if struct.unpack_from("<Q", meta, 12)[0] != chain.slot():
+                    struct.pack_into("<QB", meta, 12, chain.slot(), held)
+                acct.data = bytes(meta) + acct.data[LOOKUP_TABLE_META_SIZE:] + bytes(new)
+                chain._changed(table)
+
+        self.handlers[(SYSTEM_PROGRAM_ID, "system")] = system
+        self.handlers[(pdas.ASSOCIATED_TOKEN_PROGRAM_ID, "ata")] = create_ata
+        self.handlers[(LOOKUP_TABLE_PROGRAM_ID, "alt")] = lookup_table
+
+    def _lookup(self, table: Pubkey, indexes) -> list:
+        """Addresses at `indexes` of a lookup table, minus the ones extended in this slot."""
+        acct = self.accounts.get(table)
+        if acct is None or acct.owner != LOOKUP_TABLE_PROGRAM_ID:
+            raise FakeTxError(f"lookup table {table} not found")
+        last_extended_slot, start_index = struct.unpack_from("<QB", acct.data, 12)
+        held = (len(acct.data) - LOOKUP_TABLE_META_SIZE) // 32
+        usable = start_index if last_extended_slot == self.slot() else held
+        out = []
+        for i in bytes(indexes):
+            if i >= usable:
+                error = FakeTxError(f"lookup table {table} index {i} not usable yet ({usable} active)")
+                error.err = "InvalidAddressLookupTableIndex"
+                raise error
+            start = LOOKUP_TABLE_META_SIZE + 32 * i
+            out.append(Pubkey.from_bytes(acct.data[start:start + 32]))
+        return out
+
+    def _account_keys(self, msg) -> list:
+        """Static keys, then every table's writable, then readonly lookups (the runtime's order)."""
+        keys = list(msg.account_keys)
+        if isinstance(msg, MessageV0):
+            lookups = msg.address_table_lookups
+            for l in lookups:
+                keys += self._lookup(l.account_key, l.writable_indexes)
+            for l in lookups:
+                keys += self._lookup(l.account_key, l.readonly_indexes)
+        if len(set(keys)) > TX_ACCOUNT_LOCKS:
+            error = FakeTxError(f"{len(set(keys))} accounts > {TX_ACCOUNT_LOCKS}")
+            error.err = "TooManyAccountLocks"
+            raise error
+        return keys
+
+    def _handler_for(self, program: Pubkey, data: bytes):
+        if program == SYSTEM_PROGRAM_ID:
+            return "system", self.handlers.get((program, "system"))
+        if program == pdas.ASSOCIATED_TOKEN_PROGRAM_ID:
+            return "create_ata", self.handlers.get((program, "ata"))
+        if program == LOOKUP_TABLE_PROGRAM_ID:
+            return "lookup_table", self.handlers.get((program, "alt"))
+        if program == COMPUTE_BUDGET_PROGRAM_ID:
+            return "compute_budget", None
+        key = bytes(data[:8])
+        return self.instruction_names.get(key, key.hex()), self.handlers.get((program, key))
+
+    def _snapshot(self) -> tuple:
+        accounts = {k: FakeAccount(a.lamports, a.data, a.owner, a.executable) for k, a in self.accounts.items()}
+        return accounts, copy.deepcopy(self.values)
+
+    def process_transaction(self, raw: bytes) -> str:
+        tx = VersionedTransaction.from_bytes(raw)
+        msg = tx.message
+        keys = self._account_keys(msg)
+        signers = set(keys[: msg.header.num_required_signatures])
+        payer = self.accounts.get(keys[0])
+        fee = LAMPORTS_PER_SIGNATURE * len(tx.signatures)
+        if payer is None or payer.lamports < fee:
+            raise FakeTxError("Attempt to debit an account but found no record of a prior credit.")
+        payer.lamports -= fee
+
+        atomic = sum(keys[ix.program_id_index] == self.program_id for ix in msg.instructions) > 1
+        saved = self._snapshot() if atomic else None
+        self._pending = set()
+        try:
+            for n, ix in enumerate(msg.instructions):
+                program = keys[ix.program_id_index]
+                accounts = [keys[i] for i in bytes(ix.accounts)]
+                data = bytes(ix.data)
+                label, handler = self._handler_for(program, data)
+                self.instructions[label] += 1
+                if handler is not None:
+                    try:
+                        handler(self, accounts, data[8:] if program == self.program_id else data, signers)
+                    except FakeTxError as e:
+                        e.instruction = n
+                        raise
+        except Exception:
+            if saved is not None:
+                self.accounts, self.values = saved
+                self._pending.clear()
+            raise
+        finally:
+            pending, self._pending = self._pending, None
+            for pubkey in pending:
+                self._changed(pubkey)
+
+        signature = str(tx.signatures[0])
+        self.signatures[signature] = self.slot()
+        self.transactions += 1
+        return signature
+
+    # ----------------------------------------------------------------
+    # JSON encoding
+    # ----------------------------------------------------------------
+    def _context(self) -> dict:
+        return {"slot": self.slot()}
+
+    @staticmethod
+    def _account_json(acct: FakeAccount, data_slice=None) -> dict:
+        data = acct.data
+        if data_slice:
+            data = data[data_slice["offset"]:data_slice["offset"] + data_slice["length"]]
+        return {
+            "data": [base64.b64encode(data).decode("ascii"), "base64"],
+            "executable": acct.executable,
+            "lamports": acct.lamports,
+            "owner": str(acct.owner),
+            "rentEpoch": 0,
+            "space": len(acct.data),
+        }
+
+    @staticmethod
+    def _matches(data: bytes, filters) -> bool:
+        for flt in filters or ():
+            if "dataSize" in flt:
+                if len(data) != flt["dataSize"]:
+                    return False
+            elif "memcmp" in flt:
+                memcmp = flt["memcmp"]
+                if memcmp.get("encoding") == "base64":
+                    want = base64.b64decode(memcmp["bytes"])
+                else:
+                    want = base58.b58decode(memcmp["bytes"])
+                offset = memcmp["offset"]
+                if data[offset:offset + len(want)] != want:
+                    return False
+        return True
+
+    # ----------------------------------------------------------------
+    # JSON-RPC methods
+    # ----------------------------------------------------------------
+    def rpc_getHealth(self, params):
+        return "ok"
+
+    def rpc_getVersion(self, params):
+        return {"solana-core": "1.18.0", "feature-set": 0}
+
+    def rpc_getSlot(self, params):
+        return self.slot()
+
+    def rpc_getBlockHeight(self, params):
+        return self.slot()
+
+    def rpc_getBlockTime(self, params):
+        return self.now()
+
+    def rpc_getLatestBlockhash(self, params):
+        slot = self.slot()
+        blockhash = base58.b58encode(hashlib.sha256(struct.pack("<Q", slot)).digest()).decode("ascii")
+        return {"context": self._context(), "value": {"blockhash": blockhash, "lastValidBlockHeight": slot + 150}}
+
+    def rpc_getFeeForMessage(self, params):
+        return {"context": self._context(), "value": LAMPORTS_PER_SIGNATURE}
+
+    def rpc_getMinimumBalanceForRentExemption(self, params):
+        return self.rent_exempt(params[0])
+
+    def rpc_getBalance(self, params):
+        acct = self.accounts.get(Pubkey.from_string(params[0]))
+        return {"context": self._context(), "value": 0 if acct is None else acct.lamports}
+
+    def rpc_getAccountInfo(self, params):
+        config = params[1] if len(params) > 1 else {}
+        acct = self.accounts.get(Pubkey.from_string(params[0]))
+        value = None if acct is None else self._account_json(acct, config.get("dataSlice"))
+        return {"context": self._context(), "value": value}
+
+    def rpc_getMultipleAccounts(self, params):
+        config = params[1] if len(params) > 1 else {}
+        if len(params[0]) > 100:
+            raise ValueError("Too many inputs provided; max 100")
+        value = []
+        for key in params[0]:
+            acct = self.accounts.get(Pubkey.from_string(key))
+            value.append(None if acct is None else self._account_json(acct, config.get("dataSlice")))
+        return {"context": self._context(), "value": value}
+
+    def rpc_getProgramAccounts(self, params):
+        program = Pubkey.from_string(params[0])
+        config = params[1] if len(params) > 1 else {}
+        filters = config.get("filters")
+        out = [
+            {"pubkey": str(key), "account": self._account_json(acct, config.get("dataSlice"))}
+            for key, acct in self.accounts.items()
+            if acct.owner == program and self._matches(acct.data, filters)
+        ]
+        if config.get("withContext"):
+            return {"context": self._context(), "value": out}
+        return out
+
+    def rpc_getTokenAccountBalance(self, params):
+        acct = self.accounts.get(Pubkey.from_string(params[0]))
+        if acct is None or len(acct.data) < TOKEN_ACCOUNT_LEN:
+            raise ValueError("Invalid param: could not find account")
+        mint = self.accounts.get(Pubkey.from_bytes(acct.data[:32]))
+        decimals = mint.data[44] if mint is not None and len(mint.data) >= MINT_LEN else DEFAULT_DECIMALS
+        amount = struct.unpack_from("<Q", acct.data, 64)[0]
+        ui_amount = amount / 10 ** decimals
+        return {
+            "context": self._context(),
+            "value": {
+                "amount": str(amount),
+                "decimals": decimals,
+                "uiAmount": ui_amount,
+                "uiAmountString": repr(ui_amount),
+            },
+        }
+
+    def rpc_requestAirdrop(self, params):
+        self.fund(Pubkey.from_string(params[0]), params[1])
+        signature = base58.b58encode(hashlib.sha512(f"airdrop:{params[0]}:{time.time()}".encode()).digest()).decode()
+        self.signatures[signature] = self.slot()
+        return signature
+
+    def rpc_sendTransaction(self, params):
+        config = params[1] if len(params) > 1 else {}
+        encoded = params[0]
+        raw = base64.b64decode(encoded) if config.get("encoding", "base58") == "base64" else base58.b58decode(encoded)
+        return self.process_transaction(raw)
+
+    def rpc_getSignatureStatuses(self, params):
+        value = []
+        for sig in params[0]:
+            slot = self.signatures.get(sig)
+            value.append(None if slot is None else {
+                "slot": slot,
+                "confirmations": None,
+                "err": None,
+                "status": {"Ok": None},
+                "confirmationStatus": "finalized",
+            })
+        return {"context": self._context(), "value": value}
+
+    def rpc_getTransaction(self, params):
+        return None  # transactions are not stored; callers treat this as "no logs"
+
+    # ----------------------------------------------------------------
+    # Request handling
+    # ----------------------------------------------------------------
+    def _call(self, req: dict) -> dict:
+        method = req.get("method")
+        self.calls[method] += 1
+        reply = {"jsonrpc": "2.0", "id": req.get("id")}
+        if method in self.fail_methods or (self.failure_rate and self.rng.random() < self.failure_rate):
+            reply["error"] = {"code": ERR_NODE_BEHIND, "message": "Node is behind (injected failure)"}
+            return reply
+        fn = getattr(self, f"rpc_{method}", None)
+        if fn is None:
+            reply["error"] = {"code": ERR_METHOD_NOT_FOUND, "message": f"Method not found: {method}"}
+            return reply
+        try:
+            reply["result"] = fn(req.get("params") or [])
+        except FakeTxError as e:
+            reply["error"] = {"code": ERR_TX_SIMULATION, "message": f"Transaction simulation failed: {e}",
+                              "data": e.simulation_result()}
+        except Exception as e:
+            reply["error"] = {"code": ERR_INVALID_PARAMS, "message": str(e)}
+        return reply
+
+    async def handle_http(self, body: bytes):
+        """One HTTP POST => (status, response bytes). Latency is per round trip."""
+        self.http_requests += 1
+        delay = self.latency_s + (self.rng.random() * self.jitter_s if self.jitter_s else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.http_failure_rate and self.rng.random() < self.http_failure_rate:
+            return self.rng.choice((429, 503)), b""
+        payload = json.loads(body)
+        if isinstance(payload, list):
+            result = [self._call(req) for req in payload]
+        else:
+            result = self._call(payload)
+        return 200, json.dumps(result).encode()
+
+    def stats(self) -> dict:
+        return {
+            "http_requests": self.http_requests,
+            "rpc_calls": sum(self.calls.values()),
+            "calls": dict(self.calls),
+            "transactions": self.transactions,
+            "instructions": dict(self.instructions),
+        }
+
+
+# --------------------------------------------------------------------
+# Wire adapters
+# --------------------------------------------------------------------
+class FakeRpcTransport(httpx.AsyncBaseTransport):
+    """httpx transport straight into a FakeChain (no sockets)."""
+
+    def __init__(self, chain: FakeChain):
+        self.chain = chain
+
+    async def handle_async_request(self, request):
+        status, content = await self.chain.handle_http(await request.aread())
+        return httpx.Response(status, content=content, headers={"content-type": "application/json"})
+
+
+class FakeRpcServer:
+    """Minimal HTTP/1.1 keep-alive JSON-RPC server bound to localhost."""
+
+    def __init__(self, chain: FakeChain, host: str = "127.0.0.1", port: int = 0, ws: bool = False):
+        self.chain = chain
+        self.host = host
+        self.port = port
+        self.server = None
+        self.ws = FakeWsServer(chain, host, port + 1 if port else 0) if ws else None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        return None if self.ws is None else self.ws.url
+
+    async def start(self) -> "FakeRpcServer":
+        self.server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        if self.ws is not None:
+            await self.ws.start()
+        return self
+
+    async def stop(self):
+        if self.ws is not None:
+            await self.ws.stop()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, content = await self.chain.handle_http(body)
+                reason = {200: "OK", 429: "Too Many Requests", 503: "Service Unavailable"}.get(status, "Error")
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode() + content
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class FakeWsServer:
+    """
+    programSubscribe / accountSubscribe (+ unsubscribe) over a websocket,
+    notified from FakeChain.watchers: every put() / set_account() of a
+    matching account sends one notification. Token balance changes
+    (mint_to) are not notified. Needs the websockets package.
+    """
+
+    def __init__(self, chain: FakeChain, host: str = "127.0.0.1", port: int = 0):
+        self.chain = chain
+        self.host = host
+        self.port = port
+        self.server = None
+        self.loop = None
+        self.connections = []  # (queue, {subscription id: (kind, pubkey, filters)})
+        self._next_id = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self) -> "FakeWsServer":
+        import websockets
+
+        self.loop = asyncio.get_running_loop()
+        self.chain.watchers.append(self._on_change)
+        self.server = await websockets.serve(self._serve, self.host, self.port, max_size=None)
+        self.port = next(iter(self.server.sockets)).getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.chain.watchers.remove(self._on_change)
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _on_change(self, pubkey: Pubkey, acct: FakeAccount):
+        """Runs wherever the chain was written (node loop or a test thread)."""
+        for queue, subs in list(self.connections):
+            for sub_id, (kind, target, filters) in list(subs.items()):
+                if kind == "account" and target == pubkey:
+                    method, value = "accountNotification", self.chain._account_json(acct)
+                elif kind == "program" and acct.owner == target and self.chain._matches(acct.data, filters):
+                    method = "programNotification"
+                    value = {"pubkey": str(pubkey), "account": self.chain._account_json(acct)}
+                else:
+                    continue
+                msg = {"jsonrpc": "2.0", "method": method, "params": {
+                    "result": {"context": self.chain._context(), "value": value}, "subscription": sub_id,
+                }}
+                self.loop.call_soon_threadsafe(queue.put_nowait, json.dumps(msg))
+
+    async def _send_loop(self, ws, queue):
+        while True:
+            await ws.send(await queue.get())
+
+    async def _serve(self, ws, path=None):
+        queue, subs = asyncio.Queue(), {}
+        conn = (queue, subs)
+        self.connections.append(conn)
+        sender = asyncio.ensure_future(self._send_loop(ws, queue))
+        try:
+            async for message in ws:
+                req = json.loads(message)
+                method, params = req.get("method"), req.get("params") or []
+                self.chain.calls[method] += 1
+                reply = {"jsonrpc": "2.0", "id": req.get("id")}
+                if method in ("programSubscribe", "accountSubscribe"):
+                    self._next_id += 1
+                    config = params[1] if len(params) > 1 else {}
+                    kind = "program" if method == "programSubscribe" else "account"
+                    subs[self._next_id] = (kind, Pubkey.from_string(params[0]), config.get("filters"))
+                    reply["result"] = self._next_id
+                elif method in ("programUnsubscribe", "accountUnsubscribe"):
+                    reply["result"] = subs.pop(params[0], None) is not None
+                else:
+                    reply["error"] = {"code": ERR_METHOD_NOT_FOUND, "message": f"Method not found: {method}"}
+                await queue.put(json.dumps(reply))
+        except Exception:
+            pass  # connection dropped
+        finally:
+            self.connections.remove(conn)
+            sender.cancel()
+
+
+class FakeRpcThread:
+    """
+    FakeRpcServer on its own event loop in a daemon thread, so a benchmark's
+    loop (and its CPU time) is kept apart from the node's.
+    """
+
+    def __init__(self, chain: FakeChain, host: str = "127.0.0.1", port: int = 0, ws: bool = False):
+        self.server = FakeRpcServer(chain, host, port, ws)
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return self.server.url
+
+    @property
+    def ws_url(self) -> str:
+        return self.server.ws_url
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.server.start())
+        self._ready.set()
+        self.loop.run_forever()
+
+    def start(self) -> "FakeRpcThread":
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+# --------------------------------------------------------------------
+# Seeded world
+# --------------------------------------------------------------------
+def seed_world(chain: FakeChain, players: int = 0, validators: int = 0, player_prefix: str = "player") -> dict:
+    """
+    One game (fresh mint) with `players` PlayerPdas and `validators` funded
+    ValidatorPdas. Returns the addresses / keypairs the scripts need.
+    """
+    mint = Keypair().pubkey()
+    owner = Keypair()
+    chain.fund(owner.pubkey(), 1_000 * 10 ** 9)
+    game = chain.add_game(mint, owner=owner.pubkey())
+    validator_kps = [Keypair() for _ in range(validators)]
+    for kp in validator_kps:
+        chain.fund(kp.pubkey(), 10 * 10 ** 9)
+        chain.add_validator(mint, kp.pubkey())
+    for i in range(players):
+        chain.add_player(game, f"{player_prefix}{i}")
+    mint_authority, _ = pdas.mint_authority_pda(chain.program_id)
+    return {
+        "mint": mint,
+        "game": game,
+        "mint_authority": mint_authority,
+        "owner": owner,
+        "validators": validator_kps,
+    }
+
+
+async def _serve_forever(args):
+    chain = FakeChain(latency_s=args.latency_ms / 1000, jitter_s=args.jitter_ms / 1000,
+                      failure_rate=args.failure_rate, seed=args.seed)
+    world = seed_world(chain, players=args.players, validators=args.validators)
+    server = await FakeRpcServer(chain, port=args.port, ws=args.ws).start()
+    print(f"[INFO] Fake RPC on {server.url}" + (f", pubsub on {server.ws_url}" if args.ws else ""))
+    print(f"[INFO] game_pda={world['game']}")
+    print(f"[INFO] minted_mint_pda={world['mint']}")
+    print(f"[INFO] mint_auth_pda={world['mint_authority']}")
+    try:
+        while True:
+            await asyncio.sleep(60)
+            print(f"[INFO] {chain.stats()}")
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake fancoin JSON-RPC node on localhost.")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--validators", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ws", action="store_true", help="Also serve programSubscribe / accountSubscribe on port+1.")
+    asyncio.run(_serve_forever(parser.parse_args()))
@@ -0,0 +1,298 @@
+"""
+Live PlayerPda change feed.
+
+    feed = PlayerFeed(client, program_id, ws_url=ws_url_for(endpoint))
+    feed.listen(on_change)            # on_change(PlayerChange) for every applied diff
+    await feed.start()                # initial scan, then follows the chain in the background
+    ...
+    await feed.stop()
+
+The index (`feed.records`: PlayerPda address -> PlayerPdaRecord, and
+`feed.by_name`) is loaded with one filtered getProgramAccounts, then kept
+current from diffs instead of rescans:
+
+  - websocket: programSubscribe with the PlayerPda discriminator + dataSize
+    filters (base64). Every notification is decoded and compared with the
+    record it replaces. Extra accounts (e.g. Game PDAs) can be followed
+    with watch_account(), over accountSubscribe.
+  - fallback, when the websockets package is missing, the socket can't be
+    opened or it drops: getSlot every `poll_s`, and when the slot moved the
+    same filtered getProgramAccounts, diffed against the index. The
+    websocket is retried every `reconnect_s`; each (re)subscribe is
+    followed by one reconciling scan so nothing between the two is lost.
+
+Listeners run on the event loop, in registration order; an exception in
+one is logged and does not stop the feed.
+"""
+import asyncio
+import base64
+import json
+import time
+import traceback
+from urllib.parse import urlsplit, urlunsplit
+
+from solders.pubkey import Pubkey
+
+from fancoin import query
+from fancoin.decoder import DecodeError, decode_player_pda
+
+POLL_S = 0.4  # one slot
+RECONNECT_S = 10.0
+COMMITMENT = "confirmed"
+
+REGISTERED = "registered"
+MINTED = "minted"
+CLAIM_REQUESTED = "claim_requested"
+CLAIMED = "claimed"
+UPDATED = "updated"
+REMOVED = "removed"
+
+
+def ws_url_for(endpoint: str) -> str:
+    """http://host:8899 -> ws://host:8900 (the validator's default pubsub port), https -> wss."""
+    parts = urlsplit(endpoint)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    netloc = parts.netloc
+    if parts.port is not None:
+        netloc = f"{parts.hostname}:{parts.port + 1}"
+    return urlunsplit((scheme, netloc, parts.path, parts.query, parts.fragment))
+
+
+class PlayerChange:
+    __slots__ = ("pubkey", "old", "new", "slot", "kinds")
+
+    def __init__(self, pubkey: Pubkey, old, new, slot: int, kinds: frozenset):
+        self.pubkey = pubkey
+        self.old = old   # PlayerPdaRecord before (None for a new registration)
+        self.new = new   # PlayerPdaRecord after (None when the account went away)
+        self.slot = slot
+        self.kinds = kinds
+
+    def __repr__(self):
+        name = (self.new or self.old).name
+        return f"PlayerChange({name!r}, {sorted(self.kinds)}, slot={self.slot})"
+
+
+def change_kinds(old, new) -> frozenset:
+    """What a PlayerPda diff means to the consumers."""
+    if old is None:
+        return frozenset((REGISTERED,))
+    if new is None:
+        return frozenset((REMOVED,))
+    kinds = set()
+    if new.last_minted != old.last_minted:
+        kinds.add(MINTED)
+    if new.pending_claim_ts != old.pending_claim_ts or new.pending_paid != old.pending_paid:
+        if new.pending_claim_ts is not None or new.pending_paid:
+            kinds.add(CLAIM_REQUESTED)
+    if new.last_claim_ts != old.last_claim_ts:
+        kinds.add(CLAIMED)
+    return frozenset(kinds or (UPDATED,))
+
+
+class PlayerFeed:
+    def __init__(self, client, program_id: Pubkey, ws_url: str = None, poll_s: float = POLL_S,
+                 reconnect_s: float = RECONNECT_S):
+        self.client = client
+        self.program_id = program_id
+        self.ws_url = ws_url
+        self.poll_s = poll_s
+        self.reconnect_s = reconnect_s
+        self.records = {}   # PlayerPda address -> PlayerPdaRecord
+        self.by_name = {}   # name -> PlayerPda address
+        self.mode = None    # "websocket" | "polling"
+        self.slot = 0       # highest slot applied
+        self.stats = {"scans": 0, "notifications": 0, "changes": 0, "reconnects": 0}
+        self._raw = {}      # address -> raw bytes (cheap "did it change" check)
+        self._slot_of = {}  # address -> slot of the data held
+        self._listeners = []
+        self._watched = {}  # address -> callback(pubkey, raw bytes or None, slot)
+        self._task = None
+        self._ready = None
+
+    # ----------------------------------------------------------------
+    # Consumers
+    # ----------------------------------------------------------------
+    def listen(self, callback):
+        """callback(PlayerChange), called on the event loop for every applied diff."""
+        self._listeners.append(callback)
+        return callback
+
+    def watch_account(self, pubkey: Pubkey, callback):
+        """callback(pubkey, raw_bytes_or_None, slot) on every change of one account (accountSubscribe)."""
+        self._watched[pubkey] = callback
+
+    async def snapshot(self) -> list:
+        """[(pubkey, PlayerPdaRecord)] from memory; same shape as player_table.scan_player_records()."""
+        return list(self.records.items())
+
+    def _emit(self, change: PlayerChange):
+        self.stats["changes"] += 1
+        for callback in self._listeners:
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"[WARN] PlayerFeed listener {getattr(callback, '__name__', callback)} failed => {e}")
+                traceback.print_exc()
+
+    # ----------------------------------------------------------------
+    # Diffs
+    # ----------------------------------------------------------------
+    def apply(self, pubkey: Pubkey, data, slot: int):
+        """Apply one account state (raw bytes, or None if gone) seen at `slot`."""
+        if slot < self._slot_of.get(pubkey, 0):
+            return None  # older than what we hold
+        self._slot_of[pubkey] = slot
+        self.slot = max(self.slot, slot)
+        old = self.records.get(pubkey)
+        if data is None or len(data) == 0:
+            if old is None:
+                return None
+            del self.records[pubkey]
+            self._raw.pop(pubkey, None)
+            if self.by_name.get(old.name) == pubkey:
+                del self.by_name[old.name]
+            change = PlayerChange(pubkey, old, None, slot, change_kinds(old, None))
+        else:
+            data = bytes(data)
+            if self._raw.get(pubkey) == data:
+                return None
+            try:
+                new = decode_player_pda(data)
+            except DecodeError:
+                return None
+            self._raw[pubkey] = data
+            self.records[pubkey] = new
+            if old is not None and old.name != new.name and self.by_name.get(old.name) == pubkey:
+                del self.by_name[old.name]
+            self.by_name[new.name] = pubkey
+            change = PlayerChange(pubkey, old, new, slot, change_kinds(old, new))
+        self._emit(change)
+        return change
+
+    async def scan(self) -> int:
+        """Filtered getProgramAccounts, diffed against the index. Returns the number of changes."""
+        slot = (await self.client.get_slot()).value
+        raw = await query.fetch_raw_accounts(self.client, self.program_id, query.PLAYER_PDA_STR)
+        self.stats["scans"] += 1
+        before = self.stats["changes"]
+        seen = set()
+        for pubkey, data in raw:
+            seen.add(pubkey)
+            self.apply(pubkey, data, slot)
+        for pubkey in [k for k in self.records if k not in seen]:
+            self.apply(pubkey, None, slot)
+        for pubkey, callback in self._watched.items():
+            resp = await self.client.get_account_info(pubkey)
+            callback(pubkey, None if resp.value is None else bytes(resp.value.data), slot)
+        return self.stats["changes"] - before
+
+    # ----------------------------------------------------------------
+    # Lifecycle
+    # ----------------------------------------------------------------
+    async def start(self):
+        """Initial scan, then follow the chain in a background task."""
+        await self.scan()
+        print(f"[INFO] PlayerFeed: {len(self.records)} PlayerPda records at slot {self.slot}.")
+        self._ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.ensure_future(self._run())
+        await self._ready
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _set_mode(self, mode: str):
+        if mode != self.mode:
+            print(f"[INFO] PlayerFeed: {mode}.")
+        self.mode = mode
+        if self._ready is not None and not self._ready.done():
+            self._ready.set_result(mode)
+
+    async def _run(self):
+        while True:
+            if self.ws_url:
+                try:
+                    await self._follow_websocket()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if self.mode != "polling":  # don't repeat it every reconnect attempt
+                        print(f"[WARN] PlayerFeed websocket {self.ws_url} => {type(e).__name__}: {e}; polling.")
+                self.stats["reconnects"] += 1
+            deadline = time.monotonic() + (self.reconnect_s if self.ws_url else float("inf"))
+            await self._poll_until(deadline)
+
+    async def _poll_until(self, deadline: float):
+        self._set_mode("polling")
+        last_slot = self.slot
+        while time.monotonic() < deadline:
+            try:
+                slot = (await self.client.get_slot()).value
+                if slot != last_slot:
+                    await self.scan()
+                    last_slot = slot
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[WARN] PlayerFeed poll failed => {e}")
+            await asyncio.sleep(self.poll_s)
+
+    async def _follow_websocket(self):
+        import websockets  # optional; without it the feed polls
+
+        async with websockets.connect(self.ws_url, max_size=None, ping_interval=20) as ws:
+            requests = {1: ("program", None)}
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0", "id": 1, "method": "programSubscribe",
+                "params": [str(self.program_id), {
+                    "encoding": "base64", "commitment": COMMITMENT,
+                    "filters": query.json_filters(query.PLAYER_PDA_STR),
+                }],
+            }))
+            for i, pubkey in enumerate(self._watched, start=2):
+                requests[i] = ("account", pubkey)
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0", "id": i, "method": "accountSubscribe",
+                    "params": [str(pubkey), {"encoding": "base64", "commitment": COMMITMENT}],
+                }))
+
+            subscriptions = {}  # subscription id -> ("program", None) | ("account", pubkey)
+            async for message in ws:
+                msg = json.loads(message)
+                if "id" in msg:
+                    if "error" in msg:
+                        raise RuntimeError(f"subscribe failed: {msg['error']}")
+                    subscriptions[msg["result"]] = requests[msg["id"]]
+                    if len(subscriptions) == len(requests):
+                        self._set_mode("websocket")
+                        await self.scan()  # reconcile what changed before the subscriptions were live
+                    continue
+                params = msg.get("params") or {}
+                kind = subscriptions.get(params.get("subscription"))
+                if kind is None:
+                    continue
+                self.stats["notifications"] += 1
+                result = params["result"]
+                slot = result["context"]["slot"]
+                if kind[0] == "program":
+                    value = result["value"]
+                    self.apply(Pubkey.from_string(value["pubkey"]), _account_data(value["account"]), slot)
+                else:
+                    self._watched[kind[1]](kind[1], _account_data(result["value"]), slot)
+
+
+def _account_data(account: dict):
+    """Raw bytes of a base64 account JSON object (None for a closed account)."""
+    if account is None:
+        return None
+    data = account.get("data")
+    if isinstance(data, list):
+        return base64.b64decode(data[0])
+    return None
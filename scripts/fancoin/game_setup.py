@@ -0,0 +1,171 @@
+"""
+Game owner helpers: initialize_game_and_mint, validator registration and
+the *_pda.txt files the numbered scripts read.
+
+This is the setup half of 3_val1_init.py / 4_val2_init.py as importable
+coroutines. Accounts follow InitializeGameAndMint / RegisterValidatorCurated
+/ RegisterValidatorPda in programs/fancoin/src/lib.rs.
+"""
+from pathlib import Path
+
+from solders.instruction import AccountMeta
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.system_program import ID as SYS_PROGRAM_ID
+
+from fancoin import pdas
+from fancoin.decoder import decode_game
+from fancoin.identity import ValidatorIdentity
+from fancoin.minting import RENT_SYSVAR
+from fancoin.runtime import PDA_FILES, lazy_import
+
+anchorpy = lazy_import("anchorpy")
+
+# 3_val1_init.py defaults
+DEFAULT_GAME_ARGS = {
+    "description": "Test Game",
+    "socials": "www.website.com",
+    "commission_percent": 36,
+    "coin_issuance_rate": 2_833_333,
+    "validator_claim_rate": 28_570,
+    "curated_val": True,
+    "initial_commission_tokens": int(21000000000000 * 2.83333),
+}
+
+
+def game_addresses(owner: Pubkey, program_id: Pubkey = pdas.PROGRAM_ID) -> dict:
+    """{mint, game, mint_authority, commission_ata} for the game `owner` creates."""
+    mint, _ = pdas.game_mint_pda(owner, program_id)
+    return {
+        "mint": mint,
+        "game": pdas.game_pda(mint, program_id)[0],
+        "mint_authority": pdas.mint_authority_pda(program_id)[0],
+        "commission_ata": pdas.associated_token_address(owner, mint),
+    }
+
+
+def write_pda_files(addresses: dict, directory=".") -> list:
+    """game_pda.txt / mint_auth_pda.txt / minted_mint_pda.txt, as 3_val1_init.py writes them."""
+    written = []
+    for key, filename in PDA_FILES.items():
+        path = Path(directory) / filename
+        path.write_text(str(addresses[key]))
+        written.append(path)
+    return written
+
+
+async def initialize_game_and_mint(program, owner_kp: Keypair, **game_args) -> dict:
+    """
+    Game + mint in one TX unless the Game already exists. Returns
+    game_addresses(owner) plus `created` and the TX signature (if sent).
+    """
+    args = {**DEFAULT_GAME_ARGS, **game_args}
+    owner = owner_kp.pubkey()
+    addresses = game_addresses(owner, program.program_id)
+    resp = await program.provider.connection.get_account_info(addresses["game"])
+    if resp.value is not None:
+        print(f"[INFO] Game PDA {addresses['game']} already initialized. Skipping.")
+        return {**addresses, "created": False, "tx": None}
+
+    tx_sig = await program.rpc["initialize_game_and_mint"](
+        args["description"],
+        args["socials"],
+        args["commission_percent"],
+        args["coin_issuance_rate"],
+        args["validator_claim_rate"],
+        bool(args["curated_val"]),
+        args["initial_commission_tokens"],
+        ctx=anchorpy.Context(
+            accounts={
+                "game": addresses["game"],
+                "mint_authority": addresses["mint_authority"],
+                "mint_for_game": addresses["mint"],
+                "user": owner,
+                "commission_ata": addresses["commission_ata"],
+                "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+                "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+                "system_program": SYS_PROGRAM_ID,
+                "rent": RENT_SYSVAR,
+            },
+            signers=[owner_kp],
+        ),
+    )
+    print(f"[SUCCESS] initialize_game_and_mint => game {addresses['game']}, mint {addresses['mint']}. Tx: {tx_sig}")
+    return {**addresses, "created": True, "tx": tx_sig}
+
+
+async def register_validator_curated(program, game_pda, mint, owner_kp: Keypair, ident: ValidatorIdentity):
+    """Owner-signed registration of `ident` on a curated game (owner pays for the PDA + ATA)."""
+    tx_sig = await program.rpc["register_validator_curated"](
+        mint,
+        ident.pubkey,
+        ctx=anchorpy.Context(
+            accounts={
+                "game": game_pda,
+                "owner": owner_kp.pubkey(),
+                "validator_pda": ident.validator_pda,
+                "fancy_mint": mint,
+                "new_validator": ident.pubkey,
+                "validator_ata": ident.ata,
+                "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+                "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+                "system_program": SYS_PROGRAM_ID,
+            },
+            signers=[owner_kp],
+        ),
+    )
+    print(f"[SUCCESS] {ident.label}: curated validator registered => {ident.validator_pda}. Tx: {tx_sig}")
+    return tx_sig
+
+
+async def register_validator_open(program, game_pda, mint, ident: ValidatorIdentity):
+    """
+    Self-signed register_validator_pda on a non-curated game; leftover[0]
+    is the validator's (registered) wallet_pda.
+    """
+    tx_sig = await program.rpc["register_validator_pda"](
+        mint,
+        ctx=anchorpy.Context(
+            accounts={
+                "game": game_pda,
+                "fancy_mint": mint,
+                "validator_pda": ident.validator_pda,
+                "user": ident.pubkey,
+                "validator_ata": ident.ata,
+                "gateway_token": ident.gateway_token or ident.pubkey,
+                "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+                "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+                "system_program": SYS_PROGRAM_ID,
+                "rent": RENT_SYSVAR,
+            },
+            signers=[ident.keypair],
+            remaining_accounts=[
+                AccountMeta(pubkey=pdas.wallet_pda(mint, ident.pubkey, program.program_id)[0], is_signer=False,
+                            is_writable=True),
+            ],
+        ),
+    )
+    print(f"[SUCCESS] {ident.label}: validator registered => {ident.validator_pda}. Tx: {tx_sig}")
+    return tx_sig
+
+
+async def ensure_validator(program, game_pda, mint, ident: ValidatorIdentity, owner_kp: Keypair = None) -> bool:
+    """
+    Register `ident` unless its ValidatorPda exists: curated games need the
+    owner's signature, open ones the validator's own (see lib.rs gating).
+    Returns True if the PDA was created by this call.
+    """
+    resp = await program.provider.connection.get_account_info(ident.validator_pda)
+    if resp.value is not None:
+        print(f"[INFO] {ident.label}: validator_pda {ident.validator_pda} already exists.")
+        return False
+    game_resp = await program.provider.connection.get_account_info(game_pda)
+    if game_resp.value is None:
+        raise RuntimeError(f"Game account {game_pda} not found")
+    if decode_game(bytes(game_resp.value.data)).curated_val:
+        if owner_kp is None:
+            raise ValueError(f"{ident.label}: game is curated; the owner keypair must register validators")
+        await register_validator_curated(program, game_pda, mint, owner_kp, ident)
+    else:
+        await register_validator_open(program, game_pda, mint, ident)
+    return True
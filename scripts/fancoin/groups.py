@@ -0,0 +1,249 @@
+"""
+Client-side copy of submit_minting_list's failover check (programs/fancoin/src/lib.rs).
+
+    total_groups  = (validator_count + 3) / 4
+    tolerance     = digits of total_groups                          calculate_failover_tolerance
+    group(v)      = u64_be(keccak256(v || last_seed_le)[:8]) % total_groups   calculate_group_id_mod
+
+After the submitting validator is appended to a player's partial_validators
+(if missing), the player needs 2 partials (1 with a single active validator),
+and every partial must be within `tolerance` groups of the first one,
+cyclically. Otherwise the program logs "Failover => remain" and keeps the
+list. partial_validators is only cleared by a finalised mint, so a player
+in that state wastes every submit until a punch_in draws a new seed.
+
+    state = await fetch_minting_state(client, game_pda, player_pdas)   # one batched read
+    predictor = GroupPredictor(state.game)
+    predictor.predict(validator, state.players[pda].partial_validators)  # FINALIZE / PARTIAL / FAILOVER / NO_SEED
+
+python -m fancoin.groups checks the Keccak-256 vectors below and the group
+vectors in programs/fancoin/tests/group_vectors.json, which the program's
+own `cargo test group_vectors` produces and asserts.
+"""
+import json
+import struct
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+from solders.pubkey import Pubkey
+
+from fancoin import query
+from fancoin.decoder import DecodeError, decode_game, decode_player_pda
+
+try:
+    from Crypto.Hash import keccak as _crypto_keccak  # pycryptodome, if installed
+except ImportError:
+    _crypto_keccak = None
+
+FINALIZE = "finalize"   # passes the group check; the 1..34 minute gate decides the payout
+PARTIAL = "partial"     # records this validator's approval, not enough partials yet
+FAILOVER = "failover"   # "Failover => remain": can't finalise under this seed
+NO_SEED = "no_seed"     # Game.last_seed is None => every player is skipped
+
+_SUBMIT_ORDER = {FINALIZE: 0, PARTIAL: 1}
+
+
+# --------------------------------------------------------------------
+# Keccak-256 (the pre-NIST padding used by the sha3 crate's Keccak256)
+# --------------------------------------------------------------------
+_RATE = 136
+_MASK = (1 << 64) - 1
+
+
+def _round_constants() -> list:
+    lfsr = 1
+    constants = []
+    for _ in range(24):
+        rc = 0
+        for j in range(7):
+            if lfsr & 1:
+                rc |= 1 << ((1 << j) - 1)
+            lfsr = ((lfsr << 1) ^ 0x171) if lfsr & 0x80 else lfsr << 1
+        constants.append(rc)
+    return constants
+
+
+def _rho_pi() -> list:
+    """[(source lane, destination lane, rotation)] for the combined rho + pi step."""
+    steps = [(0, 0, 0)]
+    x, y = 1, 0
+    for t in range(24):
+        steps.append((x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5), ((t + 1) * (t + 2) // 2) % 64))
+        x, y = y, (2 * x + 3 * y) % 5
+    return steps
+
+
+_RC = _round_constants()
+_RHO_PI = _rho_pi()
+
+
+def _keccak_f(a: list) -> list:
+    for rc in _RC:
+        c = [a[x] ^ a[x + 5] ^ a[x + 10] ^ a[x + 15] ^ a[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & _MASK) for x in range(5)]
+        a = [a[i] ^ d[i % 5] for i in range(25)]
+        b = [0] * 25
+        for src, dst, rot in _RHO_PI:
+            b[dst] = ((a[src] << rot) | (a[src] >> (64 - rot))) & _MASK if rot else a[src]
+        a = [b[i] ^ (~b[i - i % 5 + (i + 1) % 5] & b[i - i % 5 + (i + 2) % 5]) for i in range(25)]
+        a[0] ^= rc
+    return a
+
+
+def _keccak256_py(data: bytes) -> bytes:
+    padded = bytearray(data) + b"\x01" + bytes(-(len(data) + 1) % _RATE)
+    padded[-1] |= 0x80
+    state = [0] * 25
+    for off in range(0, len(padded), _RATE):
+        lanes = struct.unpack_from("<17Q", padded, off)
+        state = _keccak_f([s ^ lanes[i] if i < 17 else s for i, s in enumerate(state)])
+    return struct.pack("<4Q", *state[:4])
+
+
+def keccak256(data: bytes) -> bytes:
+    if _crypto_keccak is not None:
+        return _crypto_keccak.new(digest_bits=256, data=data).digest()
+    return _keccak256_py(data)
+
+
+# --------------------------------------------------------------------
+# lib.rs group math
+# --------------------------------------------------------------------
+def total_groups(validator_count: int) -> int:
+    return (validator_count + 3) // 4
+
+
+def failover_tolerance(validator_count: int) -> int:
+    """calculate_failover_tolerance: number of decimal digits of (validator_count + 3) / 4."""
+    return len(str(total_groups(validator_count)))
+
+
+def group_id(address, seed: int, groups: int) -> int:
+    """calculate_group_id_mod(address, seed, total_groups)."""
+    digest = keccak256(bytes(address) + struct.pack("<Q", seed))
+    return int.from_bytes(digest[:8], "big") % groups if groups > 0 else 0
+
+
+def group_distance(a: int, b: int, groups: int) -> int:
+    direct = abs(a - b)
+    return min(direct, groups - direct)
+
+
+class GroupPredictor:
+    """submit_minting_list's per-player outcome for one Game state (seed + validator counts)."""
+
+    def __init__(self, game):
+        self.seed = game.last_seed
+        self.validator_count = game.validator_count
+        self.active_validator_count = game.active_validator_count
+        self.groups = total_groups(game.validator_count)
+        self.tolerance = failover_tolerance(game.validator_count)
+        self._gid = {}  # validator -> group under self.seed
+
+    def group(self, validator) -> int:
+        gid = self._gid.get(validator)
+        if gid is None:
+            gid = self._gid[validator] = group_id(validator, self.seed, self.groups)
+        return gid
+
+    def predict(self, validator, partial_validators) -> str:
+        if self.seed is None:
+            return NO_SEED
+        partials = list(partial_validators)
+        if validator not in partials:
+            partials.append(validator)
+        if len(partials) < (2 if self.active_validator_count > 1 else 1):
+            return PARTIAL
+        first = self.group(partials[0])
+        for other in partials[1:]:
+            if group_distance(self.group(other), first, self.groups) > self.tolerance:
+                return FAILOVER
+        return FINALIZE
+
+    def order(self, validator, names, partials_of) -> tuple:
+        """
+        (names to submit, finalising first; {outcome: count}) for one validator.
+        `partials_of(name)` gives the player's current partial_validators.
+        FAILOVER / NO_SEED players are dropped: the program would only rewrite them.
+        """
+        outcomes = {name: self.predict(validator, partials_of(name)) for name in names}
+        counts = {}
+        for outcome in outcomes.values():
+            counts[outcome] = counts.get(outcome, 0) + 1
+        keep = [n for n in names if outcomes[n] in _SUBMIT_ORDER]
+        keep.sort(key=lambda n: _SUBMIT_ORDER[outcomes[n]])
+        return keep, counts
+
+
+# --------------------------------------------------------------------
+# Batched read
+# --------------------------------------------------------------------
+class MintingState(NamedTuple):
+    game: object    # GameRecord
+    players: dict   # PlayerPda address -> PlayerPdaRecord (missing / undecodable accounts left out)
+
+
+async def fetch_minting_state(client, game_pda, player_pdas) -> MintingState:
+    """Game + every given PlayerPda in one batched getMultipleAccounts, so the prediction sees fresh partials."""
+    player_pdas = list(player_pdas)
+    raw = await query.fetch_multiple_accounts(client, [game_pda] + player_pdas)
+    if raw[0] is None:
+        raise RuntimeError(f"Game account {game_pda} not found")
+    players = {}
+    for pubkey, data in zip(player_pdas, raw[1:]):
+        if data is not None:
+            try:
+                players[pubkey] = decode_player_pda(data)
+            except DecodeError:
+                pass
+    return MintingState(decode_game(raw[0]), players)
+
+
+# --------------------------------------------------------------------
+# Vectors
+# --------------------------------------------------------------------
+# published Keccak-256 values (not NIST SHA3-256, which pads differently)
+KECCAK_VECTORS = [
+    (b"", "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"),
+    (b"abc", "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45"),
+    (b"a" * 200, "96ea54061def936c4be90b518992fdc6f12f535068a256229aca54267b4d084d"),  # > one 136-byte block
+]
+
+# Written / checked by group_vector_tests in programs/fancoin/src/lib.rs
+GROUP_VECTORS_PATH = Path(__file__).resolve().parents[2] / "programs" / "fancoin" / "tests" / "group_vectors.json"
+
+
+def load_group_vectors(path=GROUP_VECTORS_PATH) -> dict:
+    """{"group_id": [{address, seed, validator_count, raw, group}], "failover_tolerance": [{validator_count, tolerance}]}"""
+    return json.loads(Path(path).read_text())
+
+
+def self_check() -> bool:
+    ok = True
+    for data, want in KECCAK_VECTORS:
+        for impl in (_keccak256_py, keccak256):
+            if impl(data).hex() != want:
+                print(f"[ERROR] {impl.__name__}({data[:8]!r}...) => {impl(data).hex()} != {want}")
+                ok = False
+    vectors = load_group_vectors()
+    for case in vectors["group_id"]:
+        address, seed, count = Pubkey.from_string(case["address"]), case["seed"], case["validator_count"]
+        raw, want = case["raw"], case["group"]
+        got_raw = int.from_bytes(keccak256(bytes(address) + struct.pack("<Q", seed))[:8], "big")
+        got = group_id(address, seed, total_groups(count))
+        if (got_raw, got) != (raw, want):
+            print(f"[ERROR] group_id({address}, {seed}, {total_groups(count)}) => {got_raw} % => {got} != {want}")
+            ok = False
+    for case in vectors["failover_tolerance"]:
+        count, want = case["validator_count"], case["tolerance"]
+        if failover_tolerance(count) != want:
+            print(f"[ERROR] failover_tolerance({count}) => {failover_tolerance(count)} != {want}")
+            ok = False
+    print(f"[{'SUCCESS' if ok else 'ERROR'}] keccak ({'pycryptodome' if _crypto_keccak else 'pure Python'}), "
+          f"group and tolerance vectors {'match' if ok else 'differ'}.")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if self_check() else 1)
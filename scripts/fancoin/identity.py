@@ -0,0 +1,115 @@
+"""
+Validator identities: a keypair plus every per-validator address the
+instructions need, derived once. Also the player key files 2_scraper2.py
+writes, so key handling needs nothing heavier than solders.
+"""
+import json
+import os
+from pathlib import Path
+
+from solders.keypair import Keypair
+
+from fancoin import pdas
+
+
+def load_keypair(path) -> Keypair:
+    """Raw 64-byte secret in a JSON array, e.g. [12,34,56,...]."""
+    with Path(path).open() as f:
+        secret = json.load(f)
+    return Keypair.from_bytes(bytes(secret[0:64]))
+
+
+def fleet_keypair_files(directory=".") -> list:
+    """val1-keypair.json, val2-keypair.json, ... in name order."""
+    return sorted(str(p) for p in Path(directory).glob("val*-keypair.json"))
+
+
+class ValidatorIdentity:
+    def __init__(self, keypair: Keypair, mint, program_id=pdas.PROGRAM_ID, gatekeeper_network=None, label=None,
+                 validator_pda=None, ata=None):
+        """`validator_pda` / `ata` skip the derivation when already known (see fancoin.deployment)."""
+        self.keypair = keypair
+        self.pubkey = keypair.pubkey()
+        self.label = label or str(self.pubkey)[:8]
+        self.validator_pda = validator_pda or pdas.validator_pda(mint, self.pubkey, program_id)[0]
+        self.ata = ata or pdas.associated_token_address(self.pubkey, mint)
+        self.gateway_token = (
+            None if gatekeeper_network is None
+            else pdas.gateway_token_address(self.pubkey, gatekeeper_network)
+        )
+
+    @classmethod
+    def from_file(cls, path, mint, program_id=pdas.PROGRAM_ID, gatekeeper_network=None) -> "ValidatorIdentity":
+        label = Path(path).stem.replace("-keypair", "")
+        return cls(load_keypair(path), mint, program_id, gatekeeper_network, label)
+
+    def __repr__(self):
+        return f"ValidatorIdentity({self.label}, {self.pubkey})"
+
+
+def load_fleet(paths, mint, program_id=pdas.PROGRAM_ID, gatekeeper_network=None) -> list:
+    return [ValidatorIdentity.from_file(p, mint, program_id, gatekeeper_network) for p in paths]
+
+
+# --------------------------------------------------------------------
+# Player key files (2_scraper2.py format)
+# --------------------------------------------------------------------
+def new_player_record() -> dict:
+    """Two fresh keypairs as hex secrets + addresses."""
+    record = {}
+    for prefix in ("player_authority", "player_info_acc"):
+        kp = Keypair()
+        record[f"{prefix}_private_key"] = bytes(kp)[:32].hex()
+        record[f"{prefix}_address"] = str(kp.pubkey())
+    return record
+
+
+def keypair_from_record(record: dict) -> Keypair:
+    """player_authority_private_key: 32-byte seed or 64-byte secret, hex."""
+    secret = bytes.fromhex(record["player_authority_private_key"])
+    if len(secret) == 32:
+        return Keypair.from_seed(secret)
+    if len(secret) == 64:
+        return Keypair.from_bytes(secret)
+    raise ValueError(f"Invalid 'player_authority_private_key' length: {len(secret)} bytes")
+
+
+def save_player_record(folder, name: str, record: dict) -> Path:
+    os.makedirs(folder, exist_ok=True)
+    path = Path(folder) / f"{name}.json"
+    path.write_text(json.dumps({"player_name": name, **record}, indent=4))
+    return path
+
+
+def load_player_records(folder) -> dict:
+    """{player_name: Keypair} for every <name>.json in folder."""
+    players = {}
+    for path in sorted(Path(folder).glob("*.json")):
+        record = json.loads(path.read_text())
+        players[record.get("player_name") or path.stem] = keypair_from_record(record)
+    return players
+
+
+def load_player_keys(folder, report=print) -> dict:
+    """
+    load_player_records() for hand-kept folders such as pubg_keys/: a file
+    without a usable name / key is skipped instead of failing the load, and
+    a player_authority_address that doesn't match the key is flagged.
+    Every problem goes to `report` as one "[WARN]/[ERROR] => ..." line.
+    """
+    keys = {}
+    for file_path in sorted(Path(folder).glob("*.json")):
+        try:
+            data = json.loads(file_path.read_text())
+            player_name = data.get("player_name")
+            if not player_name or not data.get("player_authority_private_key"):
+                report(f"[WARN] => {file_path}: missing 'player_name' or 'player_authority_private_key'. Skipping.")
+                continue
+            kp = keypair_from_record(data)
+            if data.get("player_authority_address") not in (None, str(kp.pubkey())):
+                report(f"[WARN] => {file_path}: player_authority_address {data['player_authority_address']} "
+                       f"!= derived {kp.pubkey()}; using the derived key.")
+            keys[player_name] = kp
+        except Exception as e:
+            report(f"[ERROR] => {file_path} => {e}")
+    return keys
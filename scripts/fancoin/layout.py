@@ -0,0 +1,209 @@
+"""
+Byte layouts of the fancoin #[account] structs.
+
+Mirrors the field order and `LEN` constants in programs/fancoin/src/lib.rs.
+Anchor stores each account as an 8-byte discriminator followed by the Borsh
+encoding of the struct, inside a buffer that was allocated with `LEN` bytes.
+Borsh has no padding, so a field only sits at a fixed offset when every field
+before it is fixed-size (no String, Vec or Option in front of it).
+"""
+import hashlib
+import struct
+
+ACCOUNT_DISCRIMINATOR_SIZE = 8
+
+# --------------------------------------------------------------------
+# Field kinds
+# --------------------------------------------------------------------
+BOOL = "bool"
+U16 = "u16"
+U32 = "u32"
+U64 = "u64"
+I64 = "i64"
+PUBKEY = "pubkey"
+STRING = "string"
+VEC_PUBKEY = "vec<pubkey>"
+OPT_U32 = "option<u32>"
+OPT_U64 = "option<u64>"
+OPT_I64 = "option<i64>"
+
+FIXED_SIZES = {
+    BOOL: 1,
+    U16: 2,
+    U32: 4,
+    U64: 8,
+    I64: 8,
+    PUBKEY: 32,
+}
+
+# struct format for the scalar kinds (and the payload of the Option kinds)
+SCALAR_FORMATS = {
+    BOOL: "<?",
+    U16: "<H",
+    U32: "<I",
+    U64: "<Q",
+    I64: "<q",
+    OPT_U32: "<I",
+    OPT_U64: "<Q",
+    OPT_I64: "<q",
+}
+
+# --------------------------------------------------------------------
+# Accounts: (field_name, kind, max_len)
+#   max_len is the byte / element budget that `LEN` reserves for a
+#   String or Vec field, and None for everything else.
+# --------------------------------------------------------------------
+ACCOUNT_FIELDS = {
+    "Game": (
+        ("player_count", U32, None),
+        ("validator_count", U32, None),
+        ("active_validator_count", U32, None),
+        ("last_reset_hour", OPT_U32, None),
+        ("description", STRING, 64),
+        ("socials", STRING, 64),
+        ("last_seed", OPT_U64, None),
+        ("last_punch_in_time", OPT_I64, None),
+        ("mint_pubkey", PUBKEY, None),
+        ("commission_ata", PUBKEY, None),
+        ("commission_percent", U16, None),
+        ("coin_issuance_rate", U64, None),
+        ("validator_claim_rate", U64, None),
+        ("curated_val", BOOL, None),
+        ("owner", PUBKEY, None),
+        ("claim_rate_lock", BOOL, None),
+        ("coin_issuance_rate_lock", BOOL, None),
+        ("commission_percent_lock", BOOL, None),
+        ("gatekeeper_network", PUBKEY, None),
+    ),
+    "PlayerPda": (
+        ("name", STRING, 32),
+        ("authority", PUBKEY, None),
+        ("reward_address", PUBKEY, None),
+        ("last_name_change", OPT_I64, None),
+        ("last_reward_change", OPT_I64, None),
+        ("partial_validators", VEC_PUBKEY, 4),
+        ("last_minted", OPT_I64, None),
+        ("pending_claim_ts", OPT_I64, None),
+        ("pending_game_time_ms", OPT_I64, None),
+        ("pending_paid", BOOL, None),
+        ("last_claim_ts", OPT_I64, None),
+    ),
+    "PlayerNamePda": (
+        ("name", STRING, 38),
+        ("player_pda", PUBKEY, None),
+        ("active", BOOL, None),
+    ),
+    "ValidatorPda": (
+        ("address", PUBKEY, None),
+        ("last_activity", I64, None),
+        ("last_minted", OPT_I64, None),
+        ("last_claimed", OPT_I64, None),
+    ),
+}
+
+# Allocated size (`LEN` in lib.rs) => used as the dataSize filter.
+ACCOUNT_LEN = {
+    "Game": 8 + 4 + 4 + 4 + 5 + (4 + 64) + (4 + 64) + 9 + 9 + 32 + 32 + 2 + 8 + 8 + 1 + 32 + 2 + 2 + 2,
+    "PlayerPda": 8 + (4 + 32) + 32 + 32 + 9 + 9 + 4 + (4 * 32) + 9 + 9 + 9 + 2 + 9,
+    "PlayerNamePda": 8 + (4 + 30 + 8) + 32 + 2,
+    "ValidatorPda": 8 + 32 + 8 + 9 + 9,
+}
+
+
+def account_discriminator(account_name: str) -> bytes:
+    """First 8 bytes of sha256("account:<Name>"), same as Anchor."""
+    return hashlib.sha256(f"account:{account_name}".encode()).digest()[:ACCOUNT_DISCRIMINATOR_SIZE]
+
+
+ACCOUNT_DISCRIMINATORS = {name: account_discriminator(name) for name in ACCOUNT_FIELDS}
+
+
+def instruction_discriminator(name: str) -> bytes:
+    """First 8 bytes of sha256("global:<snake_name>"), same as Anchor."""
+    return hashlib.sha256(f"global:{name}".encode()).digest()[:ACCOUNT_DISCRIMINATOR_SIZE]
+
+
+def _field_spec(account_name: str, field: str):
+    for spec in ACCOUNT_FIELDS[account_name]:
+        if spec[0] == field:
+            return spec
+    raise KeyError(f"{account_name} has no field '{field}'")
+
+
+def max_field_size(kind: str, max_len) -> int:
+    """Largest number of bytes a field can occupy inside the allocated account."""
+    if kind in FIXED_SIZES:
+        return FIXED_SIZES[kind]
+    if kind == STRING:
+        return 4 + max_len
+    if kind == VEC_PUBKEY:
+        return 4 + 32 * max_len
+    # Option<T> => 1 tag byte + payload
+    return 1 + struct.calcsize(SCALAR_FORMATS[kind])
+
+
+def static_offset(account_name: str, field: str):
+    """
+    Offset of `field` inside the raw account data (discriminator included),
+    or None if a variable-size field sits in front of it.
+    """
+    offset = ACCOUNT_DISCRIMINATOR_SIZE
+    for name, kind, _max_len in ACCOUNT_FIELDS[account_name]:
+        if name == field:
+            return offset
+        if kind not in FIXED_SIZES:
+            return None
+        offset += FIXED_SIZES[kind]
+    raise KeyError(f"{account_name} has no field '{field}'")
+
+
+def encode_field(account_name: str, field: str, value) -> bytes:
+    """Borsh-encode a Python value the way the program stores `field`."""
+    _name, kind, _max_len = _field_spec(account_name, field)
+    if kind == PUBKEY:
+        return bytes(value)
+    if kind == STRING:
+        raw = value.encode("utf-8")
+        return struct.pack("<I", len(raw)) + raw
+    if kind == VEC_PUBKEY:
+        return struct.pack("<I", len(value)) + b"".join(bytes(v) for v in value)
+    if kind.startswith("option<"):
+        if value is None:
+            return b"\x00"
+        return b"\x01" + struct.pack(SCALAR_FORMATS[kind], value)
+    return struct.pack(SCALAR_FORMATS[kind], value)
+
+
+def field_offsets(account_name: str, data: bytes) -> dict:
+    """
+    Walk one raw account and return {field: (offset, size)} for every field.
+    Only lengths and Option tags are read, nothing is decoded.
+    """
+    offsets = {}
+    pos = ACCOUNT_DISCRIMINATOR_SIZE
+    for name, kind, _max_len in ACCOUNT_FIELDS[account_name]:
+        if kind in FIXED_SIZES:
+            size = FIXED_SIZES[kind]
+        elif kind == STRING:
+            size = 4 + int.from_bytes(data[pos:pos + 4], "little")
+        elif kind == VEC_PUBKEY:
+            size = 4 + 32 * int.from_bytes(data[pos:pos + 4], "little")
+        else:
+            size = 1 + (struct.calcsize(SCALAR_FORMATS[kind]) if data[pos] else 0)
+        offsets[name] = (pos, size)
+        pos += size
+    return offsets
+
+
+def encode_account(account_name: str, values: dict, pad: bool = True) -> bytes:
+    """
+    Serialize a whole account the way Anchor stores it: discriminator, Borsh
+    fields in declaration order, zero padding up to `LEN`.
+    """
+    parts = [ACCOUNT_DISCRIMINATORS[account_name]]
+    for name, _kind, _max_len in ACCOUNT_FIELDS[account_name]:
+        parts.append(encode_field(account_name, name, values[name]))
+    data = b"".join(parts)
+    if pad and len(data) < ACCOUNT_LEN[account_name]:
+        data += bytes(ACCOUNT_LEN[account_name] - len(data))
+    return data
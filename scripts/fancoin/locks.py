@@ -0,0 +1,146 @@
+"""
+Write-lock aware sending.
+
+Most fancoin instructions write the Game and the token mint (punch_in,
+submit_minting_list, register_player_pda, claim_validator_reward ...). The
+leader runs TXs that write the same account one after another, so a fleet
+firing them all at once queues behind itself on those accounts and the
+late ones expire. Here each TX's writable set is taken from the IDL's isMut
+flags (runtime.idl_summary) plus its writable remaining_accounts, and:
+
+  - at most `max_inflight` TXs that write the same account are in flight,
+  - TXs waiting on an account keep their order for that account: a later
+    TX sharing an account with an earlier waiting one never overtakes it,
+  - TXs whose accounts are all below the limit go straight away, so work
+    like ATA creation for other players fills the gaps,
+  - a TX is only built (blockhash fetched, signed) once it may go, so time
+    spent waiting here doesn't age its blockhash.
+
+    program = LockAwareProgram(program, LockScheduler(), idl_path)
+    await program.rpc["punch_in"](mint, ctx=...)     # same call as Program.rpc
+    await scheduler.run(writes, send)                # anything else (transfers ...)
+
+The fee payer is write-locked by every TX too, but is not counted: with one
+payer that would allow only `max_inflight` TXs in total.
+"""
+import asyncio
+import time
+from collections import Counter
+
+from fancoin.runtime import IDL_PATH, idl_summary
+
+MAX_INFLIGHT = 4  # TXs in flight per writable account
+
+
+def flat_accounts(accounts: dict) -> dict:
+    """anchorpy Context accounts with nested account groups flattened: {name: pubkey}."""
+    out = {}
+    for name, value in accounts.items():
+        if isinstance(value, dict):
+            out.update(flat_accounts(value))
+        else:
+            out[name] = value
+    return out
+
+
+def write_set(summary: dict, ix_name: str, accounts: dict, remaining_accounts=()) -> frozenset:
+    """Accounts `ix_name` writes: IDL isMut accounts + writable remaining_accounts."""
+    accounts = flat_accounts(accounts)
+    writes = {accounts[name] for name, is_mut, _ in summary["instructions"][ix_name]["accounts"]
+              if is_mut and name in accounts}
+    writes.update(meta.pubkey for meta in remaining_accounts if meta.is_writable)
+    return frozenset(writes)
+
+
+class LockScheduler:
+    def __init__(self, max_inflight: int = MAX_INFLIGHT, ignore=()):
+        self.max_inflight = max_inflight
+        self.ignore = frozenset(ignore)
+        self.inflight = Counter()  # account -> TXs in flight writing it
+        self.stats = {"sent": 0, "waited": 0, "wait_s": 0.0, "max_wait_s": 0.0}
+        self._waiting = []         # [(writes, future)] in arrival order
+
+    def _free(self, writes) -> bool:
+        return all(self.inflight[a] < self.max_inflight for a in writes)
+
+    def _acquire(self, writes):
+        for a in writes:
+            self.inflight[a] += 1
+
+    def _release(self, writes):
+        for a in writes:
+            self.inflight[a] -= 1
+            if not self.inflight[a]:
+                del self.inflight[a]
+
+    def _wake(self):
+        blocked = set()
+        for entry in list(self._waiting):
+            writes, future = entry
+            if future.done():
+                self._waiting.remove(entry)
+            elif writes & blocked or not self._free(writes):
+                blocked |= writes
+            else:
+                self._waiting.remove(entry)
+                self._acquire(writes)
+                future.set_result(None)
+
+    async def run(self, writes, send):
+        """await send() once no account in `writes` has `max_inflight` TXs in flight."""
+        writes = frozenset(writes) - self.ignore
+        queued = set().union(*(w for w, _ in self._waiting))
+        if writes & queued or not self._free(writes):
+            future = asyncio.get_running_loop().create_future()
+            self._waiting.append((writes, future))
+            start = time.monotonic()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release(writes)  # woken and cancelled in the same step
+                    self._wake()
+                raise
+            waited = time.monotonic() - start
+            self.stats["waited"] += 1
+            self.stats["wait_s"] += waited
+            self.stats["max_wait_s"] = max(self.stats["max_wait_s"], waited)
+        else:
+            self._acquire(writes)
+        try:
+            self.stats["sent"] += 1
+            return await send()
+        finally:
+            self._release(writes)
+            self._wake()
+
+
+class _LockedRpc:
+    def __init__(self, program: "LockAwareProgram"):
+        self._program = program
+
+    def __getitem__(self, name: str):
+        program = self._program
+        send_ix = program.program.rpc[name]
+
+        async def call(*args, ctx=None):
+            if ctx is None:
+                return await program.scheduler.run((), lambda: send_ix(*args))
+            writes = write_set(program.summary, name, ctx.accounts, ctx.remaining_accounts or ())
+            return await program.scheduler.run(writes, lambda: send_ix(*args, ctx=ctx))
+
+        return call
+
+
+class LockAwareProgram:
+    """anchorpy Program whose `.rpc[name](...)` goes through a LockScheduler; everything else is forwarded."""
+
+    def __init__(self, program, scheduler: LockScheduler, idl_path=IDL_PATH):
+        self.program = program
+        self.scheduler = scheduler
+        self.summary = idl_summary(idl_path)
+        scheduler.ignore |= {program.provider.wallet.public_key}  # fee payer, see the module docstring
+        self.rpc = _LockedRpc(self)
+
+    def __getattr__(self, name):
+        return getattr(self.program, name)
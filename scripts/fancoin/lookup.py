@@ -0,0 +1,168 @@
+"""
+Per-game Address Lookup Tables, so submit_minting_list can reference
+player accounts by a 1-byte index instead of a 32-byte key.
+
+    tables = GameLookupTables(client, payer, known=game.lookup_tables)
+    await tables.load()                                   # read the existing tables
+    await tables.sync(addresses)                          # extend with what's missing, wait out the warm-up
+    composer = TxComposer(program, lookup_tables=tables.accounts())   # v0 messages
+
+submit_minting_list takes two writable accounts per player (PlayerPda +
+reward ATA) on top of the commission ATA; as 32-byte keys in a legacy TX
+they fill the 1232 bytes after a few players (minting.CHUNK_SIZE). From a
+table they cost one index byte each, and the TX is then bounded by the
+account lock limit instead (minting.ALT_CHUNK_SIZE).
+
+  - a table holds up to 256 addresses; a new one is created (payer as
+    authority) when the last is full, and its address appended to
+    `known` (GameDeployment.lookup_tables, saved with deployment.json),
+  - extend TXs add up to EXTEND_BATCH addresses each,
+  - addresses added in slot N can only be looked up from slot N + 1, so
+    sync() waits for the next slot after extending.
+
+The lookup table program's instructions are encoded here (solders ships
+the account types, not the instruction builders).
+"""
+import asyncio
+import struct
+
+from solders.address_lookup_table_account import (
+    ID as LOOKUP_TABLE_PROGRAM_ID,
+    LOOKUP_TABLE_MAX_ADDRESSES,
+    AddressLookupTable,
+    AddressLookupTableAccount,
+    derive_lookup_table_address,
+)
+from solders.instruction import AccountMeta, Instruction
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.system_program import ID as SYS_PROGRAM_ID
+from solders.transaction import Transaction
+
+from fancoin.query import MULTIPLE_ACCOUNTS_MAX
+
+EXTEND_BATCH = 30     # addresses per extend TX (~1200 bytes as a legacy TX)
+WARMUP_POLL_S = 0.2
+
+_CREATE, _EXTEND = 0, 2  # ProgramInstruction variants (bincode u32 tags)
+
+
+# --------------------------------------------------------------------
+# Instructions
+# --------------------------------------------------------------------
+def create_lookup_table_ix(authority: Pubkey, payer: Pubkey, recent_slot: int) -> tuple:
+    """(Instruction, table address) for CreateLookupTable at `recent_slot`."""
+    table, bump = derive_lookup_table_address(authority, recent_slot)
+    data = struct.pack("<IQB", _CREATE, recent_slot, bump)
+    accounts = [
+        AccountMeta(table, is_signer=False, is_writable=True),
+        AccountMeta(authority, is_signer=True, is_writable=False),
+        AccountMeta(payer, is_signer=True, is_writable=True),
+        AccountMeta(SYS_PROGRAM_ID, is_signer=False, is_writable=False),
+    ]
+    return Instruction(LOOKUP_TABLE_PROGRAM_ID, data, accounts), table
+
+
+def extend_lookup_table_ix(table: Pubkey, authority: Pubkey, payer: Pubkey, addresses) -> Instruction:
+    addresses = list(addresses)
+    data = struct.pack("<IQ", _EXTEND, len(addresses)) + b"".join(bytes(a) for a in addresses)
+    accounts = [
+        AccountMeta(table, is_signer=False, is_writable=True),
+        AccountMeta(authority, is_signer=True, is_writable=False),
+        AccountMeta(payer, is_signer=True, is_writable=True),
+        AccountMeta(SYS_PROGRAM_ID, is_signer=False, is_writable=False),
+    ]
+    return Instruction(LOOKUP_TABLE_PROGRAM_ID, data, accounts)
+
+
+# --------------------------------------------------------------------
+# Tables
+# --------------------------------------------------------------------
+class GameLookupTables:
+    def __init__(self, client, payer: Keypair, known=None, on_new_table=None):
+        """
+        payer:         authority + rent payer of the tables this creates.
+        known:         list of table addresses already in use (extended in place).
+        on_new_table:  callback(table address) after a table is created, e.g. to save the deployment.
+        """
+        self.client = client
+        self.payer = payer
+        self.known = known if known is not None else []
+        self.on_new_table = on_new_table
+        self.tables = {}  # table address -> [address, ...] in table order
+        self._where = {}  # address -> table address
+        self.stats = {"created": 0, "extend_txs": 0, "added": 0}
+
+    def __contains__(self, address) -> bool:
+        return address in self._where
+
+    def accounts(self) -> list:
+        """AddressLookupTableAccount per table, for MessageV0.try_compile."""
+        return [AddressLookupTableAccount(key, addresses) for key, addresses in self.tables.items()]
+
+    def _add(self, table: Pubkey, addresses):
+        self.tables.setdefault(table, [])
+        for address in addresses:
+            self.tables[table].append(address)
+            self._where.setdefault(address, table)
+
+    async def load(self) -> "GameLookupTables":
+        """Read every known table; ones that are gone or not owned by the ALT program are dropped."""
+        for i in range(0, len(self.known), MULTIPLE_ACCOUNTS_MAX):
+            batch = self.known[i:i + MULTIPLE_ACCOUNTS_MAX]
+            resp = await self.client.get_multiple_accounts(batch)
+            for key, acct in zip(batch, resp.value):
+                if acct is None or acct.owner != LOOKUP_TABLE_PROGRAM_ID:
+                    print(f"[WARN] Lookup table {key} not found; dropping it.")
+                    continue
+                self._add(key, AddressLookupTable.deserialize(bytes(acct.data)).addresses)
+        self.known[:] = list(self.tables)
+        print(f"[INFO] {len(self.tables)} lookup tables, {len(self._where)} addresses.")
+        return self
+
+    async def _send(self, ixs):
+        blockhash = (await self.client.get_latest_blockhash()).value.blockhash
+        tx = Transaction([self.payer], Message(ixs, self.payer.pubkey()), blockhash)
+        sig = (await self.client.send_transaction(tx)).value
+        await self.client.confirm_transaction(sig)
+        return sig
+
+    async def _create(self) -> Pubkey:
+        slot = (await self.client.get_slot()).value
+        ix, table = create_lookup_table_ix(self.payer.pubkey(), self.payer.pubkey(), slot)
+        await self._send([ix])
+        self._add(table, ())
+        self.known.append(table)
+        self.stats["created"] += 1
+        print(f"[INFO] Created lookup table {table}.")
+        if self.on_new_table is not None:
+            self.on_new_table(table)
+        return table
+
+    async def sync(self, addresses) -> int:
+        """Extend the tables with every address not in them yet; returns how many were added."""
+        missing = list(dict.fromkeys(a for a in addresses if a not in self._where))
+        total = len(missing)
+        if not missing:
+            return 0
+        while missing:
+            table = next((t for t, a in self.tables.items() if len(a) < LOOKUP_TABLE_MAX_ADDRESSES), None)
+            if table is None:
+                table = await self._create()
+            room = LOOKUP_TABLE_MAX_ADDRESSES - len(self.tables[table])
+            take, missing = missing[:room], missing[room:]
+            for i in range(0, len(take), EXTEND_BATCH):
+                batch = take[i:i + EXTEND_BATCH]
+                await self._send([extend_lookup_table_ix(table, self.payer.pubkey(), self.payer.pubkey(), batch)])
+                self._add(table, batch)
+                self.stats["extend_txs"] += 1
+                self.stats["added"] += len(batch)
+        await self._warm_up()
+        return total
+
+    async def _warm_up(self):
+        """New entries are usable from the slot after the extension."""
+        extended = (await self.client.get_slot()).value
+        while (await self.client.get_slot()).value <= extended:
+            await asyncio.sleep(WARMUP_POLL_S)
@@ -0,0 +1,71 @@
+"""
+Which matched players go into this round's submit_minting_list chunks.
+
+submit_minting_list pays diff_minutes * coin_issuance_rate when
+1 <= diff_minutes <= 34 since the player's last_minted (None counts as 0);
+otherwise it only sets last_minted = now. Sending every matched player every
+round (30 s) mostly hits diff_minutes == 0 and restarts their clock for
+nothing. Per player, at the time the TX lands:
+
+  - pay:    1..34 minutes, but past 34 by the next round => send now,
+            highest payout first,
+  - arm:    never minted or > 34 minutes => send now to restart the clock
+            (after the payers: it pays nothing this time),
+  - wait:   1..34 minutes and still <= 34 at the next round => hold; sending
+            now would pay less and restart the clock,
+  - fresh:  < 1 minute => hold; a submit would reset it for nothing.
+
+The next round is `round_pause_s` away, or the next hour's mint open when the
+window closes first (schedule.next_mint_chance). A held player who leaves
+the servers before the next round is not paid for the time since the last
+mint; that is the price of sending each player about once per 34 minutes.
+
+Planning is a few vectorised expressions over PlayerTable.last_minted.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from fancoin.player_table import NONE_TS
+
+MIN_MINUTES = 1
+MAX_MINUTES = 34
+LANDING_S = 15  # from planning to the TX landing: the rest of the round + confirmation
+
+
+class MintPlan(NamedTuple):
+    pay: list       # names, highest expected payout first
+    arm: list
+    wait: list
+    fresh: list
+    payout: int     # expected base units minted for `pay` (before commission)
+    next_due: float  # earliest last_minted + 35 min among `wait` (None if nobody waits)
+
+    @property
+    def submit(self) -> list:
+        return self.pay + self.arm
+
+
+def plan_mint_window(table, names, now: float, next_chance: float, rate: int) -> MintPlan:
+    """Split `names` (PlayerTable rows) by what a submit at `now` would do, see the module docstring."""
+    rows = table.rows_for_names(names)
+    last = table.last_minted[rows]
+    last = np.where(last == NONE_TS, 0, last)  # last_minted.unwrap_or(0)
+    diff_now = (int(now) + LANDING_S - last) // 60
+    diff_next = (int(next_chance) + LANDING_S - last) // 60
+
+    in_range = (diff_now >= MIN_MINUTES) & (diff_now <= MAX_MINUTES)
+    pay = in_range & (diff_next > MAX_MINUTES)
+    wait = in_range & ~pay
+    arm = diff_now > MAX_MINUTES
+    fresh = diff_now < MIN_MINUTES
+
+    pay_rows = rows[pay][np.argsort(-diff_now[pay], kind="stable")]
+    return MintPlan(
+        pay=table.names_at(pay_rows),
+        arm=table.names_at(rows[arm]),
+        wait=table.names_at(rows[wait]),
+        fresh=table.names_at(rows[fresh]),
+        payout=int(diff_now[pay].sum()) * rate,
+        next_due=float(last[wait].min() + (MAX_MINUTES + 1) * 60) if wait.any() else None,
+    )
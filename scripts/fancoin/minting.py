@@ -0,0 +1,222 @@
+"""
+Per-validator instruction helpers: register_validator_pda (if needed),
+punch_in and chunked submit_minting_list.
+
+Everything takes a ValidatorIdentity and a shared Program, so one process
+can drive any number of validators through the same RPC client.
+
+With precompiled encoders (fancoin.encoders) the instruction is built
+without anchorpy and sent through compose.TxComposer.
+
+With the game's Address Lookup Tables (fancoin.lookup) submit_minting_list
+goes out as a v0 TX and each chunk is grown for as long as the TX fits
+(size and account locks), ~ALT_CHUNK_SIZE players instead of CHUNK_SIZE.
+"""
+import asyncio
+import traceback
+
+from solders.compute_budget import set_compute_unit_limit
+from solders.instruction import AccountMeta
+from solders.pubkey import Pubkey
+from solders.system_program import ID as SYS_PROGRAM_ID
+
+from fancoin import pdas
+from fancoin.compose import TxComposer
+from fancoin.identity import ValidatorIdentity
+from fancoin.runtime import lazy_import
+
+anchorpy = lazy_import("anchorpy")
+
+CHUNK_SIZE = 3  # how many players to mint per TX
+ALT_CHUNK_SIZE = 24  # with lookup tables: (64 account locks - ~13 fixed accounts) / 2 per player
+MINT_CU_LIMIT = 1_400_000  # a long list needs more than the default 200k CU per instruction
+CHUNK_PAUSE_S = 0.2
+RENT_SYSVAR = Pubkey.from_string("SysvarRent111111111111111111111111111111111")
+
+
+def _with_gateway(accounts: dict, ident: ValidatorIdentity) -> dict:
+    # Only checked when the game is not curated; any key satisfies the account slot otherwise
+    accounts["gateway_token"] = ident.gateway_token or ident.pubkey
+    return accounts
+
+
+async def ensure_validator_pda(program, game_pda, mint, ident: ValidatorIdentity) -> bool:
+    """register_validator_pda (+ ATA) unless the ValidatorPda already exists."""
+    resp = await program.provider.connection.get_account_info(ident.validator_pda)
+    if resp.value is not None:
+        return True
+    print(f"[INFO] {ident.label}: validator_pda {ident.validator_pda} not found. Initializing...")
+    try:
+        tx_sig = await program.rpc["register_validator_pda"](
+            mint,
+            ctx=anchorpy.Context(
+                accounts=_with_gateway({
+                    "game": game_pda,
+                    "fancy_mint": mint,
+                    "validator_pda": ident.validator_pda,
+                    "user": ident.pubkey,
+                    "validator_ata": ident.ata,
+                    "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+                    "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+                    "system_program": SYS_PROGRAM_ID,
+                    "rent": RENT_SYSVAR,
+                }, ident),
+                signers=[ident.keypair],
+            ),
+        )
+        print(f"[INFO] {ident.label}: registered validator_pda + ATA. Tx Sig: {tx_sig}")
+        return True
+    except Exception as e:
+        print(f"[ERROR] {ident.label}: failed to register validator_pda: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def punch_in(program, game_pda, mint, ident: ValidatorIdentity) -> bool:
+    try:
+        tx_sig = await program.rpc["punch_in"](
+            mint,
+            ctx=anchorpy.Context(
+                accounts={
+                    "game": game_pda,
+                    "validator_pda": ident.validator_pda,
+                    "validator": ident.pubkey,
+                    "system_program": SYS_PROGRAM_ID,
+                },
+                signers=[ident.keypair],
+            ),
+        )
+        print(f"[SUCCESS] {ident.label}: punched in. Tx: {tx_sig}")
+        return True
+    except Exception as e:
+        print(f"[ERROR] {ident.label}: punching in: {e}")
+        traceback.print_exc()
+        return False
+
+
+def minting_chunks(matched_names, table, commission_ata, chunk_size: int = CHUNK_SIZE, fits=None):
+    """
+    Yield (numeric_ids, leftover_accounts) per TX. leftover is the game's
+    commission ATA followed by one [PlayerPda, reward ATA] pair per player.
+
+    fits: optional `(numeric_ids, leftover_accounts) -> bool`; a chunk is
+    closed early when adding the next player would make it False.
+    """
+    commission = AccountMeta(pubkey=commission_ata, is_signer=False, is_writable=True)
+    numeric_ids, leftover_accounts = [], [commission]
+    for name in matched_names:
+        entry = table.get(name)
+        if entry is None:
+            print(f"[WARN] Name={name} not found in name_map. Skipping.")
+            continue
+        pair = [
+            AccountMeta(pubkey=entry["pda"], is_signer=False, is_writable=True),
+            AccountMeta(pubkey=entry["reward_address"], is_signer=False, is_writable=True),
+        ]
+        if numeric_ids and (
+            len(numeric_ids) >= chunk_size
+            or (fits is not None and not fits(numeric_ids + [entry["index"]], leftover_accounts + pair))
+        ):
+            yield numeric_ids, leftover_accounts
+            numeric_ids, leftover_accounts = [], [commission]
+        leftover_accounts.extend(pair)
+        numeric_ids.append(entry["index"])
+    if numeric_ids:
+        yield numeric_ids, leftover_accounts
+
+
+def lookup_addresses(matched_names, table) -> list:
+    """The per-player accounts submit_minting_list references, for GameLookupTables.sync."""
+    addresses = []
+    for name in matched_names:
+        entry = table.get(name)
+        if entry is not None:
+            addresses += [entry["pda"], entry["reward_address"]]
+    return addresses
+
+
+def _submit_ctx(game_pda, mint, mint_authority, ident: ValidatorIdentity, leftover_accounts):
+    return anchorpy.Context(
+        accounts=_with_gateway({
+            "game": game_pda,
+            "validator_pda": ident.validator_pda,
+            "validator": ident.pubkey,
+            "fancy_mint": mint,
+            "mint_authority": mint_authority,
+            "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+            "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+            "system_program": SYS_PROGRAM_ID,
+        }, ident),
+        signers=[ident.keypair],
+        remaining_accounts=leftover_accounts,
+    )
+
+
+async def submit_minting_list(
+    program,
+    game_pda,
+    mint,
+    mint_authority,
+    commission_ata,
+    ident: ValidatorIdentity,
+    matched_names: list,
+    table,
+    window_open=None,
+    chunk_size: int = None,
+    chunk_pause_s: float = CHUNK_PAUSE_S,
+    lookup_tables=None,
+    encoders=None,
+) -> int:
+    """
+    Chunked submit_minting_list for one validator => number of TXs sent.
+
+    lookup_tables: AddressLookupTableAccount list holding the players' accounts
+    (GameLookupTables.accounts()); chunks are then sized to what fits a v0 TX.
+    encoders:      a fancoin.encoders.InstructionSet to build the instruction
+    with instead of anchorpy's program.rpc / program.instruction.
+    """
+    if encoders is not None:
+        submit = encoders["submit_minting_list"].bind(game=game_pda, fancy_mint=mint, mint_authority=mint_authority)
+        gateway_token = ident.gateway_token or ident.pubkey
+
+    def instruction(numeric_ids, leftover_accounts):
+        if encoders is None:
+            ctx = _submit_ctx(game_pda, mint, mint_authority, ident, leftover_accounts)
+            return program.instruction["submit_minting_list"](mint, numeric_ids, ctx=ctx)
+        return submit.build(mint, numeric_ids, validator_pda=ident.validator_pda, validator=ident.pubkey,
+                            gateway_token=gateway_token, remaining=leftover_accounts)
+
+    def build(numeric_ids, leftover_accounts):
+        if lookup_tables is None:
+            return [instruction(numeric_ids, leftover_accounts)]
+        return [set_compute_unit_limit(MINT_CU_LIMIT), instruction(numeric_ids, leftover_accounts)]
+
+    fits = None
+    if lookup_tables is not None:
+        chunk_size = chunk_size or ALT_CHUNK_SIZE
+        fits = lambda ids, leftover: TxComposer(program, lookup_tables=lookup_tables).fits(build(ids, leftover))
+    chunks = minting_chunks(matched_names, table, commission_ata, chunk_size or CHUNK_SIZE, fits=fits)
+
+    sent = 0
+    for numeric_ids, leftover_accounts in chunks:
+        # Don't spend a TX the program would skip (outside the mint window)
+        if window_open is not None and not window_open():
+            print(f"[INFO] {ident.label}: mint window closed => holding remaining chunks.")
+            break
+        try:
+            if lookup_tables is None and encoders is None:
+                tx_sig = await program.rpc["submit_minting_list"](
+                    mint, numeric_ids, ctx=_submit_ctx(game_pda, mint, mint_authority, ident, leftover_accounts),
+                )
+            else:
+                composer = TxComposer(program, lookup_tables=lookup_tables)
+                composer.add(build(numeric_ids, leftover_accounts), [ident.keypair])
+                tx_sig = await composer.send()
+            sent += 1
+            print(f"[INFO] {ident.label}: submit_minting_list {numeric_ids} TX => {tx_sig}")
+        except Exception as exc:
+            print(f"[ERROR] {ident.label}: chunk submission => {exc}")
+            continue
+        if chunk_pause_s:
+            await asyncio.sleep(chunk_pause_s)
+    return sent
@@ -0,0 +1,196 @@
+"""
+Several games (e.g. a TFC and a PUBG mint) in one validator process.
+
+Each game keeps its own Orchestrator: PlayerTable, MintScheduler (punch-in
+schedule + hour window), punched set and submit_minting_list queue. What
+does not depend on the game is done once for all of them:
+
+  - one RPC client / Program / ChainClock,
+  - SharedScrape: the master server is listed once per gamedir, and one
+    A2S sweep over the union of every game's servers is reused by each
+    game whose mint round asks while it is fresh,
+  - SharedPlayerScan: one PlayerPda getProgramAccounts per refresh (the
+    scan returns every game's players anyway), split per game by its
+    PlayerPda index map.
+
+Adding a game adds its own punch_in / submit / claim TXs and a Game read,
+not a process, an A2S sweep or a program scan.
+
+With a fancoin.feed.PlayerFeed the scan is replaced by the feed's live
+index: every game's table is patched from its diffs and each Game PDA is
+followed with accountSubscribe.
+
+With `index_scan` each game rebuilds its table from its own PlayerPda
+indices instead (player_table.scan_game_players: parallel
+getMultipleAccounts ranges), for when one getProgramAccounts over every
+game's players is too large for the node to answer.
+"""
+import asyncio
+import functools
+import time
+import traceback
+
+from fancoin.lookup import GameLookupTables
+from fancoin.orchestrator import Orchestrator
+from fancoin.player_table import scan_player_records
+from fancoin.schedule import ROUND_PAUSE_S, ChainClock
+from fancoin.scrape import MASTER_SERVER, dedupe_by_ip, query_master_server, scrape_servers
+
+SWEEP_MAX_AGE_S = ROUND_PAUSE_S / 2
+SCAN_MAX_AGE_S = 60
+
+
+class SingleFlight:
+    """
+    One fetch shared by every caller: callers arriving while it runs await
+    the same task, callers within `max_age_s` of the last result reuse it.
+    """
+
+    def __init__(self, fetch, max_age_s: float):
+        self.fetch = fetch
+        self.max_age_s = max_age_s
+        self.fetches = 0
+        self.hits = 0
+        self._value = None
+        self._at = None
+        self._task = None
+
+    async def get(self):
+        if self._at is not None and time.monotonic() - self._at < self.max_age_s:
+            self.hits += 1
+            return self._value
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._refresh())
+        else:
+            self.hits += 1
+        return await asyncio.shield(self._task)
+
+    async def _refresh(self):
+        try:
+            self._value = await self.fetch()
+            self._at = time.monotonic()
+            self.fetches += 1
+            return self._value
+        finally:
+            self._task = None
+
+
+# --------------------------------------------------------------------
+# Shared ingestion
+# --------------------------------------------------------------------
+def list_servers(gamedirs, master=MASTER_SERVER) -> dict:
+    """{gamedir: deduped (ip, port) list}, one master-server listing per distinct gamedir."""
+    return {gd: dedupe_by_ip(query_master_server(gamedir=gd, master=master)) for gd in dict.fromkeys(gamedirs)}
+
+
+class SharedScrape:
+    """One A2S sweep of every game's servers, split back out by gamedir."""
+
+    def __init__(self, servers_by_gamedir: dict, max_age_s: float = SWEEP_MAX_AGE_S):
+        self.servers_by_gamedir = {gd: list(srvs) for gd, srvs in servers_by_gamedir.items()}
+        self.servers = list(dict.fromkeys(s for srvs in self.servers_by_gamedir.values() for s in srvs))
+        self.flight = SingleFlight(self._sweep, max_age_s)
+
+    async def _sweep(self) -> dict:
+        per_server = await scrape_servers(self.servers)
+        print(f"[INFO] A2S sweep: {len(set().union(*per_server.values()))} distinct players "
+              f"on {len(self.servers)} servers ({', '.join(self.servers_by_gamedir)}).")
+        return per_server
+
+    async def names(self, gamedir: str) -> set:
+        per_server = await self.flight.get()
+        return set().union(*(per_server.get(s, ()) for s in self.servers_by_gamedir.get(gamedir, ())))
+
+
+class SharedPlayerScan:
+    """scan_player_records() once for every game refreshing within `max_age_s`."""
+
+    def __init__(self, client, program_id, max_age_s: float = SCAN_MAX_AGE_S):
+        self.flight = SingleFlight(functools.partial(scan_player_records, client, program_id), max_age_s)
+
+    async def records(self) -> list:
+        return await self.flight.get()
+
+
+# --------------------------------------------------------------------
+# Runtime
+# --------------------------------------------------------------------
+class MultiGameRuntime:
+    def __init__(self, program, games, servers_by_gamedir: dict, claims: bool = True,
+                 round_pause_s: float = ROUND_PAUSE_S, feed=None, lookup_tables: bool = False, on_new_table=None,
+                 encoders=None, index_scan: int = 0):
+        """
+        games:               [(GameDeployment, [ValidatorIdentity, ...]), ...]; identities are
+                             per game (ValidatorPda / ATA depend on the mint).
+        servers_by_gamedir:  list_servers() for the games' gamedirs.
+        feed:                a fancoin.feed.PlayerFeed (not started) to use instead of PlayerPda scans.
+        lookup_tables:       submit_minting_list through each game's Address Lookup Tables
+                             (fancoin.lookup; the provider wallet creates / extends them).
+        on_new_table:        callback(GameDeployment) when one of its tables is created, e.g. to save it.
+        encoders:            a fancoin.encoders.InstructionSet shared by every game's submissions.
+        index_scan:          getMultipleAccounts ranges in flight per game when refreshing its table
+                             by PlayerPda index instead of the shared scan (0 = off).
+        program may be a fancoin.locks.LockAwareProgram; every game's TXs then share its write-lock pacing.
+        """
+        client = program.provider.connection
+        self.program = program
+        self.clock = ChainClock(client)
+        self.scrape = SharedScrape(servers_by_gamedir)
+        self.scan = SharedPlayerScan(client, program.program_id)
+        self.feed = feed
+        self.orchestrators = {
+            game.label: Orchestrator(
+                program, game.game_pda, game.mint, identities, self.scrape.servers_by_gamedir.get(game.gamedir, []),
+                claims=claims, round_pause_s=round_pause_s, deployment=game, clock=self.clock,
+                player_names=functools.partial(self.scrape.names, game.gamedir),
+                player_records=self.scan.records if feed is None else feed.snapshot,
+                lookup_tables=self._lookup_tables(client, game, on_new_table) if lookup_tables else None,
+                encoders=encoders, index_scan=index_scan,
+            )
+            for game, identities in games
+        }
+        if feed is not None:
+            for game, _ in games:
+                orchestrator = self.orchestrators[game.label]
+                feed.listen(orchestrator.apply_player_change)
+                feed.watch_account(game.game_pda, orchestrator.apply_game_account)
+
+    def _lookup_tables(self, client, game, on_new_table):
+        notify = None if on_new_table is None else (lambda _table: on_new_table(game))
+        return GameLookupTables(client, self.program.provider.wallet.payer, known=game.lookup_tables,
+                                on_new_table=notify)
+
+    def stats(self) -> dict:
+        stats = {
+            "games": list(self.orchestrators),
+            "a2s_sweeps": self.scrape.flight.fetches,
+            "a2s_sweeps_shared": self.scrape.flight.hits,
+            "player_scans": self.scan.flight.fetches,
+            "player_scans_shared": self.scan.flight.hits,
+        }
+        if self.feed is not None:
+            stats["feed"] = dict(self.feed.stats, mode=self.feed.mode)
+        scheduler = getattr(self.program, "scheduler", None)
+        if scheduler is not None:
+            stats["write_locks"] = dict(scheduler.stats)
+        return stats
+
+    async def _run_game(self, label: str, orchestrator: Orchestrator):
+        """One game failing must not stop the others."""
+        try:
+            await orchestrator.run_forever()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[ERROR] [{label}] game stopped => {e}")
+            traceback.print_exc()
+
+    async def run_forever(self):
+        print(f"[INFO] Serving {len(self.orchestrators)} games: {list(self.orchestrators)}")
+        if self.feed is not None:
+            await self.feed.start()
+        try:
+            await asyncio.gather(*(self._run_game(label, o) for label, o in self.orchestrators.items()))
+        finally:
+            if self.feed is not None:
+                await self.feed.stop()
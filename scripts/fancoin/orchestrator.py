@@ -0,0 +1,269 @@
+"""
+Run any number of validator identities in one process.
+
+The per-validator scripts (8_val1_..., 9_val2_..., 6_punch_in.py,
+7_punch_in2.py) each did their own A2S sweep, their own PlayerPda scan and
+held their own RPC client. Here the expensive, identity-independent work
+happens once per round and is fanned out:
+
+  - one A2S sweep of the TFC servers per mint round,
+  - one PlayerTable refresh per hour (Game.player_count read + filtered scan),
+  - one MintScheduler / ChainClock for the hour window,
+  - one ClaimDaemon for the whole fleet,
+
+while punch_in, submit_minting_list and claim_validator_reward are sent per
+identity, concurrently, through the shared Program.
+
+One Orchestrator serves one game; fancoin.multigame runs one per game
+with the clock, A2S sweep and PlayerPda scan shared between them, or with
+a fancoin.feed.PlayerFeed keeping every game's table live.
+
+With a fancoin.lookup.GameLookupTables the players matched each round are
+added to the game's lookup tables (if not in them yet) before the
+submissions, which then go out as v0 TXs carrying many more players.
+"""
+import asyncio
+
+from solders.system_program import ID as SYS_PROGRAM_ID
+
+from fancoin import pdas
+from fancoin.claims import ClaimDaemon
+from fancoin.decoder import DecodeError, decode_game
+from fancoin.groups import GroupPredictor, fetch_minting_state
+from fancoin.mint_plan import plan_mint_window
+from fancoin.minting import ensure_validator_pda, lookup_addresses, punch_in, submit_minting_list
+from fancoin.player_table import game_player_table, scan_game_players, scan_player_records
+from fancoin.schedule import ROUND_PAUSE_S, ChainClock, MintScheduler, hour_of, next_mint_chance
+from fancoin.scrape import scrape_player_names
+
+
+class Orchestrator:
+    def __init__(self, program, game_pda, mint, identities, servers, claims: bool = True,
+                 round_pause_s: float = ROUND_PAUSE_S, deployment=None, clock: ChainClock = None,
+                 player_names=None, player_records=None, predict_groups: bool = True, plan_window: bool = True,
+                 lookup_tables=None, encoders=None, index_scan: int = 0):
+        """
+        deployment:      the game's GameDeployment, whose cached addresses are used when given.
+        clock:           a ChainClock shared with other games (default: own one).
+        player_names:    `async () -> set` of names on this game's servers (default: A2S sweep of `servers`).
+        player_records:  `async () -> [(pubkey, PlayerPdaRecord)]` of every PlayerPda (default: own scan).
+        predict_groups:  read Game + matched players once per round and only send each validator the
+                         players submit_minting_list can still finalise (fancoin.groups).
+        plan_window:     only send players whose 1..34 minute payout is due or whose clock needs
+                         restarting, highest payout first (fancoin.mint_plan).
+        lookup_tables:   a fancoin.lookup.GameLookupTables to submit_minting_list through (v0 TXs).
+        encoders:        a fancoin.encoders.InstructionSet to build submit_minting_list with.
+        index_scan:      refresh the table by index instead of from player_records: getMultipleAccounts
+                         ranges of this game's PlayerPdas, this many in flight (0 = off).
+        """
+        self.program = program
+        self.client = program.provider.connection
+        self.game_pda = game_pda
+        self.mint = mint
+        self.deployment = deployment
+        self.tag = f"[{deployment.label}] " if deployment is not None else ""
+        self.mint_authority = (
+            deployment.mint_authority.address if deployment is not None
+            else pdas.mint_authority_pda(program.program_id)[0]
+        )
+        self.identities = list(identities)
+        self.servers = list(servers)
+        self.claims = claims
+        self.predict_groups = predict_groups
+        self.plan_window = plan_window
+        self.lookup_tables = lookup_tables
+        self.encoders = encoders
+        self.index_scan = index_scan
+        self.clock = clock or ChainClock(self.client)
+        self.player_names = player_names or (lambda: scrape_player_names(self.servers))
+        self.player_records = player_records or (lambda: scan_player_records(self.client, self.program.program_id))
+        self.scheduler = MintScheduler(self.clock, self.punch_in_all, self.mint_round, round_pause_s)
+
+        self.game = None
+        self.table = None
+        self.table_hour = None
+        self.punched_hour = None
+        self.punched = set()  # labels punched in during punched_hour
+
+    async def load_game(self):
+        resp = await self.client.get_account_info(self.game_pda)
+        if resp.value is None:
+            raise RuntimeError(f"Game account {self.game_pda} not found")
+        self.game = decode_game(bytes(resp.value.data))
+        return self.game
+
+    async def setup(self):
+        await self.load_game()
+        ok = await asyncio.gather(
+            *(ensure_validator_pda(self.program, self.game_pda, self.mint, i) for i in self.identities)
+        )
+        dropped = [i.label for i, good in zip(self.identities, ok) if not good]
+        if dropped:
+            print(f"[WARN] {self.tag}Dropping validators without a ValidatorPda: {dropped}")
+        self.identities = [i for i, good in zip(self.identities, ok) if good]
+        if self.lookup_tables is not None:
+            await self.lookup_tables.load()
+
+    async def refresh_table(self):
+        """One Game read + one PlayerPda scan for every identity."""
+        await self.load_game()
+        count = self.game.player_count
+        if self.index_scan:
+            self.table = await scan_game_players(
+                self.client, self.game_pda, count, self.program.program_id,
+                None if self.deployment is None else self.deployment.player_pda, concurrency=self.index_scan,
+            )
+        else:
+            self.table = game_player_table(
+                await self.player_records(), self.game_pda, count, self.program.program_id,
+                None if self.deployment is None else self.deployment.player_index_map(count),
+            )
+        print(f"[DEBUG] {self.tag}Found {len(self.table)} PlayerPda records on-chain for this game.")
+
+    # ----------------------------------------------------------------
+    # PlayerFeed listeners (fancoin.feed)
+    # ----------------------------------------------------------------
+    def apply_player_change(self, change):
+        """Keep the table current between hourly refreshes: registrations, mints and claims land as they happen."""
+        if self.table is None or self.deployment is None or change.new is None:
+            return  # removed rows stay until the next refresh_table()
+        index = self.deployment.player_index(change.pubkey, self.game.player_count)
+        if index is not None:
+            self.table.upsert(change.pubkey, change.new, index)
+
+    def apply_game_account(self, pubkey, data, slot: int):
+        """accountSubscribe on the Game PDA: player_count / commission_ata without a load_game()."""
+        if data:
+            try:
+                self.game = decode_game(data)
+            except DecodeError as e:
+                print(f"[WARN] {self.tag}Game update at slot {slot} not decodable => {e}")
+
+    # ----------------------------------------------------------------
+    # MintScheduler callbacks
+    # ----------------------------------------------------------------
+    async def punch_in_all(self) -> bool:
+        """punch_in every identity that hasn't yet this hour; True if any is in."""
+        hour = hour_of(self.clock.now())
+        if self.punched_hour != hour:
+            self.punched_hour = hour
+            self.punched = set()
+        todo = [i for i in self.identities if i.label not in self.punched]
+        results = await asyncio.gather(
+            *(punch_in(self.program, self.game_pda, self.mint, i) for i in todo)
+        )
+        self.punched.update(i.label for i, good in zip(todo, results) if good)
+        print(f"[INFO] {self.tag}Punched in {len(self.punched)}/{len(self.identities)} validators.")
+        return bool(self.punched)
+
+    async def mint_round(self, sched: MintScheduler):
+        hour = hour_of(sched.clock.now())
+        if self.table is None or self.table_hour != hour:
+            await self.refresh_table()
+            self.table_hour = hour
+
+        names = await self.player_names()
+        matched_names = [n for n in names if n in self.table]
+        print(f"[INFO] {self.tag}matched_names => {len(matched_names)}")
+        if not matched_names:
+            print(f"[WARN] {self.tag}No matched players found.")
+            return
+
+        active = [i for i in self.identities if i.label in self.punched]
+        state = await self.read_minting_state(matched_names) if self.predict_groups or self.plan_window else None
+        if self.plan_window and state is not None:
+            now = sched.clock.now()
+            plan = plan_mint_window(self.table, matched_names, now, next_mint_chance(now, sched.round_pause_s),
+                                    self.game.coin_issuance_rate)
+            print(f"[INFO] {self.tag}Mint plan: pay {len(plan.pay)} (~{plan.payout} base units), arm {len(plan.arm)}, "
+                  f"hold {len(plan.wait)} + {len(plan.fresh)} minted < 1 min ago.")
+            matched_names = plan.submit
+            if not matched_names:
+                return
+
+        names_for = self.submission_plan(active, matched_names, state)
+        tables = await self.sync_lookup_tables(active, matched_names)
+        sent = await asyncio.gather(
+            *(
+                submit_minting_list(
+                    self.program, self.game_pda, self.mint, self.mint_authority, self.game.commission_ata,
+                    i, names_for[i.label], self.table, window_open=sched.window_open, lookup_tables=tables,
+                    encoders=self.encoders,
+                )
+                for i in active
+            )
+        )
+        print(f"[INFO] {self.tag}Round done: {sum(sent)} submit_minting_list TXs across {len(active)} validators.")
+
+    async def sync_lookup_tables(self, identities, matched_names):
+        """Put this round's accounts in the game's lookup tables => their AddressLookupTableAccounts (or None)."""
+        if self.lookup_tables is None:
+            return None
+        fixed = [self.game_pda, self.mint, self.mint_authority, self.game.commission_ata,
+                 pdas.SPL_TOKEN_PROGRAM_ID, pdas.ASSOCIATED_TOKEN_PROGRAM_ID, SYS_PROGRAM_ID]
+        fixed += [i.validator_pda for i in identities]
+        try:
+            added = await self.lookup_tables.sync(fixed + lookup_addresses(matched_names, self.table))
+        except Exception as e:
+            print(f"[WARN] {self.tag}Lookup tables not extended => {e}; sending legacy TXs this round.")
+            return None
+        if added:
+            print(f"[INFO] {self.tag}Lookup tables: {self.lookup_tables.stats}")
+        return self.lookup_tables.accounts()
+
+    async def read_minting_state(self, matched_names):
+        """
+        One batched read of the Game and the matched PlayerPdas; the fresh
+        last_minted / partials are written into the table. None if it failed
+        (the round then sends every matched player, as without planning).
+        """
+        try:
+            state = await fetch_minting_state(self.client, self.game_pda, [self.table[n]["pda"] for n in matched_names])
+        except Exception as e:
+            print(f"[WARN] {self.tag}Minting state read failed => {e}; sending every matched player.")
+            return None
+        self.game = state.game
+        for pubkey, rec in state.players.items():
+            self.table.upsert(pubkey, rec)
+        return state
+
+    def submission_plan(self, identities, matched_names, state) -> dict:
+        """
+        {label: names} per identity. With predict_groups, the Game and the
+        matched PlayerPdas from read_minting_state() decide, per validator, which
+        players can finalise (sent first), only need its approval, or would
+        "Failover => remain".
+        """
+        if not self.predict_groups or state is None:
+            return {i.label: matched_names for i in identities}
+        predictor = GroupPredictor(state.game)
+
+        def partials_of(name):
+            rec = state.players.get(self.table[name]["pda"])
+            return () if rec is None or not rec.partial_validator_count else rec.partial_validators
+
+        plan = {}
+        for ident in identities:
+            plan[ident.label], counts = predictor.order(ident.pubkey, matched_names, partials_of)
+            skipped = len(matched_names) - len(plan[ident.label])
+            if skipped:
+                print(f"[INFO] {self.tag}{ident.label}: skipping {skipped}/{len(matched_names)} players "
+                      f"that can't finalise under seed {predictor.seed} ({counts}).")
+        return plan
+
+    # ----------------------------------------------------------------
+    # Entry point
+    # ----------------------------------------------------------------
+    async def run_forever(self):
+        await self.setup()
+        if not self.identities:
+            print(f"[ERROR] {self.tag}No usable validator identities.")
+            return
+        labels = [i.label for i in self.identities]
+        print(f"[INFO] {self.tag}Orchestrating {len(self.identities)} validators: {labels}")
+        tasks = [self.scheduler.run_forever()]
+        if self.claims:
+            daemon = ClaimDaemon(self.program, self.game_pda, self.mint, self.identities, clock=self.clock,
+                                 mint_authority=self.mint_authority)
+            tasks.append(daemon.run_forever())
+        await asyncio.gather(*tasks)
@@ -0,0 +1,194 @@
+"""
+Sharded fee payers for bulk SOL transfers.
+
+Every TX write-locks its fee payer, so transfers all paid by Wallet.local()
+run one after another on the leader however many are in flight. A PayerPool
+splits the main wallet into N sub-payers (keypairs kept in payer_keys/, so
+nothing is stranded if a run dies) and spreads the transfer TXs over them
+round-robin:
+
+    async with PayerPool(client, main_kp, size=8) as pool:
+        await pool.fund_wallets(pubkeys, lamports)      # ~N TXs land per slot instead of 1
+
+  - open():          load / create the sub-payer keys and read their balances,
+  - fund_wallets():  assign the transfer chunks round-robin, top every
+                     sub-payer up to what its share costs (one TX from the
+                     main wallet), then send each share concurrently,
+  - sweep():         send what is left on the sub-payers back to the main
+                     wallet (on exiting the `async with`, unless keep=True).
+
+fund_sharded() is players.fund_wallets() with a `payers` count.
+"""
+import asyncio
+import json
+from pathlib import Path
+
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.system_program import TransferParams, transfer
+from solders.transaction import Transaction
+
+from fancoin.identity import load_keypair
+from fancoin.players import TRANSFERS_PER_TX, fund_wallets
+from fancoin.query import MULTIPLE_ACCOUNTS_MAX
+
+PAYER_DIR = Path("payer_keys")
+POOL_SIZE = 8
+LAMPORTS_PER_SIGNATURE = 5_000
+RENT_EXEMPT_MIN = 890_880  # a 0-byte system account; a payer may hold this or 0, nothing between
+TOP_UP_MARGIN = 10 * LAMPORTS_PER_SIGNATURE
+
+
+class PayerPool:
+    def __init__(self, client, main: Keypair, size: int = POOL_SIZE, key_dir=PAYER_DIR, keep: bool = False):
+        self.client = client
+        self.main = main
+        self.size = size
+        self.key_dir = Path(key_dir)
+        self.keep = keep
+        self.payers = []    # Keypair per shard
+        self.balances = {}  # pubkey -> lamports as last read / tracked
+        self.stats = {"transfer_txs": 0, "top_up_txs": 0, "topped_up": 0, "swept": 0}
+        self._next = 0
+
+    async def __aenter__(self) -> "PayerPool":
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        if not self.keep:
+            await self.sweep()
+
+    # ----------------------------------------------------------------
+    # Keys / balances
+    # ----------------------------------------------------------------
+    def _load_keys(self) -> list:
+        self.key_dir.mkdir(parents=True, exist_ok=True)
+        payers = []
+        for i in range(self.size):
+            path = self.key_dir / f"payer{i}-keypair.json"
+            if not path.exists():
+                path.write_text(json.dumps(list(bytes(Keypair()))))
+            payers.append(load_keypair(path))
+        return payers
+
+    async def refresh(self):
+        """Re-read every sub-payer's balance (getMultipleAccounts)."""
+        pubkeys = [p.pubkey() for p in self.payers]
+        for i in range(0, len(pubkeys), MULTIPLE_ACCOUNTS_MAX):
+            batch = pubkeys[i:i + MULTIPLE_ACCOUNTS_MAX]
+            accounts = (await self.client.get_multiple_accounts(batch)).value
+            for pubkey, acct in zip(batch, accounts):
+                self.balances[pubkey] = 0 if acct is None else acct.lamports
+
+    async def open(self) -> "PayerPool":
+        self.payers = self._load_keys()
+        await self.refresh()
+        print(f"[INFO] Payer pool: {self.size} sub-payers in {self.key_dir}/ holding "
+              f"{sum(self.balances.values())} lamports.")
+        return self
+
+    def next(self) -> Keypair:
+        """Round-robin sub-payer."""
+        payer = self.payers[self._next % len(self.payers)]
+        self._next += 1
+        return payer
+
+    # ----------------------------------------------------------------
+    # Moving lamports
+    # ----------------------------------------------------------------
+    async def _send(self, payer: Keypair, moves) -> str:
+        """One TX from `payer`: [(to_pubkey, lamports)]."""
+        blockhash = (await self.client.get_latest_blockhash()).value.blockhash
+        ixs = [transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=k, lamports=n)) for k, n in moves]
+        tx = Transaction([payer], Message(ixs, payer.pubkey()), blockhash)
+        sig = (await self.client.send_transaction(tx)).value
+        await self.client.confirm_transaction(sig)
+        return sig
+
+    async def top_up(self, needs: dict):
+        """Bring each sub-payer to needs[pubkey] lamports (+ rent-exempt minimum), all from the main wallet."""
+        moves = []
+        for pubkey, need in needs.items():
+            want = need + RENT_EXEMPT_MIN + TOP_UP_MARGIN
+            have = self.balances.get(pubkey, 0)
+            if have < want:
+                moves.append((pubkey, want - have))
+        for i in range(0, len(moves), TRANSFERS_PER_TX):
+            chunk = moves[i:i + TRANSFERS_PER_TX]
+            await self._send(self.main, chunk)
+            self.stats["top_up_txs"] += 1
+            for pubkey, n in chunk:
+                self.balances[pubkey] = self.balances.get(pubkey, 0) + n
+                self.stats["topped_up"] += n
+        if moves:
+            print(f"[INFO] Payer pool: topped up {len(moves)} sub-payers "
+                  f"({sum(n for _, n in moves)} lamports from {self.main.pubkey()}).")
+
+    async def fund_wallets(self, pubkeys, lamports: int, per_tx: int = TRANSFERS_PER_TX) -> list:
+        """
+        Same result as players.fund_wallets(): one signature (or the exception)
+        per TX of `per_tx` recipients, but the TXs are paid round-robin by the
+        sub-payers, each of which sends its share concurrently.
+        """
+        pubkeys = list(pubkeys)
+        chunks = [pubkeys[i:i + per_tx] for i in range(0, len(pubkeys), per_tx)]
+        shares = {}  # payer -> [chunk number, ...]
+        for n in range(len(chunks)):
+            shares.setdefault(self.next(), []).append(n)
+        await self.top_up({
+            payer.pubkey(): sum(len(chunks[n]) * lamports + LAMPORTS_PER_SIGNATURE for n in share)
+            for payer, share in shares.items()
+        })
+
+        results = [None] * len(chunks)
+
+        async def send_share(payer, share):
+            out = await fund_wallets(self.client, payer, [k for n in share for k in chunks[n]], lamports, per_tx)
+            self.stats["transfer_txs"] += len(out)
+            for n, sig in zip(share, out):
+                results[n] = sig
+                if not isinstance(sig, Exception):
+                    self.balances[payer.pubkey()] -= len(chunks[n]) * lamports + LAMPORTS_PER_SIGNATURE
+
+        await asyncio.gather(*(send_share(p, s) for p, s in shares.items()))
+        if any(isinstance(sig, Exception) for sig in results):
+            await self.refresh()  # a failed send leaves the tracked balance unknown
+        return results
+
+    async def sweep(self) -> int:
+        """Everything on the sub-payers back to the main wallet; returns the lamports moved."""
+        await self.refresh()
+        swept = 0
+        sends = []
+        for payer in self.payers:
+            amount = self.balances[payer.pubkey()] - LAMPORTS_PER_SIGNATURE
+            if amount > 0:
+                sends.append((payer, amount))
+        results = await asyncio.gather(
+            *(self._send(payer, [(self.main.pubkey(), amount)]) for payer, amount in sends),
+            return_exceptions=True,
+        )
+        for (payer, amount), res in zip(sends, results):
+            if isinstance(res, Exception):
+                print(f"[WARN] Payer pool: sweeping {payer.pubkey()} failed => {res}")
+                continue
+            self.balances[payer.pubkey()] = 0
+            swept += amount
+        self.stats["swept"] += swept
+        print(f"[INFO] Payer pool: swept {swept} lamports back to {self.main.pubkey()}.")
+        return swept
+
+
+async def fund_sharded(client, main: Keypair, pubkeys, lamports: int, payers: int = POOL_SIZE,
+                       per_tx: int = TRANSFERS_PER_TX, key_dir=PAYER_DIR) -> list:
+    """
+    players.fund_wallets() spread over `payers` sub-payers (1 = straight from `main`), swept afterwards.
+    There are never more sub-payers than transfer TXs; with one TX (e.g. the validator fleet) the
+    top-up + sweep would only add TXs, so it goes straight from `main`.
+    """
+    pubkeys = list(pubkeys)
+    payers = min(payers, -(-len(pubkeys) // per_tx))
+    if payers <= 1:
+        return await fund_wallets(client, main, pubkeys, lamports, per_tx)
+    async with PayerPool(client, main, payers, key_dir) as pool:
+        return await pool.fund_wallets(pubkeys, lamports, per_tx)
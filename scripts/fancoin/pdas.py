@@ -0,0 +1,69 @@
+"""
+PDA / ATA derivations for the fancoin program.
+
+Seeds mirror the #[account(seeds = ...)] constraints in lib.rs.
+"""
+from solders.pubkey import Pubkey
+
+PROGRAM_ID = Pubkey.from_string("HP9ucKGU9Sad7EaWjrGULC2ZSyYD1ScxVPh15QmdRmut")
+SPL_TOKEN_PROGRAM_ID = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
+ASSOCIATED_TOKEN_PROGRAM_ID = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
+GATEWAY_PROGRAM_ID = Pubkey.from_string("gatem74V238djXdzWnJf94Wo1DcnuGkfijbf3AuBhfs")
+
+
+def game_pda(mint: Pubkey, program_id: Pubkey = PROGRAM_ID):
+    """[b"game", mint] => (address, bump)"""
+    return Pubkey.find_program_address([b"game", bytes(mint)], program_id)
+
+
+def game_mint_pda(user: Pubkey, program_id: Pubkey = PROGRAM_ID):
+    """[b"my_spl_mint", user] => (address, bump); the mint initialize_game_and_mint creates for `user`."""
+    return Pubkey.find_program_address([b"my_spl_mint", bytes(user)], program_id)
+
+
+def mint_authority_pda(program_id: Pubkey = PROGRAM_ID):
+    """[b"mint_authority"] => (address, bump)"""
+    return Pubkey.find_program_address([b"mint_authority"], program_id)
+
+
+def player_pda(game: Pubkey, index: int, program_id: Pubkey = PROGRAM_ID):
+    """[b"player_pda", game, index as u32 LE] => (address, bump)"""
+    return Pubkey.find_program_address([b"player_pda", bytes(game), index.to_bytes(4, "little")], program_id)
+
+
+def player_name_pda(game: Pubkey, name: str, program_id: Pubkey = PROGRAM_ID):
+    """[b"player_name", game, name] => (address, bump)"""
+    return Pubkey.find_program_address([b"player_name", bytes(game), name.encode("utf-8")], program_id)
+
+
+def validator_pda(mint: Pubkey, validator: Pubkey, program_id: Pubkey = PROGRAM_ID):
+    """[b"validator", mint, validator] => (address, bump)"""
+    return Pubkey.find_program_address([b"validator", bytes(mint), bytes(validator)], program_id)
+
+
+def wallet_pda(mint: Pubkey, user: Pubkey, program_id: Pubkey = PROGRAM_ID):
+    """[b"wallet_pda", mint, user] => (address, bump)"""
+    return Pubkey.find_program_address([b"wallet_pda", bytes(mint), bytes(user)], program_id)
+
+
+def associated_token_address(owner: Pubkey, mint: Pubkey) -> Pubkey:
+    """Token-2022 ATA for owner + mint."""
+    ata, _ = Pubkey.find_program_address(
+        [bytes(owner), bytes(SPL_TOKEN_PROGRAM_ID), bytes(mint)],
+        ASSOCIATED_TOKEN_PROGRAM_ID,
+    )
+    return ata
+
+
+def gateway_token_address(owner: Pubkey, gatekeeper_network: Pubkey, seed_index: int = 0) -> Pubkey:
+    """Civic gateway token for owner (what Gateway::verify_gateway_token_account_info checks)."""
+    token, _ = Pubkey.find_program_address(
+        [bytes(owner), b"gateway", seed_index.to_bytes(8, "little"), bytes(gatekeeper_network)],
+        GATEWAY_PROGRAM_ID,
+    )
+    return token
+
+
+def player_index_map(game: Pubkey, player_count: int, program_id: Pubkey = PROGRAM_ID) -> dict:
+    """{player_pda_address: index} for indices 0..player_count-1."""
+    return {player_pda(game, i, program_id)[0]: i for i in range(player_count)}
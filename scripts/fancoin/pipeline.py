@@ -0,0 +1,283 @@
+"""
+In-process stage runner: coroutines with dependencies, run as a DAG.
+
+A stage is `async def fn(ctx)` plus the names of the stages it needs.
+Every stage starts as soon as its dependencies have finished, so
+independent stages overlap and the wall time is the critical path rather
+than the sum. All stages share one RunContext: one RPC client, one parsed
+IDL / Program and one KeyStore, built on first use.
+
+    pipe = Pipeline()
+
+    @pipe.stage()
+    async def fund(ctx): ...
+
+    @pipe.stage("fund")
+    async def register(ctx): ...
+
+    report = await pipe.run(RunContext(endpoint), log_path=Path("logs/run.jsonl"))
+
+Each stage start / end is one JSON line in `log_path` (name, status,
+offset and wall time, error); the run_end line has the critical path.
+A stage whose dependency failed is skipped, not run.
+"""
+import asyncio
+import json
+import time
+import traceback
+from pathlib import Path
+
+from solders.keypair import Keypair
+
+from fancoin import pdas, rpc
+from fancoin.identity import ValidatorIdentity, fleet_keypair_files, load_keypair
+from fancoin.locks import MAX_INFLIGHT, LockAwareProgram, LockScheduler
+from fancoin.runtime import IDL_PATH, lazy_import, load_idl
+
+anchorpy = lazy_import("anchorpy")
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class Stage:
+    def __init__(self, name: str, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+    def __repr__(self):
+        return f"Stage({self.name}, deps={list(self.deps)})"
+
+
+class StageSkipped(Exception):
+    pass
+
+
+# --------------------------------------------------------------------
+# Shared state
+# --------------------------------------------------------------------
+class KeyStore:
+    """Keypair files read once per run, by path."""
+
+    def __init__(self, directory="."):
+        self.directory = Path(directory)
+        self._cache = {}
+
+    def load(self, name) -> Keypair:
+        path = self.directory / name
+        if path not in self._cache:
+            self._cache[path] = load_keypair(path)
+        return self._cache[path]
+
+    def validator_files(self) -> list:
+        return [Path(p).name for p in fleet_keypair_files(self.directory)]
+
+    def validators(self) -> dict:
+        """{label: Keypair} for val*-keypair.json, e.g. {"val1": ...}."""
+        return {Path(f).stem.replace("-keypair", ""): self.load(f) for f in self.validator_files()}
+
+    def identity(self, label: str, mint, program_id=pdas.PROGRAM_ID) -> ValidatorIdentity:
+        return ValidatorIdentity(self.load(f"{label}-keypair.json"), mint, program_id, label=label)
+
+
+class RunContext:
+    """What the stages share: client, IDL / Program, keys and each stage's return value."""
+
+    def __init__(self, endpoint: str = rpc.DEFAULT_ENDPOINT, idl_path: Path = IDL_PATH, key_dir=".",
+                 payer: Keypair = None, program_id=pdas.PROGRAM_ID, **options):
+        self.endpoint = endpoint
+        self.idl_path = Path(idl_path)
+        self.keys = KeyStore(key_dir)
+        self.program_id = program_id
+        self.options = options
+        self.results = {}
+        self._payer = payer
+        self._program = None
+
+    @property
+    def client(self):
+        return rpc.get_client(self.endpoint, batching=True)
+
+    @property
+    def payer(self) -> Keypair:
+        """Fee payer / owner: the local Solana CLI wallet unless one was given."""
+        if self._payer is None:
+            self._payer = anchorpy.Wallet.local().payer
+        return self._payer
+
+    @property
+    def idl(self):
+        return load_idl(self.idl_path)
+
+    @property
+    def program(self):
+        """
+        Program shared by the stages. Its TXs go through a LockScheduler, so
+        concurrent stages writing the Game / mint are paced instead of expiring.
+        Option max_inflight (default locks.MAX_INFLIGHT, 0 = off) sets the limit.
+        """
+        if self._program is None:
+            program = anchorpy.Program(
+                self.idl, self.program_id, anchorpy.Provider(self.client, anchorpy.Wallet(self.payer))
+            )
+            max_inflight = self.options.get("max_inflight", MAX_INFLIGHT)
+            if max_inflight:
+                program = LockAwareProgram(program, LockScheduler(max_inflight), self.idl_path)
+            self._program = program
+        return self._program
+
+
+# --------------------------------------------------------------------
+# Runner
+# --------------------------------------------------------------------
+class Pipeline:
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name: str, fn, deps=()) -> Stage:
+        if name in self.stages:
+            raise ValueError(f"duplicate stage {name!r}")
+        self.stages[name] = Stage(name, fn, deps)
+        return self.stages[name]
+
+    def stage(self, *deps, name: str = None):
+        """Decorator: register `async def fn(ctx)` as a stage after `deps`."""
+        def register(fn):
+            self.add(name or fn.__name__, fn, deps)
+            return fn
+        return register
+
+    def order(self, only=None) -> list:
+        """
+        Stage names in dependency order. `only` restricts the run to those
+        stages plus everything they depend on.
+        """
+        for st in self.stages.values():
+            missing = [d for d in st.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"stage {st.name!r} depends on unknown {missing}")
+        wanted = set(self.stages) if not only else set()
+        todo = list(only or ())
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise ValueError(f"unknown stage {name!r}")
+            if name not in wanted:
+                wanted.add(name)
+                todo.extend(self.stages[name].deps)
+
+        ordered, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.stages[name].deps:
+                visit(dep, path + [name])
+            state[name] = "done"
+            ordered.append(name)
+
+        for name in self.stages:
+            if name in wanted:
+                visit(name, [])
+        return ordered
+
+    async def run(self, ctx: RunContext, only=None, log_path: Path = None) -> dict:
+        names = self.order(only)
+        log = _JsonLog(log_path)
+        t0 = time.perf_counter()
+        timings = {}
+        tasks = {}
+
+        async def run_stage(name):
+            st = self.stages[name]
+            if st.deps:
+                await asyncio.wait([tasks[d] for d in st.deps])
+            failed = [d for d in st.deps if timings[d]["status"] != OK]
+            start = time.perf_counter()
+            rec = {"stage": name, "deps": list(st.deps), "start_s": round(start - t0, 4)}
+            if failed:
+                rec.update(status=SKIPPED, wall_s=0.0, error=f"dependency failed: {failed}")
+                timings[name] = rec
+                log.write("stage_end", **rec)
+                print(f"[WARN] stage {name}: skipped ({rec['error']})")
+                raise StageSkipped(name)
+
+            log.write("stage_start", stage=name, start_s=rec["start_s"])
+            print(f"[INFO] stage {name}: start (+{rec['start_s']:.2f}s)")
+            try:
+                ctx.results[name] = await st.fn(ctx)
+                rec["status"] = OK
+            except Exception as e:
+                rec.update(status=FAILED, error=f"{type(e).__name__}: {e}")
+                traceback.print_exc()
+            rec["wall_s"] = round(time.perf_counter() - start, 4)
+            timings[name] = rec
+            log.write("stage_end", **rec)
+            level = "[SUCCESS]" if rec["status"] == OK else "[ERROR]"
+            print(f"{level} stage {name}: {rec['status']} in {rec['wall_s']:.2f}s"
+                  + (f" ({rec['error']})" if rec["status"] != OK else ""))
+            if rec["status"] != OK:
+                raise RuntimeError(rec["error"])
+            return ctx.results[name]
+
+        log.write("run_start", stages=names, endpoint=ctx.endpoint)
+        try:
+            for name in names:
+                tasks[name] = asyncio.ensure_future(run_stage(name))
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        finally:
+            wall = round(time.perf_counter() - t0, 4)
+            report = {
+                "ok": all(t.get("status") == OK for t in timings.values()) and len(timings) == len(names),
+                "wall_s": wall,
+                "stage_sum_s": round(sum(t.get("wall_s", 0.0) for t in timings.values()), 4),
+                "critical_path": critical_path(self.stages, timings),
+                "stages": timings,
+            }
+            log.write("run_end", **{k: v for k, v in report.items() if k != "stages"})
+            log.close()
+        return report
+
+
+def critical_path(stages: dict, timings: dict) -> list:
+    """Walk back from the last stage to finish through its latest-finishing dependency."""
+    def end(name):
+        t = timings[name]
+        return t["start_s"] + t.get("wall_s", 0.0)
+
+    done = [n for n in timings if "start_s" in timings[n]]
+    if not done:
+        return []
+    path = [max(done, key=end)]
+    while True:
+        deps = [d for d in stages[path[-1]].deps if d in timings]
+        if not deps:
+            break
+        path.append(max(deps, key=end))
+    return path[::-1]
+
+
+class _JsonLog:
+    """One JSON object per line, with a wall-clock timestamp; no-op without a path."""
+
+    def __init__(self, path: Path = None):
+        self.path = path
+        self.f = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.f = open(path, "a", encoding="utf-8")
+
+    def write(self, event: str, **fields):
+        if self.f is None:
+            return
+        self.f.write(json.dumps({"ts": round(time.time(), 3), "event": event, **fields}, default=str) + "\n")
+        self.f.flush()
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
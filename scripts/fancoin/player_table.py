@@ -0,0 +1,233 @@
+"""
+Columnar in-memory table of PlayerPda state.
+
+One NumPy array per numeric field (index, last_minted, pending_claim_ts,
+pending_game_time_ms, last_claim_ts, partial-validator count, pending_paid)
+plus an interned name column and a name -> row hash index. Queries such as
+"not minted this hour" are single vectorised expressions instead of Python
+loops over (pubkey, acct) tuples.
+
+Option<i64> fields that are None are stored as NONE_TS.
+
+The table also answers the old `name_map` interface (`keys()`, `in`,
+`get(name)` => {"index", "pda", "reward_address"}), so it can be handed to
+code that was written against the dict-of-dicts.
+"""
+import asyncio
+import sys
+
+import numpy as np
+
+from fancoin import pdas, query
+from fancoin.decoder import DecodeError, decode_player_pda, decode_players
+
+NONE_TS = np.iinfo(np.int64).min
+NO_INDEX = -1
+SCAN_CONCURRENCY = 8  # getMultipleAccounts ranges in flight per index scan
+
+_INT_COLUMNS = ("index", "last_minted", "pending_claim_ts", "pending_game_time_ms", "last_claim_ts")
+
+
+def _ts(value) -> int:
+    return NONE_TS if value is None else value
+
+
+class PlayerTable:
+    def __init__(self, capacity: int = 1024):
+        capacity = max(capacity, 1)
+        self.size = 0
+        self.index = np.full(capacity, NO_INDEX, dtype=np.int64)
+        self.last_minted = np.full(capacity, NONE_TS, dtype=np.int64)
+        self.pending_claim_ts = np.full(capacity, NONE_TS, dtype=np.int64)
+        self.pending_game_time_ms = np.full(capacity, NONE_TS, dtype=np.int64)
+        self.last_claim_ts = np.full(capacity, NONE_TS, dtype=np.int64)
+        self.partial_count = np.zeros(capacity, dtype=np.int8)
+        self.pending_paid = np.zeros(capacity, dtype=np.bool_)
+        self.names = []
+        self.pdas = []
+        self.reward_addresses = []
+        self.row_of = {}      # name -> row
+        self.row_of_pda = {}  # PlayerPda address -> row
+
+    # ----------------------------------------------------------------
+    # Building / updating
+    # ----------------------------------------------------------------
+    @classmethod
+    def from_records(cls, records, pda_to_index: dict = None) -> "PlayerTable":
+        """Build from [(player_pda_pubkey, PlayerPdaRecord-or-anchorpy-acct), ...]."""
+        table = cls(capacity=len(records))
+        for pubkey, acct in records:
+            index = pda_to_index.get(pubkey, NO_INDEX) if pda_to_index else NO_INDEX
+            table.upsert(pubkey, acct, index)
+        return table
+
+    def _grow(self):
+        capacity = len(self.index) * 2
+        for col in _INT_COLUMNS:
+            old = getattr(self, col)
+            fill = NO_INDEX if col == "index" else NONE_TS
+            new = np.full(capacity, fill, dtype=np.int64)
+            new[: len(old)] = old
+            setattr(self, col, new)
+        self.partial_count = np.resize(self.partial_count, capacity)
+        self.pending_paid = np.resize(self.pending_paid, capacity)
+
+    def upsert(self, pubkey, acct, index: int = None) -> int:
+        """Insert or overwrite the row for `pubkey`; returns the row number."""
+        row = self.row_of_pda.get(pubkey)
+        name = sys.intern(acct.name)
+        if row is None:
+            if self.size == len(self.index):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.names.append(name)
+            self.pdas.append(pubkey)
+            self.reward_addresses.append(acct.reward_address)
+            self.row_of_pda[pubkey] = row
+        else:
+            old_name = self.names[row]
+            if old_name != name and self.row_of.get(old_name) == row:
+                del self.row_of[old_name]
+            self.names[row] = name
+            self.reward_addresses[row] = acct.reward_address
+        self.row_of[name] = row
+
+        if index is not None:
+            self.index[row] = index
+        self.last_minted[row] = _ts(acct.last_minted)
+        self.pending_claim_ts[row] = _ts(acct.pending_claim_ts)
+        self.pending_game_time_ms[row] = _ts(acct.pending_game_time_ms)
+        self.last_claim_ts[row] = _ts(acct.last_claim_ts)
+        pv_count = getattr(acct, "partial_validator_count", None)
+        self.partial_count[row] = len(acct.partial_validators) if pv_count is None else pv_count
+        self.pending_paid[row] = bool(acct.pending_paid)
+        return row
+
+    # ----------------------------------------------------------------
+    # Vectorised queries => arrays of row numbers
+    # ----------------------------------------------------------------
+    def _live(self, column: np.ndarray) -> np.ndarray:
+        return column[: self.size]
+
+    def not_minted_this_hour(self, now: int) -> np.ndarray:
+        """Rows whose last_minted is None or before the start of `now`'s hour."""
+        hour_start = now - (now % 3600)
+        return np.flatnonzero(self._live(self.last_minted) < hour_start)
+
+    def minted_between(self, start: int, end: int) -> np.ndarray:
+        """Rows with start <= last_minted < end."""
+        lm = self._live(self.last_minted)
+        return np.flatnonzero((lm >= start) & (lm < end))
+
+    def pending_claims_older_than(self, now: int, hours: float) -> np.ndarray:
+        """Unpaid claims (pending_claim_ts > 0) requested more than `hours` ago."""
+        ts = self._live(self.pending_claim_ts)
+        unpaid = ~self._live(self.pending_paid)
+        return np.flatnonzero(unpaid & (ts > 0) & (ts < now - int(hours * 3600)))
+
+    def at_partial_count(self, count: int) -> np.ndarray:
+        """Rows with exactly `count` partial validators (e.g. 3 for "3/4")."""
+        return np.flatnonzero(self._live(self.partial_count) == count)
+
+    def paid(self) -> np.ndarray:
+        return np.flatnonzero(self._live(self.pending_paid))
+
+    def rows_for_names(self, names) -> np.ndarray:
+        """Row numbers of the given names that exist in the table."""
+        row_of = self.row_of
+        return np.fromiter((row_of[n] for n in names if n in row_of), dtype=np.int64)
+
+    def names_at(self, rows) -> list:
+        names = self.names
+        return [names[r] for r in rows]
+
+    # ----------------------------------------------------------------
+    # name_map compatibility
+    # ----------------------------------------------------------------
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, name):
+        return name in self.row_of
+
+    def keys(self):
+        return self.row_of.keys()
+
+    def entry(self, row: int) -> dict:
+        return {
+            "index": int(self.index[row]),
+            "pda": self.pdas[row],
+            "reward_address": self.reward_addresses[row],
+        }
+
+    def get(self, name, default=None):
+        row = self.row_of.get(name)
+        return default if row is None else self.entry(row)
+
+    def __getitem__(self, name):
+        return self.entry(self.row_of[name])
+
+
+# --------------------------------------------------------------------
+# Loader
+# --------------------------------------------------------------------
+async def scan_player_records(client, program_id) -> list:
+    """One filtered getProgramAccounts scan of every PlayerPda (all games) => [(pubkey, record)]."""
+    return decode_players(await query.fetch_raw_accounts(client, program_id, query.PLAYER_PDA_STR))
+
+
+def game_player_table(records, game_pda, player_count: int, program_id, pda_to_index: dict = None) -> PlayerTable:
+    """
+    PlayerTable of one game out of scan_player_records(). Rows only get an
+    index when their address is one of this game's [b"player_pda", game, i]
+    PDAs; players of other games are dropped. Pass `pda_to_index`
+    (GameDeployment.player_index_map) to reuse PDAs derived earlier.
+    """
+    if pda_to_index is None:
+        pda_to_index = pdas.player_index_map(game_pda, player_count, program_id)
+    return PlayerTable.from_records([(k, rec) for k, rec in records if k in pda_to_index], pda_to_index)
+
+
+async def load_player_table(client, program_id, game_pda, player_count: int, pda_to_index: dict = None) -> PlayerTable:
+    """One filtered getProgramAccounts scan + fast decode => this game's PlayerTable."""
+    records = await scan_player_records(client, program_id)
+    return game_player_table(records, game_pda, player_count, program_id, pda_to_index)
+
+
+async def scan_game_players(client, game_pda, player_count: int, program_id, player_pda=None,
+                            concurrency: int = SCAN_CONCURRENCY,
+                            batch_size: int = query.MULTIPLE_ACCOUNTS_MAX) -> PlayerTable:
+    """
+    Cold scan of one game's PlayerPdas by index instead of a getProgramAccounts:
+    indices 0..player_count-1 are cut into ranges of `batch_size`, and
+    `concurrency` workers each take the next range, derive its addresses,
+    getMultipleAccounts them and decode the batch straight into the table.
+
+    Only `concurrency` batches are held at a time, so there is no response
+    holding every player (of every game) to time out or parse on one core;
+    more concurrency means more ranges in flight. `player_pda(index)`
+    (GameDeployment.player_pda) reuses PDAs derived earlier.
+    """
+    if player_pda is None:
+        def player_pda(index):
+            return pdas.player_pda(game_pda, index, program_id)[0]
+    table = PlayerTable(capacity=player_count)
+    ranges = iter(range(0, player_count, batch_size))  # shared: each range goes to one worker
+
+    async def worker():
+        for start in ranges:
+            indices = range(start, min(start + batch_size, player_count))
+            keys = [player_pda(index) for index in indices]
+            resp = await client.get_multiple_accounts(keys, encoding="base64")
+            for key, index, acct in zip(keys, indices, resp.value):
+                if acct is None:
+                    continue  # index not registered (yet)
+                try:
+                    table.upsert(key, decode_player_pda(bytes(acct.data)), index)
+                except DecodeError:
+                    continue
+
+    batches = -(-max(player_count, 0) // batch_size)
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, batches))))
+    return table
@@ -0,0 +1,346 @@
+"""
+Player-side instruction helpers: wallet funding,
+create_user_ata_if_needed, register_player_pda (player- or
+validator-signed), request_claim and the validator's
+validate_player_pubg_time_slim. onboard() puts the ATA + registration of
+one or more players into each TX, batch_request_claims() several players'
+claims (fancoin.compose).
+
+These are the flows of 2_scraper2.py, 5_mass_signup.py, 14_..., 15_... and
+17_PUBG_mass_claim.py as importable coroutines, with the account lists of
+programs/fancoin/src/lib.rs (gateway_token, [wallet_pda, user_ata]
+leftover for registration). The provider wallet pays the TX fee; the
+player keypair signs as `user` where the program wants it.
+"""
+import asyncio
+
+from solders.instruction import AccountMeta
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.system_program import ID as SYS_PROGRAM_ID
+from solders.system_program import TransferParams, transfer
+from solders.transaction import Transaction
+
+from fancoin import pdas, query
+from fancoin.compose import TxComposer
+from fancoin.decoder import decode_game
+from fancoin.identity import ValidatorIdentity
+from fancoin.minting import RENT_SYSVAR
+from fancoin.runtime import lazy_import
+
+anchorpy = lazy_import("anchorpy")
+
+LAMPORTS_TO_SEND = 10_000_000  # 0.01 SOL, same as 5_mass_signup.py
+TRANSFERS_PER_TX = 10
+CLAIM_CONCURRENCY = 8  # batched request_claim TXs in flight
+
+
+# --------------------------------------------------------------------
+# Funding
+# --------------------------------------------------------------------
+async def fund_wallets(client, payer: Keypair, pubkeys, lamports: int = LAMPORTS_TO_SEND,
+                       per_tx: int = TRANSFERS_PER_TX) -> list:
+    """
+    System transfers from payer, `per_tx` recipients per TX, all TXs sent
+    concurrently on one blockhash and then confirmed. Returns one signature
+    (or the exception) per TX.
+    """
+    pubkeys = list(pubkeys)
+    blockhash = (await client.get_latest_blockhash()).value.blockhash
+
+    async def send(chunk):
+        ixs = [transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=k, lamports=lamports)) for k in chunk]
+        tx = Transaction([payer], Message(ixs, payer.pubkey()), blockhash)
+        sig = (await client.send_transaction(tx)).value
+        await client.confirm_transaction(sig)
+        return sig
+
+    return await asyncio.gather(
+        *(send(pubkeys[i:i + per_tx]) for i in range(0, len(pubkeys), per_tx)),
+        return_exceptions=True,
+    )
+
+
+# --------------------------------------------------------------------
+# Player instructions
+# --------------------------------------------------------------------
+def _create_user_ata_ctx(program, game_pda, mint, user_kp: Keypair, gateway_token: Pubkey = None):
+    user = user_kp.pubkey()
+    return anchorpy.Context(
+        accounts={
+            "user": user,
+            "fancy_mint": mint,
+            "game": game_pda,
+            "gateway_token": gateway_token or user,
+            "user_ata": pdas.associated_token_address(user, mint),
+            "wallet_pda": pdas.wallet_pda(mint, user, program.program_id)[0],
+            "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+            "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+            "system_program": SYS_PROGRAM_ID,
+            "rent": RENT_SYSVAR,
+        },
+        signers=[user_kp],
+    )
+
+
+def _registration_leftover(program, mint, user: Pubkey) -> list:
+    """[wallet_pda, user_ata]: what both register instructions take as remaining_accounts."""
+    return [
+        AccountMeta(pubkey=pdas.wallet_pda(mint, user, program.program_id)[0], is_signer=False, is_writable=True),
+        AccountMeta(pubkey=pdas.associated_token_address(user, mint), is_signer=False, is_writable=True),
+    ]
+
+
+def _register_ctx(program, game_pda, mint, name: str, user_kp: Keypair, player_index: int,
+                  gateway_token: Pubkey = None):
+    user = user_kp.pubkey()
+    return anchorpy.Context(
+        accounts={
+            "game": game_pda,
+            "fancy_mint": mint,
+            "player_pda": pdas.player_pda(game_pda, player_index, program.program_id)[0],
+            "player_name_pda": pdas.player_name_pda(game_pda, name, program.program_id)[0],
+            "gateway_token": gateway_token or user,
+            "user": user,
+            "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+            "associated_token_program": pdas.ASSOCIATED_TOKEN_PROGRAM_ID,
+            "system_program": SYS_PROGRAM_ID,
+            "rent": RENT_SYSVAR,
+        },
+        signers=[user_kp],
+        remaining_accounts=_registration_leftover(program, mint, user),
+    )
+
+
+def _register_by_validator_ctx(program, game_pda, mint, name: str, user: Pubkey, validator_kp: Keypair,
+                               player_index: int, gateway_token: Pubkey = None):
+    return anchorpy.Context(
+        accounts={
+            "game": game_pda,
+            "validator": validator_kp.pubkey(),
+            "player_pda": pdas.player_pda(game_pda, player_index, program.program_id)[0],
+            "player_name_pda": pdas.player_name_pda(game_pda, name, program.program_id)[0],
+            "fancy_mint": mint,
+            "gateway_token": gateway_token or user,
+            "system_program": SYS_PROGRAM_ID,
+        },
+        signers=[validator_kp],
+        remaining_accounts=_registration_leftover(program, mint, user),
+    )
+
+
+async def create_user_ata_if_needed(program, game_pda, mint, user_kp: Keypair, gateway_token: Pubkey = None):
+    """ATA + wallet_pda for user (both init_if_needed) => tx signature."""
+    return await program.rpc["create_user_ata_if_needed"](
+        mint, ctx=_create_user_ata_ctx(program, game_pda, mint, user_kp, gateway_token))
+
+
+async def register_player_pda(program, game_pda, mint, name: str, user_kp: Keypair, player_index: int,
+                              gateway_token: Pubkey = None):
+    """
+    register_player_pda at `player_index` (the Game.player_count the TX
+    will see; registrations for one game must go out one at a time).
+    """
+    return await program.rpc["register_player_pda"](
+        mint, name, ctx=_register_ctx(program, game_pda, mint, name, user_kp, player_index, gateway_token))
+
+
+async def register_player_pda_by_validator(program, game_pda, mint, name: str, user: Pubkey, validator_kp: Keypair,
+                                           player_index: int, gateway_token: Pubkey = None):
+    """Validator-signed (and paid) registration of `user`; the PlayerNamePda starts active."""
+    return await program.rpc["register_player_pda_by_validator"](
+        mint, name, user,
+        ctx=_register_by_validator_ctx(program, game_pda, mint, name, user, validator_kp, player_index, gateway_token))
+
+
+def onboarding_ixs(program, game_pda, mint, name: str, user_kp: Keypair, player_index: int,
+                   validator_kp: Keypair = None, gateway_token: Pubkey = None) -> list:
+    """
+    [create_user_ata_if_needed, register_player_pda(_by_validator)] for one
+    player: the registration checks the wallet_pda the first one creates,
+    so the pair can share a TX (instructions run in order).
+    """
+    ixs = [program.instruction["create_user_ata_if_needed"](
+        mint, ctx=_create_user_ata_ctx(program, game_pda, mint, user_kp, gateway_token))]
+    if validator_kp is None:
+        ixs.append(program.instruction["register_player_pda"](
+            mint, name, ctx=_register_ctx(program, game_pda, mint, name, user_kp, player_index, gateway_token)))
+    else:
+        user = user_kp.pubkey()
+        ixs.append(program.instruction["register_player_pda_by_validator"](
+            mint, name, user,
+            ctx=_register_by_validator_ctx(program, game_pda, mint, name, user, validator_kp, player_index,
+                                           gateway_token)))
+    return ixs
+
+
+async def onboard(program, game_pda, mint, keys: dict, validator_kp: Keypair = None, max_per_tx: int = None) -> dict:
+    """
+    ATA + registration for every {name: Keypair}, as many players per TX as
+    fit (compose.TxComposer). Registrations take consecutive
+    Game.player_count values, so the TXs go one after another. When a
+    multi-player TX fails, its players are retried one per TX so one bad
+    name doesn't take the others down; a player whose instructions don't fit
+    a TX on their own is skipped. Returns {"registered", "failed", "txs"}.
+    """
+    names = list(keys)
+    registered, failed, txs = [], [], 0
+    index, i, solo_until = None, 0, 0
+    while i < len(names):
+        if index is None:
+            resp = await program.provider.connection.get_account_info(game_pda)
+            index = decode_game(bytes(resp.value.data)).player_count
+        composer = TxComposer(program, payer=validator_kp,
+                              max_groups=1 if i < solo_until else max_per_tx)
+        batch = []
+        for name in names[i:]:
+            ixs = onboarding_ixs(program, game_pda, mint, name, keys[name], index + len(batch), validator_kp)
+            try:
+                if not composer.add(ixs, [keys[name]]):
+                    break
+            except ValueError as e:  # only raised into an empty TX: this player never fits
+                print(f"[ERROR] Onboarding '{name}' skipped => {e}")
+                break
+            batch.append(name)
+        if not batch:
+            failed.append(names[i])
+            i += 1
+            continue
+        txs += 1
+        try:
+            await composer.send()
+            registered += batch
+            index += len(batch)
+        except Exception as e:
+            index = None
+            if len(batch) > 1:
+                print(f"[WARN] Onboarding TX for {batch} failed => {e}; retrying them one per TX.")
+                solo_until = i + len(batch)
+                continue
+            print(f"[ERROR] Onboarding '{batch[0]}' failed => {e}")
+            failed += batch
+        i += len(batch)
+    print(f"[INFO] Onboarded {len(registered)} players in {txs} TXs ({len(failed)} failed).")
+    return {"registered": registered, "failed": failed, "txs": txs}
+
+
+def _request_claim_ctx(program, game_pda, name: str, user_kp: Keypair, player_pda: Pubkey,
+                       gateway_token: Pubkey = None):
+    user = user_kp.pubkey()
+    return anchorpy.Context(
+        accounts={
+            "game": game_pda,
+            "player_name_pda": pdas.player_name_pda(game_pda, name, program.program_id)[0],
+            "player_pda": player_pda,
+            "gateway_token": gateway_token or user,
+            "user": user,
+            "system_program": SYS_PROGRAM_ID,
+        },
+        signers=[user_kp],
+    )
+
+
+async def request_claim(program, game_pda, mint, name: str, user_kp: Keypair, player_pda: Pubkey,
+                        gateway_token: Pubkey = None):
+    return await program.rpc["request_claim"](
+        mint, name, ctx=_request_claim_ctx(program, game_pda, name, user_kp, player_pda, gateway_token))
+
+
+def request_claim_ix(program, game_pda, mint, name: str, user_kp: Keypair, player_pda: Pubkey,
+                     gateway_token: Pubkey = None):
+    return program.instruction["request_claim"](
+        mint, name, ctx=_request_claim_ctx(program, game_pda, name, user_kp, player_pda, gateway_token))
+
+
+async def resolve_player_pdas(client, game_pda, names, program_id=pdas.PROGRAM_ID) -> dict:
+    """{name: PlayerPda address} from the PlayerNamePdas, one batched read; unregistered names left out."""
+    names = list(names)
+    raw = await query.fetch_multiple_accounts(
+        client, [pdas.player_name_pda(game_pda, name, program_id)[0] for name in names])
+    return {name: query.read_field("PlayerNamePda", data, "player_pda")
+            for name, data in zip(names, raw) if data is not None}
+
+
+async def batch_request_claims(program, game_pda, mint, claims: dict, max_per_tx: int = None,
+                               concurrency: int = CLAIM_CONCURRENCY) -> dict:
+    """
+    request_claim for every {name: (Keypair, player_pda)}: as many players'
+    instructions (and signatures) per TX as fit, the provider wallet paying
+    the fee, up to `concurrency` TXs in flight. request_claim only writes
+    the player's own PlayerPda, so the TXs don't contend with each other.
+    A failed TX's players are retried one per TX. The Keypairs may be
+    fancoin.signing.RemoteSigners, to sign in a SigningFarm's processes.
+    Returns {"claimed", "failed", "txs"}.
+    """
+    async def pack(names, per_tx):
+        batches, composer, batch = [], None, []
+        for name in names:
+            kp, player_pda = claims[name]
+            ix = request_claim_ix(program, game_pda, mint, name, kp, player_pda)
+            if composer is None or not composer.add([ix], [kp]):
+                if composer is not None:
+                    batches.append((composer, batch))
+                    await asyncio.sleep(0)  # a few thousand players take a while to pack: let I/O run
+                composer, batch = TxComposer(program, max_groups=per_tx), []
+                composer.add([ix], [kp])
+            batch.append(name)
+        if composer is not None:
+            batches.append((composer, batch))
+        return batches
+
+    sem = asyncio.Semaphore(concurrency)
+    claimed, failed, retry = [], [], []
+    stats = {"txs": 0}
+
+    async def send(composer, batch):
+        async with sem:
+            stats["txs"] += 1
+            try:
+                await composer.send()
+                claimed.extend(batch)
+            except Exception as e:
+                if len(batch) > 1:
+                    print(f"[WARN] request_claim TX for {batch} failed => {e}; retrying them one per TX.")
+                    retry.extend(batch)
+                else:
+                    print(f"[ERROR] request_claim for '{batch[0]}' failed => {e}")
+                    failed.extend(batch)
+
+    await asyncio.gather(*(send(c, b) for c, b in await pack(claims, max_per_tx)))
+    if retry:
+        await asyncio.gather(*(send(c, b) for c, b in await pack(retry, 1)))
+    print(f"[INFO] request_claim for {len(claimed)} players in {stats['txs']} TXs ({len(failed)} failed).")
+    return {"claimed": claimed, "failed": failed, "txs": stats["txs"]}
+
+
+async def validate_player_pubg_time_slim(program, game_pda, mint, mint_authority, ident: ValidatorIdentity,
+                                         name: str, player_pda: Pubkey, user_ata: Pubkey, new_time_seconds: int,
+                                         commission_ata: Pubkey = None):
+    """Validator-signed; leftover order is fixed by the program (commission ATA optional, last)."""
+    leftover = [
+        AccountMeta(pubkey=pdas.player_name_pda(game_pda, name, program.program_id)[0], is_signer=False,
+                    is_writable=False),
+        AccountMeta(pubkey=player_pda, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=mint, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=mint_authority, is_signer=False, is_writable=False),
+        AccountMeta(pubkey=user_ata, is_signer=False, is_writable=True),
+        AccountMeta(pubkey=ident.validator_pda, is_signer=False, is_writable=True),
+    ]
+    if commission_ata is not None:
+        leftover.append(AccountMeta(pubkey=commission_ata, is_signer=False, is_writable=True))
+    return await program.rpc["validate_player_pubg_time_slim"](
+        mint,
+        name,
+        new_time_seconds,
+        ctx=anchorpy.Context(
+            accounts={
+                "game": game_pda,
+                "validator": ident.pubkey,
+                "token_program": pdas.SPL_TOKEN_PROGRAM_ID,
+                "system_program": SYS_PROGRAM_ID,
+            },
+            signers=[ident.keypair],
+            remaining_accounts=leftover,
+        ),
+    )
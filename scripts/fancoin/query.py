@@ -0,0 +1,213 @@
+"""
+getProgramAccounts query builder for the fancoin accounts.
+
+`program.account["PlayerPda"].all()` downloads and decodes every player and
+leaves all filtering to Python. The helpers here build memcmp / dataSize
+filters and dataSlice windows from fancoin.layout so the RPC node does the
+narrowing where the layout allows it.
+
+Filters can only target fields at a static offset. For PlayerPda that is
+the `name` String (it is the first field); everything after it moves with
+the name length, so those fields are matched after a cheap
+fancoin.decoder pass instead of the anchorpy coder, on the full accounts.
+"""
+import asyncio
+import struct
+
+import base58
+from solders.pubkey import Pubkey
+from solana.rpc.types import DataSliceOpts, MemcmpOpts
+
+from fancoin.decoder import decode_player_pda
+from fancoin.layout import (
+    ACCOUNT_DISCRIMINATORS,
+    ACCOUNT_FIELDS,
+    ACCOUNT_LEN,
+    SCALAR_FORMATS,
+    PUBKEY,
+    STRING,
+    encode_field,
+    field_offsets,
+    max_field_size,
+    static_offset,
+)
+
+PLAYER_PDA_STR = "PlayerPda"
+MULTIPLE_ACCOUNTS_MAX = 100  # getMultipleAccounts limit per request
+
+
+# --------------------------------------------------------------------
+# Filter builders
+# --------------------------------------------------------------------
+def discriminator_filter(account_name: str) -> MemcmpOpts:
+    """memcmp on the 8-byte Anchor discriminator at offset 0."""
+    disc = ACCOUNT_DISCRIMINATORS[account_name]
+    return MemcmpOpts(offset=0, bytes=base58.b58encode(disc).decode("ascii"))
+
+
+def data_size_filter(account_name: str) -> int:
+    """dataSize filter => solana-py turns a bare int into {"dataSize": n}."""
+    return ACCOUNT_LEN[account_name]
+
+
+def memcmp_filter(account_name: str, field: str, value) -> MemcmpOpts:
+    """
+    memcmp on `field == value`. Raises ValueError when the field has no
+    static offset (a String/Vec/Option sits in front of it).
+    """
+    offset = static_offset(account_name, field)
+    if offset is None:
+        raise ValueError(f"{account_name}.{field} has no static offset => cannot memcmp on the node")
+    raw = encode_field(account_name, field, value)
+    return MemcmpOpts(offset=offset, bytes=base58.b58encode(raw).decode("ascii"))
+
+
+def account_filters(account_name: str, **equals) -> list:
+    """Discriminator + dataSize + one memcmp per keyword (field=value)."""
+    filters = [discriminator_filter(account_name), data_size_filter(account_name)]
+    for field, value in equals.items():
+        filters.append(memcmp_filter(account_name, field, value))
+    return filters
+
+
+def json_filters(account_name: str, **equals) -> list:
+    """account_filters() as raw JSON-RPC filter objects (websocket subscriptions take these)."""
+    out = []
+    for flt in account_filters(account_name, **equals):
+        if isinstance(flt, int):
+            out.append({"dataSize": flt})
+        else:
+            out.append({"memcmp": {"offset": flt.offset, "bytes": flt.bytes}})
+    return out
+
+
+def field_slice(account_name: str, first_field: str, last_field: str = None) -> DataSliceOpts:
+    """
+    dataSlice window covering `first_field` .. `last_field` (inclusive).
+    `first_field` needs a static offset; variable fields inside the window
+    are sized by the budget `LEN` reserves for them.
+    """
+    last_field = last_field or first_field
+    start = static_offset(account_name, first_field)
+    if start is None:
+        raise ValueError(f"{account_name}.{first_field} has no static offset => cannot slice from it")
+    length = 0
+    inside = False
+    for name, kind, max_len in ACCOUNT_FIELDS[account_name]:
+        if name == first_field:
+            inside = True
+        if inside:
+            length += max_field_size(kind, max_len)
+        if name == last_field:
+            break
+    return DataSliceOpts(offset=start, length=length)
+
+
+# --------------------------------------------------------------------
+# Raw field access (no anchorpy coder involved)
+# --------------------------------------------------------------------
+def read_field(account_name: str, data: bytes, field: str):
+    """Read a single field out of raw account data."""
+    offset, size = field_offsets(account_name, data)[field]
+    kind = next(spec[1] for spec in ACCOUNT_FIELDS[account_name] if spec[0] == field)
+    if kind == PUBKEY:
+        return Pubkey.from_bytes(data[offset:offset + 32])
+    if kind == STRING:
+        return data[offset + 4:offset + size].decode("utf-8")
+    if kind.startswith("option<"):
+        if data[offset] == 0:
+            return None
+        return struct.unpack_from(SCALAR_FORMATS[kind], data, offset + 1)[0]
+    if kind in SCALAR_FORMATS:
+        return struct.unpack_from(SCALAR_FORMATS[kind], data, offset)[0]
+    raise ValueError(f"read_field does not handle kind '{kind}'")
+
+
+# --------------------------------------------------------------------
+# Fetchers
+# --------------------------------------------------------------------
+async def fetch_raw_accounts(client, program_id: Pubkey, account_name: str, filters=None, data_slice=None):
+    """
+    getProgramAccounts with our filters => list of (pubkey, raw_bytes).
+    Discriminator + dataSize are always applied on the node.
+    """
+    all_filters = account_filters(account_name) + list(filters or [])
+    resp = await client.get_program_accounts(
+        program_id,
+        encoding="base64",
+        data_slice=data_slice,
+        filters=all_filters,
+    )
+    return [(rec.pubkey, bytes(rec.account.data)) for rec in resp.value]
+
+
+async def fetch_multiple_accounts(client, pubkeys: list, batch_size: int = MULTIPLE_ACCOUNTS_MAX) -> list:
+    """
+    getMultipleAccounts in batches of <= 100, all batches in flight at once.
+    Returns raw bytes (or None for missing accounts) in the order of `pubkeys`.
+    """
+    batches = [pubkeys[i:i + batch_size] for i in range(0, len(pubkeys), batch_size)]
+    responses = await asyncio.gather(
+        *(client.get_multiple_accounts(batch, encoding="base64") for batch in batches)
+    )
+    out = []
+    for resp in responses:
+        out.extend(None if acct is None else bytes(acct.data) for acct in resp.value)
+    return out
+
+
+async def fetch_players_where(program, field: str, value, **node_equals):
+    """
+    PlayerPda records where `field == value`, as (pubkey, PlayerPdaRecord).
+
+    Keyword args are applied as memcmp filters on the node; `field` is checked
+    on the client after the fast decode.
+    """
+    filters = [memcmp_filter(PLAYER_PDA_STR, k, v) for k, v in node_equals.items()]
+    raw_accounts = await fetch_raw_accounts(
+        program.provider.connection, program.program_id, PLAYER_PDA_STR, filters=filters
+    )
+    matched = []
+    for pubkey, data in raw_accounts:
+        rec = decode_player_pda(data, check_discriminator=False)
+        if getattr(rec, field) == value:
+            matched.append((pubkey, rec))
+    return matched
+
+
+async def fetch_paid_players(program):
+    """
+    (player_pda_pubkey, player_account) for every PlayerPda with pending_paid == True.
+
+    Every PlayerPda comes back in full: pending_paid sits behind the name, two
+    Options, the partial_validators Vec and three more Options, and the account
+    is zero-padded to LEN, so neither a memcmp nor one dataSlice window can
+    reach it without carrying everything in front of it.
+    """
+    return await fetch_players_where(program, "pending_paid", True)
+
+
+async def fetch_player_by_name(program, name: str):
+    """Single (pubkey, account) for `name`, matched by memcmp on the node, or None."""
+    raw_accounts = await fetch_raw_accounts(
+        program.provider.connection,
+        program.program_id,
+        PLAYER_PDA_STR,
+        filters=[memcmp_filter(PLAYER_PDA_STR, "name", name)],
+    )
+    if not raw_accounts:
+        return None
+    pubkey, data = raw_accounts[0]
+    return (pubkey, decode_player_pda(data, check_discriminator=False))
+
+
+async def fetch_player_names(client, program_id: Pubkey) -> dict:
+    """{player_pda_pubkey: name} using a dataSlice over the name field only."""
+    raw_accounts = await fetch_raw_accounts(
+        client, program_id, PLAYER_PDA_STR, data_slice=field_slice(PLAYER_PDA_STR, "name")
+    )
+    names = {}
+    for pubkey, chunk in raw_accounts:
+        name_len = int.from_bytes(chunk[:4], "little")
+        names[pubkey] = chunk[4:4 + name_len].decode("utf-8")
+    return names
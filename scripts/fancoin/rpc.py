@@ -0,0 +1,210 @@
+"""
+Shared RPC transport for the scripts.
+
+`get_client()` hands out one AsyncClient per (endpoint, event loop) instead
+of every helper building its own. The client's provider is swapped for
+PooledHTTPProvider, which
+
+  - keeps a tuned httpx connection pool alive between calls (HTTP/2 is used
+    for https endpoints when the `h2` package is installed),
+  - coalesces identical in-flight reads: if getAccountInfo / getBalance /
+    ... with the same params is already on the wire, later callers await
+    that response instead of sending another request,
+  - sends JSON-RPC batch arrays of any length (`batch(...)`),
+  - with `batching=True`, collects every request made in the same event-loop
+    tick and sends them as one batch array; each caller still just awaits
+    `client.get_balance(...)` and gets its own response (or exception).
+
+Responses are solders objects (immutable), so sharing one between callers
+is safe.
+"""
+import asyncio
+import importlib.util
+import typing
+
+import httpx
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+from solana.exceptions import SolanaRpcException, handle_async_exceptions
+from solana.rpc.core import RPCException
+from solana.rpc.providers.async_http import AsyncHTTPProvider
+from solders.rpc.responses import RPCError
+from solders.rpc.responses import batch_from_json
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None  # httpx needs it for http2=True
+
+DEFAULT_ENDPOINT = "http://localhost:8899"
+DEFAULT_TIMEOUT_S = 30.0
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY_S = 60.0
+MAX_BATCH = 100
+
+_RPC_ERRORS = typing.get_args(RPCError)
+
+# Read-only request bodies (solders.rpc.requests class names) that may share
+# one in-flight response.
+COALESCED_REQUESTS = frozenset({
+    "GetAccountInfo",
+    "GetBalance",
+    "GetMultipleAccounts",
+    "GetProgramAccounts",
+    "GetTokenAccountBalance",
+    "GetSlot",
+    "GetBlockTime",
+})
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    def __init__(self, endpoint: str = DEFAULT_ENDPOINT, extra_headers=None, timeout: float = DEFAULT_TIMEOUT_S,
+                 max_connections: int = MAX_CONNECTIONS, http2: bool = None, batching: bool = False):
+        # Skip AsyncHTTPProvider.__init__: its throwaway httpx client loads a CA bundle (~50 ms)
+        super(AsyncHTTPProvider, self).__init__(endpoint, extra_headers, timeout)
+        self.batching = batching
+        tls = endpoint.startswith("https://")
+        if http2 is None:
+            http2 = HTTP2_AVAILABLE and tls
+        self.session = httpx.AsyncClient(
+            timeout=timeout,
+            http2=http2,
+            verify=tls,  # plain-http endpoints never handshake; don't build an SSL context for them
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(MAX_KEEPALIVE_CONNECTIONS, max_connections),
+                keepalive_expiry=KEEPALIVE_EXPIRY_S,
+            ),
+        )
+        self._in_flight = {}
+        self._tick_queue = []  # (body, parser, future) waiting for this tick's batch
+        self.requests_sent = 0
+        self.requests_coalesced = 0
+        self.batches_sent = 0
+
+    async def make_request(self, body, parser):
+        if type(body).__name__ not in COALESCED_REQUESTS:
+            return await self._send(body, parser)
+
+        key = (parser, body.to_json())
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(body, parser))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._in_flight.pop(k, None))
+        else:
+            self.requests_coalesced += 1
+        # shield: one caller being cancelled must not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _send(self, body, parser):
+        if not self.batching:
+            self.requests_sent += 1
+            return await super().make_request(body, parser)
+        fut = asyncio.get_running_loop().create_future()
+        self._tick_queue.append((body, parser, fut))
+        if len(self._tick_queue) == 1:
+            # Runs after every callback already queued for this tick
+            asyncio.get_running_loop().call_soon(self._flush_tick)
+        elif len(self._tick_queue) >= MAX_BATCH:
+            self._flush_tick()
+        return await fut
+
+    def _flush_tick(self):
+        queued, self._tick_queue = self._tick_queue, []
+        if queued:
+            asyncio.ensure_future(self._send_tick(queued))
+
+    async def _send_tick(self, queued):
+        # A caller may have cancelled its future (wait_for, cancelled gather): skip it, settle the rest
+        if len(queued) == 1:
+            body, parser, fut = queued[0]
+            self.requests_sent += 1
+            try:
+                result = await super().make_request(body, parser)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+                return
+            if not fut.done():
+                fut.set_result(result)
+            return
+
+        self.batches_sent += 1
+        try:
+            raw = await self._post_batch(tuple(body for body, _p, _f in queued))
+            parsed = batch_from_json(raw, tuple(parser for _b, parser, _f in queued))
+        except Exception as e:
+            for _b, _p, fut in queued:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_b, parser, fut), result in zip(queued, parsed):
+            if fut.done():
+                continue
+            # Anything that isn't the expected response type is an RPC error object
+            if isinstance(result, _RPC_ERRORS) or not isinstance(result, parser):
+                fut.set_exception(RPCException(result))
+            else:
+                fut.set_result(result)
+
+    @handle_async_exceptions(SolanaRpcException, httpx.HTTPError)
+    async def _post_batch(self, reqs) -> str:
+        """make_batch_request_unparsed raising SolanaRpcException like make_request does."""
+        return await self.make_batch_request_unparsed(reqs)
+
+    async def batch(self, reqs, parsers) -> list:
+        """
+        JSON-RPC batch of any length (split every MAX_BATCH requests), results
+        in request order. `parsers` lines up with `reqs`.
+        """
+        reqs, parsers = tuple(reqs), tuple(parsers)
+        results = []
+        for start in range(0, len(reqs), MAX_BATCH):
+            self.batches_sent += 1
+            results.extend(
+                await self.make_batch_request(reqs[start:start + MAX_BATCH], parsers[start:start + MAX_BATCH])
+            )
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "requests_sent": self.requests_sent,
+            "requests_coalesced": self.requests_coalesced,
+            "batches_sent": self.batches_sent,
+        }
+
+
+class PooledAsyncClient(AsyncClient):
+    """AsyncClient whose provider is a PooledHTTPProvider."""
+
+    def __init__(self, endpoint: str = DEFAULT_ENDPOINT, commitment=Confirmed, timeout: float = DEFAULT_TIMEOUT_S,
+                 extra_headers=None, **pool_kwargs):
+        """pool_kwargs => PooledHTTPProvider (max_connections, http2, batching)."""
+        # AsyncClient.__init__ would build (and discard) a plain AsyncHTTPProvider first
+        super(AsyncClient, self).__init__(commitment)
+        self._provider = PooledHTTPProvider(endpoint, extra_headers, timeout, **pool_kwargs)
+
+    async def batch(self, reqs, parsers) -> list:
+        return await self._provider.batch(reqs, parsers)
+
+
+# --------------------------------------------------------------------
+# Process-wide clients
+# --------------------------------------------------------------------
+_clients = {}  # (endpoint, commitment, batching, loop) -> PooledAsyncClient
+
+
+def get_client(endpoint: str = DEFAULT_ENDPOINT, commitment=Confirmed, batching: bool = False) -> PooledAsyncClient:
+    """Shared client for this endpoint in the running event loop."""
+    key = (endpoint, commitment, batching, asyncio.get_running_loop())
+    client = _clients.get(key)
+    if client is None:
+        client = PooledAsyncClient(endpoint, commitment=commitment, batching=batching)
+        _clients[key] = client
+    return client
+
+
+async def close_clients():
+    """Close every shared client that belongs to the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _clients if k[-1] is loop]:
+        await _clients.pop(key).close()
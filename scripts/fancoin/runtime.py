@@ -0,0 +1,152 @@
+"""
+Startup helpers for the operator scripts: lazy imports, the IDL and the
+*_pda.txt deployment files.
+
+anchorpy alone costs ~0.4 s to import and solana ~0.15 s, which is most of
+a quick command's wall time. Modules that only need them inside a function
+take them through `lazy_import` (the import runs on first attribute
+access), and nothing here reads files at import time.
+
+`idl_summary()` is the IDL reduced to what fancoin's own code reads
+(instruction discriminators, account order + isMut / isSigner, arg types,
+account discriminators), pickled in __pycache__ and reused until the IDL
+file changes. anchorpy's Idl object itself can't be pickled, so
+`load_idl()` still parses the JSON (once per process).
+"""
+import hashlib
+import importlib.util
+import json
+import pickle
+import re
+import sys
+from pathlib import Path
+
+from fancoin.layout import account_discriminator, instruction_discriminator
+
+IDL_PATH = Path("../target/idl/fancoin.json")
+CACHE_DIR = Path(__file__).resolve().parent / "__pycache__"
+CACHE_VERSION = 1
+
+PDA_FILES = {
+    "game": "game_pda.txt",
+    "mint_authority": "mint_auth_pda.txt",
+    "mint": "minted_mint_pda.txt",
+}
+
+_idls = {}
+
+
+def lazy_import(name: str):
+    """
+    Module object for `name` whose import runs on first attribute access.
+    First-touch it from one thread (the event loop): before Python 3.12 the
+    deferred load is not thread-safe.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# --------------------------------------------------------------------
+# IDL
+# --------------------------------------------------------------------
+def load_idl(path=IDL_PATH):
+    """anchorpy Idl for `path`, parsed once per process."""
+    key = Path(path).resolve()
+    if key not in _idls:
+        from anchorpy import Idl
+        _idls[key] = Idl.from_json(Path(path).read_text(encoding="utf-8"))
+    return _idls[key]
+
+
+def snake_case(name: str) -> str:
+    """createUserAtaIfNeeded -> create_user_ata_if_needed (legacy IDLs are camelCase)."""
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+def _flat_accounts(items) -> list:
+    out = []
+    for item in items:
+        if "accounts" in item:  # nested account group
+            out.extend(_flat_accounts(item["accounts"]))
+            continue
+        is_mut = item.get("isMut", item.get("writable", False))
+        is_signer = item.get("isSigner", item.get("signer", False))
+        out.append((snake_case(item["name"]), bool(is_mut), bool(is_signer)))
+    return out
+
+
+def summarize_idl(idl_json: dict) -> dict:
+    """
+    {"instructions": {snake_name: {"discriminator", "accounts": [(name, is_mut, is_signer)],
+                                   "args": [(name, type)]}},
+     "accounts": {AccountName: discriminator}}
+    """
+    instructions = {}
+    for ix in idl_json.get("instructions", []):
+        name = snake_case(ix["name"])
+        disc = bytes(ix["discriminator"]) if "discriminator" in ix else instruction_discriminator(name)
+        instructions[name] = {
+            "discriminator": disc,
+            "accounts": _flat_accounts(ix.get("accounts", [])),
+            "args": [(snake_case(a["name"]), a["type"]) for a in ix.get("args", [])],
+        }
+    accounts = {
+        acc["name"]: bytes(acc["discriminator"]) if "discriminator" in acc else account_discriminator(acc["name"])
+        for acc in idl_json.get("accounts", [])
+    }
+    return {"instructions": instructions, "accounts": accounts}
+
+
+def _cache_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:12]
+    return CACHE_DIR / f"idl-{digest}.pickle"
+
+
+def idl_summary(path=IDL_PATH) -> dict:
+    """summarize_idl() of `path`, from the pickle cache when the file is unchanged."""
+    path = Path(path)
+    stat = path.stat()
+    stamp = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    cache = _cache_path(path)
+    try:
+        with cache.open("rb") as f:
+            cached_stamp, summary = pickle.load(f)
+        if cached_stamp == stamp:
+            return summary
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        pass
+    summary = summarize_idl(json.loads(path.read_text(encoding="utf-8")))
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp = cache.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump((stamp, summary), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(cache)
+    except OSError as e:
+        print(f"[WARN] Could not write IDL cache {cache}: {e}")
+    return summary
+
+
+# --------------------------------------------------------------------
+# Deployment files
+# --------------------------------------------------------------------
+def read_pda_files(directory=".") -> dict:
+    """{game, mint_authority, mint} Pubkeys from the files 3_val1_init.py writes."""
+    from solders.pubkey import Pubkey
+
+    out = {}
+    for key, filename in PDA_FILES.items():
+        path = Path(directory) / filename
+        if not path.exists():
+            raise FileNotFoundError(f"{path} not found (run 3_val1_init.py or 21_bootstrap.py first)")
+        out[key] = Pubkey.from_string(path.read_text().strip())
+    return out
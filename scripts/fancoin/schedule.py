@@ -0,0 +1,157 @@
+"""
+Hour-window scheduling that mirrors the gates in `submit_minting_list`.
+
+On-chain, submit_minting_list returns early (the TX still costs a fee) when
+  - nobody has punched in during the current hour (game.last_punch_in_time),
+  - this validator hasn't punched in during the current hour
+    (validator_pda.last_activity),
+  - the current minute is < 7.
+The scheduler punches in right after the hour rolls over, holds minting until
+minute 7, then keeps calling the mint round until shortly before the hour
+ends. Every submission is checked against the same rules first, using the
+cluster's clock rather than the local one.
+"""
+import asyncio
+import time
+
+HOUR_S = 3600
+MINT_OPEN_MINUTE = 7
+
+# Margins absorb clock skew and the time a TX needs to land.
+PUNCH_IN_DELAY_S = 2
+MINT_OPEN_MARGIN_S = 3
+HOUR_END_MARGIN_S = 10
+PUNCH_IN_ATTEMPTS = 3
+PUNCH_IN_RETRY_S = 5
+ROUND_PAUSE_S = 30
+
+
+def hour_of(ts) -> int:
+    return int(ts) // HOUR_S
+
+
+def hour_start(ts) -> int:
+    return hour_of(ts) * HOUR_S
+
+
+def mint_block_reason(now, game_last_punch_in, validator_last_activity, open_margin_s: float = 0):
+    """
+    Same checks, same order as submit_minting_list. Returns the reason the
+    program would skip, or None if a submission can mint. `open_margin_s`
+    keeps minting blocked that much past minute 7.
+    """
+    current_hour = hour_of(now)
+    if game_last_punch_in is None:
+        return "No one has punched in"
+    if hour_of(game_last_punch_in) != current_hour:
+        return "No one has punched in this hour"
+    if hour_of(validator_last_activity or 0) != current_hour:
+        return "Validator hasn't used punch_in this hour"
+    if now - hour_start(now) < MINT_OPEN_MINUTE * 60 + open_margin_s:
+        return "Minting is blocked during the first 7 minutes"
+    return None
+
+
+def next_mint_chance(now, round_pause_s: float = ROUND_PAUSE_S) -> float:
+    """When the next mint round can submit: `round_pause_s` from now, or the next hour's mint open."""
+    t = now + round_pause_s
+    if hour_of(t) == hour_of(now) and t - hour_start(t) < HOUR_S - HOUR_END_MARGIN_S:
+        return t
+    return hour_start(now) + HOUR_S + MINT_OPEN_MINUTE * 60 + MINT_OPEN_MARGIN_S
+
+
+# --------------------------------------------------------------------
+# Cluster clock
+# --------------------------------------------------------------------
+class ChainClock:
+    """Local monotonic-ish clock corrected by the offset to the cluster's block time."""
+
+    def __init__(self, client):
+        self.client = client
+        self.offset = 0.0
+
+    async def sync(self) -> float:
+        try:
+            slot = (await self.client.get_slot()).value
+            block_time = (await self.client.get_block_time(slot)).value
+            if block_time is not None:
+                self.offset = block_time - time.time()
+        except Exception as e:
+            print(f"[WARN] ChainClock sync failed, keeping offset={self.offset:.1f}s => {e}")
+        return self.offset
+
+    def now(self) -> float:
+        return time.time() + self.offset
+
+
+# --------------------------------------------------------------------
+# Scheduler
+# --------------------------------------------------------------------
+class MintScheduler:
+    """
+    punch_in():         coroutine, returns truthy once the punch_in TX confirmed.
+    mint_round(sched):  coroutine doing one scrape + submit pass; it should
+                        call sched.window_open() before every TX it sends.
+    """
+
+    def __init__(self, clock: ChainClock, punch_in, mint_round, round_pause_s: float = ROUND_PAUSE_S):
+        self.clock = clock
+        self.punch_in = punch_in
+        self.mint_round = mint_round
+        self.round_pause_s = round_pause_s
+        self.punched_hour = None
+
+    def block_reason(self, now=None):
+        """
+        mint_block_reason() for a submit sent now, or "Hour is nearly over".
+        Our confirmed punch_in set both Game.last_punch_in_time and our
+        ValidatorPda.last_activity, so punched_hour stands in for both.
+        """
+        now = self.clock.now() if now is None else now
+        punched_at = None if self.punched_hour is None else self.punched_hour * HOUR_S
+        reason = mint_block_reason(now, punched_at, punched_at, open_margin_s=MINT_OPEN_MARGIN_S)
+        if reason is None and now - hour_start(now) >= HOUR_S - HOUR_END_MARGIN_S:
+            return "Hour is nearly over"
+        return reason
+
+    def window_open(self, now=None) -> bool:
+        """True if a submit sent now would pass every on-chain gate."""
+        return self.block_reason(now) is None
+
+    async def _sleep_until(self, ts: float):
+        delay = ts - self.clock.now()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def run_hour(self):
+        now = self.clock.now()
+        this_hour = hour_of(now)
+
+        # (1) Punch in as soon as the hour starts (or right away if we are late)
+        if self.punched_hour != this_hour:
+            await self._sleep_until(hour_start(now) + PUNCH_IN_DELAY_S)
+            for attempt in range(1, PUNCH_IN_ATTEMPTS + 1):
+                if await self.punch_in():
+                    self.punched_hour = hour_of(self.clock.now())
+                    print(f"[INFO] Punched in for hour {self.punched_hour}.")
+                    break
+                print(f"[WARN] punch_in attempt {attempt}/{PUNCH_IN_ATTEMPTS} failed.")
+                await asyncio.sleep(PUNCH_IN_RETRY_S)
+            else:
+                print("[WARN] punch_in failed => no minting this hour.")
+
+        # (2) Hold until minute 7, then mint until the hour is nearly over
+        if self.punched_hour == this_hour:
+            await self._sleep_until(hour_start(now) + MINT_OPEN_MINUTE * 60 + MINT_OPEN_MARGIN_S)
+            while self.window_open():
+                await self.mint_round(self)
+                remaining = hour_start(now) + HOUR_S - HOUR_END_MARGIN_S - self.clock.now()
+                await asyncio.sleep(max(0.0, min(self.round_pause_s, remaining)))
+
+        # (3) Next hour
+        await self._sleep_until(hour_start(now) + HOUR_S)
+
+    async def run_forever(self):
+        while True:
+            await self.clock.sync()
+            await self.run_hour()
@@ -0,0 +1,120 @@
+"""
+TFC server discovery (HL1 master server) and A2S player scraping.
+
+Same protocol and name sanitising as the *_player_scrape_and_post_mvp.py
+scripts, but the master-server query pages with the last address it saw,
+and the per-server A2S queries run in a thread pool rather than one by one.
+"""
+import asyncio
+import re
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+MASTER_SERVER = ("hl1master.steampowered.com", 27011)
+MASTER_TIMEOUT_S = 5
+A2S_TIMEOUT_S = 3.0
+A2S_WORKERS = 32
+REGION_ALL = 0xFF
+
+
+def parse_response(data):
+    servers = []
+    for i in range(6, len(data), 6):
+        ip = ".".join(map(str, data[i : i + 4]))
+        port = struct.unpack(">H", data[i + 4 : i + 6])[0]
+        if ip == "0.0.0.0" and port == 0:
+            break
+        servers.append((ip, port))
+    return servers
+
+
+def query_master_server(region=REGION_ALL, gamedir="tfc", master=MASTER_SERVER):
+    """Yield (ip, port) for every server the master lists, page by page."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(MASTER_TIMEOUT_S)
+    seed = "0.0.0.0:0"
+    seen = set()
+    try:
+        while True:
+            request = bytes([0x31, region]) + seed.encode() + b"\x00" + f"\\gamedir\\{gamedir}".encode() + b"\x00"
+            sock.sendto(request, master)
+            try:
+                response_data, _ = sock.recvfrom(4096)
+            except socket.timeout:
+                print("Request timed out")
+                break
+
+            servers = parse_response(response_data)
+            new = [srv for srv in servers if srv not in seen]
+            if not new:
+                break
+            for srv in new:
+                seen.add(srv)
+                yield srv
+            if len(servers) < (len(response_data) - 6) // 6:
+                break  # page ended with the 0.0.0.0:0 terminator => last page
+            seed = f"{new[-1][0]}:{new[-1][1]}"
+    finally:
+        sock.close()
+
+
+def dedupe_by_ip(servers) -> list:
+    """Keep the first (ip, port) per IP, like the validator scripts do."""
+    unique_ips = {}
+    for ip, port in servers:
+        if ip not in unique_ips:
+            unique_ips[ip] = (ip, port)
+    return list(unique_ips.values())
+
+
+def clean_brackets_and_contents(name):
+    name = re.sub(r'\^\d', '', name)
+    name = re.sub(r'\[.*?\]', '', name)
+    name = re.sub(r'\{.*?\}', '', name)
+    name = re.sub(r'\(.*?\)', '', name)
+    name = re.sub(r'<.*?>', '', name)
+    name = re.sub(r'[\[\]\{\}\(\)<>]', '', name)
+    name = re.sub(r'[^a-zA-Z0-9_-]', '', name)
+    return name.strip()
+
+
+def get_player_list_a2s(ip, port, timeout: float = A2S_TIMEOUT_S):
+    # imported here (not via runtime.lazy_import): this runs in pool threads and
+    # LazyLoader modules aren't safe to first-touch from several threads at once
+    import a2s
+
+    try:
+        return a2s.players((ip, port), timeout=timeout)
+    except Exception as e:
+        print(f"Failed to query server at {ip}:{port}: {e}")
+        return []
+
+
+def decode_and_collect_players(players) -> set:
+    """Distinct sanitised names."""
+    names = set()
+    for pl in players:
+        sanitized_name = clean_brackets_and_contents(pl.name)
+        if sanitized_name:
+            names.add(sanitized_name)
+    return names
+
+
+async def scrape_servers(servers, workers: int = A2S_WORKERS) -> dict:
+    """A2S_PLAYER every server concurrently => {(ip, port): sanitised names}."""
+    servers = list(servers)
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(servers) or 1))) as pool:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, get_player_list_a2s, ip, port) for ip, port in servers)
+        )
+    return {srv: decode_and_collect_players(players) for srv, players in zip(servers, results)}
+
+
+async def scrape_player_names(servers, workers: int = A2S_WORKERS) -> set:
+    """A2S_PLAYER every server concurrently => union of sanitised names."""
+    per_server = await scrape_servers(servers, workers)
+    names = set().union(*per_server.values())
+    print(f"[INFO] Found {len(names)} distinct players on {len(per_server)} TFC servers.")
+    return names
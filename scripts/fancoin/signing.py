@@ -0,0 +1,195 @@
+"""
+Process-pool signing farm: message bytes + a signer reference in,
+ed25519 signatures out, off the event loop.
+
+    async with SigningFarm(player_dirs=["pubg_keys"]) as farm:
+        keys = farm.signers()                        # {player_name: RemoteSigner}
+        await players.batch_request_claims(program, game_pda, mint,
+                                           {n: (keys[n], pda) for n, pda in player_pdas.items()})
+
+Every worker loads the key store itself (pubg_keys/-style player records
+and keypair files), so the secret keys only ever exist in the worker
+processes; the event loop holds RemoteSigners, which only know their
+pubkey. A RemoteSigner goes wherever a Keypair does as a signer reference:
+the instruction builders only call .pubkey(), and compose.TxComposer
+hands the signing of the TX to the farm.
+
+sign() calls made in the same event-loop tick are sent to the pool as one
+job (up to SIGN_BATCH messages), like rpc's tick batching, so thousands of
+concurrent sends cost a few pickled round trips instead of thousands.
+The workers are spawned, not forked: the parent runs threads (RPC / fake
+node) and never has the keys to hand down anyway.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+from fancoin.identity import load_keypair, load_player_keys
+
+SIGN_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+SIGN_BATCH = 64  # messages per pool job
+
+
+# --------------------------------------------------------------------
+# Worker side (module-level so they pickle by name)
+# --------------------------------------------------------------------
+_KEYS = {}      # pubkey bytes -> Keypair, per worker process
+_NAMES = {}     # name -> pubkey bytes
+_PROBLEMS = []  # "[WARN]/[ERROR] => ..." per skipped / suspicious file
+
+
+def _load_keys(player_dirs, keypair_files):
+    """Pool initializer: must not raise, or every worker dies and start() fails with BrokenProcessPool."""
+    for folder in player_dirs:
+        for name, kp in load_player_keys(folder, report=_PROBLEMS.append).items():
+            _KEYS[bytes(kp.pubkey())] = kp
+            _NAMES[name] = bytes(kp.pubkey())
+    for path in keypair_files:
+        try:
+            kp = load_keypair(path)
+        except Exception as e:
+            _PROBLEMS.append(f"[ERROR] => {path} => {e}")
+            continue
+        _KEYS[bytes(kp.pubkey())] = kp
+        _NAMES[Path(path).stem.replace("-keypair", "")] = bytes(kp.pubkey())
+
+
+def _index():
+    return dict(_NAMES), list(_PROBLEMS)
+
+
+def _sign_batch(jobs) -> list:
+    """[(message bytes, [pubkey bytes])] => per job [signature bytes] or an error string."""
+    out = []
+    for message, pubkeys in jobs:
+        try:
+            out.append([bytes(_KEYS[key].sign_message(message)) for key in pubkeys])
+        except KeyError as e:
+            out.append(f"no key for {Pubkey.from_bytes(e.args[0])} in the key store")
+    return out
+
+
+# --------------------------------------------------------------------
+# Event-loop side
+# --------------------------------------------------------------------
+class RemoteSigner:
+    """Signer reference for a key held by a SigningFarm's workers."""
+
+    __slots__ = ("farm", "_pubkey")
+
+    def __init__(self, farm: "SigningFarm", pubkey: Pubkey):
+        self.farm = farm
+        self._pubkey = pubkey
+
+    def pubkey(self) -> Pubkey:
+        return self._pubkey
+
+    def __repr__(self):
+        return f"RemoteSigner({self._pubkey})"
+
+
+class SigningFarm:
+    def __init__(self, player_dirs=(), keypair_files=(), workers: int = SIGN_WORKERS, batch: int = SIGN_BATCH):
+        """
+        player_dirs:    folders of <name>.json player records (identity.load_player_keys).
+        keypair_files:  JSON-array keypair files (identity.load_keypair); named by file stem.
+        Files that can't be loaded are skipped and reported by start(), as the in-process loaders do.
+        """
+        self.player_dirs = [str(p) for p in player_dirs]
+        self.keypair_files = [str(p) for p in keypair_files]
+        self.workers = workers
+        self.batch = batch
+        self.pool = None
+        self.pubkeys = {}  # name -> Pubkey
+        self._tick_queue = []  # (message, pubkeys, future) waiting for this tick's job
+        self.stats = {"signatures": 0, "messages": 0, "jobs": 0}
+
+    async def __aenter__(self) -> "SigningFarm":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def start(self) -> "SigningFarm":
+        self.pool = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_load_keys, initargs=(self.player_dirs, self.keypair_files),
+        )
+        index, problems = await asyncio.get_running_loop().run_in_executor(self.pool, _index)
+        for line in problems:
+            print(line)
+        self.pubkeys = {name: Pubkey.from_bytes(key) for name, key in index.items()}
+        print(f"[INFO] Signing farm: {self.workers} workers, {len(self.pubkeys)} keys.")
+        return self
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def signer(self, name: str) -> RemoteSigner:
+        return RemoteSigner(self, self.pubkeys[name])
+
+    def signers(self) -> dict:
+        """{name: RemoteSigner} for every key in the store."""
+        return {name: RemoteSigner(self, key) for name, key in self.pubkeys.items()}
+
+    async def sign(self, message: bytes, pubkeys) -> list:
+        """Signatures of `message` by each of `pubkeys` (all in the key store), in order."""
+        fut = asyncio.get_running_loop().create_future()
+        self._tick_queue.append((bytes(message), [bytes(k) for k in pubkeys], fut))
+        if len(self._tick_queue) == 1:
+            # Runs after every callback already queued for this tick
+            asyncio.get_running_loop().call_soon(self._flush_tick)
+        elif len(self._tick_queue) >= self.batch:
+            self._flush_tick()
+        return await fut
+
+    def _flush_tick(self):
+        queued, self._tick_queue = self._tick_queue, []
+        if queued:
+            asyncio.ensure_future(self._run_job(queued))
+
+    async def _run_job(self, queued):
+        self.stats["jobs"] += 1
+        self.stats["messages"] += len(queued)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.pool, _sign_batch, [(message, keys) for message, keys, _f in queued])
+        except Exception as e:
+            for _m, _k, fut in queued:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_m, keys, fut), result in zip(queued, results):
+            if fut.done():  # caller cancelled
+                continue
+            if isinstance(result, str):
+                fut.set_exception(KeyError(result))
+            else:
+                self.stats["signatures"] += len(keys)
+                fut.set_result([Signature.from_bytes(sig) for sig in result])
+
+
+async def sign_payload(payload: bytes, signer_keys, signers: dict) -> list:
+    """
+    Signatures for `signer_keys` in order: Keypairs sign here, RemoteSigners
+    through their farm (one sign() per farm).
+    """
+    sigs = {}
+    remote = {}
+    for key in signer_keys:
+        signer = signers[key]
+        if isinstance(signer, RemoteSigner):
+            remote.setdefault(signer.farm, []).append(key)
+        else:
+            sigs[key] = signer.sign_message(payload)
+    for farm, keys in remote.items():
+        sigs.update(zip(keys, await farm.sign(payload, keys)))
+    return [sigs[key] for key in signer_keys]
+
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts import `fancoin` from the scripts/ directory they run in
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
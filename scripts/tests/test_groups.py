@@ -0,0 +1,31 @@
+"""
+fancoin.groups against the program: the group vectors come from
+group_vector_tests in programs/fancoin/src/lib.rs (cargo test group_vectors).
+"""
+import struct
+
+import pytest
+from solders.pubkey import Pubkey
+
+from fancoin import groups
+
+VECTORS = groups.load_group_vectors()
+
+
+@pytest.mark.parametrize("data,want", groups.KECCAK_VECTORS)
+def test_keccak256(data, want):
+    assert groups._keccak256_py(data).hex() == want
+    assert groups.keccak256(data).hex() == want
+
+
+@pytest.mark.parametrize("case", VECTORS["group_id"], ids=lambda c: f"{c['address'][:8]}-{c['seed']}")
+def test_group_id_matches_program(case):
+    address = Pubkey.from_string(case["address"])
+    digest = groups.keccak256(bytes(address) + struct.pack("<Q", case["seed"]))
+    assert int.from_bytes(digest[:8], "big") == case["raw"]
+    assert groups.group_id(address, case["seed"], groups.total_groups(case["validator_count"])) == case["group"]
+
+
+@pytest.mark.parametrize("case", VECTORS["failover_tolerance"], ids=lambda c: str(c["validator_count"]))
+def test_failover_tolerance_matches_program(case):
+    assert groups.failover_tolerance(case["validator_count"]) == case["tolerance"]
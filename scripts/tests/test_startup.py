@@ -0,0 +1,67 @@
+"""
+Cold start of the quick operator commands, under `python -X importtime`
+(see fancoin/bench_startup.py for the timings themselves).
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from fancoin.identity import new_player_record, save_player_record
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+HEAVY = {"anchorpy", "solana", "solders", "spl", "a2s", "tkinter", "bs4", "httpx"}
+KEYS = HEAVY - {"solders"}  # deriving a pubkey needs solders and nothing else
+FRACTION = 1 / 3  # of the anchorpy + solana import the scripts used to start with
+
+
+def importtime(argv: list, cwd: Path = SCRIPTS_DIR):
+    """(top-level packages imported, top-level cumulative import time in us) of one fresh run."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(SCRIPTS_DIR), os.environ.get("PYTHONPATH", "")]))
+    run = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=cwd, env=env,
+                         capture_output=True, text=True, timeout=120)
+    assert run.returncode == 0, run.stderr[-2000:]
+    packages, total_us = set(), 0
+    for line in run.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, package = line[len("import time:"):].split("|")
+        packages.add(package.strip().split(".")[0])
+        if not package.startswith("  "):  # one separator space => top level
+            total_us += int(cumulative)
+    return packages, total_us
+
+
+@pytest.fixture(scope="module")
+def key_dir(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("keys")
+    for i in range(3):
+        save_player_record(folder / "player_keys", f"player{i}", new_player_record())
+    save_player_record(folder / "player_keys", "Tis", new_player_record())  # what verify_keys.py reads
+    return folder
+
+
+@pytest.mark.parametrize("command", ["balance", "verify-keys", "deployment", "watch"])
+def test_help_imports_nothing_heavy(command):
+    packages, _ = importtime(["-m", "fancoin", command, "--help"])
+    assert not packages & HEAVY
+
+
+def test_verify_keys_imports_only_solders(key_dir):
+    packages, _ = importtime(["-m", "fancoin", "verify-keys"], cwd=key_dir)
+    assert not packages & KEYS
+
+
+def test_legacy_verify_keys_imports_only_solders(key_dir):
+    packages, _ = importtime([str(SCRIPTS_DIR / "verify_keys.py")], cwd=key_dir)
+    assert not packages & KEYS
+
+
+def test_cold_start_is_a_fraction_of_the_script_stack(key_dir):
+    _, full_us = importtime(["-c", "import anchorpy, solana.rpc.async_api"])
+    for argv, cwd in ((["-m", "fancoin", "balance", "--help"], SCRIPTS_DIR),
+                      (["-m", "fancoin", "verify-keys"], key_dir)):
+        _, quick_us = importtime(argv, cwd)
+        assert quick_us < full_us * FRACTION, f"{argv}: {quick_us} us vs {full_us} us for anchorpy + solana"